@@ -1,14 +1,61 @@
-import requests
+import argparse
+import asyncio
 import json
-import re
-import pandas as pd
+import os
 import time
-from utils.html_scraper import fetch_page_text_and_images
-from utils.text_tools import summarize_text
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from utils.event_sink import JsonlEventSink, compact
+from utils.event_store import EventStore, parse_city_state
+from utils.frontier import MAX_DEPTH, MAX_DETAILS, MAX_PAGES, Frontier
+from utils.html_scraper import fetch_page
+from utils.http_client import connection_stats, get_session
+from utils.llm_cache import ExtractionCache
+from utils.manifest import IncrementalCrawl, SourceManifest, event_id, load_events_by_source
+from utils.ollama_client import find_json_objects, stream_generate_events
+from utils.pipeline import PartCollector, run_pipeline
+from utils.politeness import HostQueue, HostScheduler
+from utils.schema import events_from_llm
+from utils.segmentation import split_page
+from utils.source_health import SourceHealth
+from utils.structured_data import extract_structured_events, find_feed_links
+from utils.text_reducer import estimate_tokens, page_token_budget, reduce_text
+from utils.text_tools import create_summarizer_pool, summarize_text
 
 INPUT_FILE = "event_sources_input.csv"
 OUTPUT_JSON = "output/events.json"
 OUTPUT_CSV = "output/events.csv"
+OUTPUT_PARQUET = "output/events_parquet"
+OUTPUT_JSONL = "output/events.jsonl"
+CHECKPOINT_FILE = "output/checkpoint.tsv"
+EVENT_DB = "output/events.sqlite3"
+
+OLLAMA_URL = "http://localhost:11434/api/generate"
+MODEL = "llama3.2"
+# Bump whenever build_prompt changes so cached extractions are not reused
+PROMPT_VERSION = 1
+BATCH_PROMPT_VERSION = 1
+MAX_PROMPT_IMAGES = 4
+
+# Batched extraction packs several small pages into one request. Batches are
+# split whenever the packed prompt would not leave room for the answer.
+BATCH_SIZE = 1
+CONTEXT_TOKENS = 8192
+RESPONSE_TOKEN_RESERVE = 2048
+
+extraction_cache = ExtractionCache()
+
+# Async crawl mode: fetch and LLM concurrency are tuned separately so
+# network I/O overlaps with local inference.
+FETCH_CONCURRENCY = 8
+SUMMARIZE_WORKERS = os.cpu_count() or 2
+LLM_CONCURRENCY = 1
+QUEUE_SIZE = 32
+
+# Politeness: at most one request every HOST_DELAY seconds to the same host.
+# Different hosts are not throttled against each other.
+HOST_DELAY = 2.0
 
 def load_sources_from_csv(path):
     try:
@@ -18,25 +65,63 @@ def load_sources_from_csv(path):
         print(f"Error reading input CSV: {e}")
         return []
 
-def extract_json_from_string(raw_text):
+def load_source_locations(path):
+    """Map SourceURL -> (City, State) for input CSVs that carry location columns"""
     try:
-        # Extract everything between the first [ and the last ]
-        match = re.search(r'\[\s*{.*?}\s*\]', raw_text, re.DOTALL)
-        if match:
-            json_str = match.group(0)
-            return json.loads(json_str)
-        else:
-            print("⚠️ No JSON array found in the text.")
-            return []
-    except Exception as e:
-        print(f"❌ Failed to parse JSON: {e}")
-        return []
+        df = pd.read_csv(path)
+    except Exception:
+        return {}
+    if "City" not in df.columns or "State" not in df.columns:
+        return {}
 
+    locations = {}
+    for url, city, state in df[["SourceURL", "City", "State"]].itertuples(index=False):
+        # Skip national/API rows such as ("National", "API")
+        if isinstance(state, str) and len(state) == 2 and isinstance(city, str):
+            locations[url] = (city, state)
+    return locations
 
-def extract_event_data(text, image_urls):
-    text = summarize_text(text, max_sentences=10)
-    image_urls = image_urls[:4] if len(image_urls) > 4 else image_urls
-    prompt = f"""
+def extract_json_from_string(raw_text):
+    events = find_json_objects(raw_text)
+    if not events:
+        print("⚠️ No JSON objects found in the text.")
+    return events
+
+
+# Page text is cut down to the sentences with event signal (dates, times,
+# prices, addresses) that fit PAGE_TOKEN_BUDGET; "lsa" keeps the older
+# fixed-length sumy summary.
+REDUCER = "budget"
+PAGE_TOKEN_BUDGET = page_token_budget(MODEL, CONTEXT_TOKENS)
+SUMMARY_SENTENCES = 10
+
+
+def page_reducer(reducer=None, token_budget=None):
+    """Picklable reducer function, so it can also run in the summarizer process pool"""
+    if (reducer or REDUCER) == "lsa":
+        return partial(summarize_text, max_sentences=SUMMARY_SENTENCES)
+    return partial(reduce_text, token_budget=token_budget or PAGE_TOKEN_BUDGET)
+
+
+def summarize_page_text(text):
+    return page_reducer()(text)
+
+
+# Listing pages are split into their repeated event cards, sent to the LLM in
+# groups that fit PAGE_TOKEN_BUDGET, instead of being reduced as one text
+SEGMENT_LISTINGS = True
+
+
+def page_segmenter():
+    """Picklable page -> [(text, image_urls), ...] function, or None when segmentation is off"""
+    if not SEGMENT_LISTINGS:
+        return None
+    return partial(split_page, reduce=page_reducer(), token_budget=PAGE_TOKEN_BUDGET)
+
+
+def build_prompt(text, image_urls):
+    image_urls = image_urls[:MAX_PROMPT_IMAGES]
+    return f"""
 Extract a list of structured event entries in JSON format with the following fields:
 - name
 - venue_name
@@ -57,50 +142,456 @@ Image URLs:
 
 Return a list of events in JSON array format. If you din not find any relevent data then return blank array.Do not return any extra text except the json
 """
+
+
+def extract_events_from_summary(text, image_urls):
+    """
+    Events the LLM finds in a reduced page text.
+
+    Returns:
+        list: utils.schema.Event objects ([] when the page has none), or None
+        when the model could not be asked or its answer could not be read
+    """
+    image_urls = image_urls[:MAX_PROMPT_IMAGES]
+    cache_key = None
+    if extraction_cache is not None:
+        cache_key = extraction_cache.make_key(MODEL, PROMPT_VERSION, text, image_urls)
+        cached = extraction_cache.get(cache_key)
+        if cached is not None:
+            return events_from_llm(cached)
+
+    prompt = build_prompt(text, image_urls)
     try:
         print('prompt: ', prompt)
-        response = requests.post(
-            "http://localhost:11434/api/generate",
-            json={"model": "llama3.2", "prompt": prompt, "stream": False},
-            timeout=60
-        )
-        output = response.json().get("response", "").strip()
+        # Events are parsed as the tokens stream in; generation stops at the closing ]
+        events, output, truncated = stream_generate_events(prompt, MODEL, url=OLLAMA_URL, timeout=60,
+                                                           options={"num_ctx": CONTEXT_TOKENS})
+        output = output.strip()
         try:
             print('>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>', output)
-            return extract_json_from_string(output)
+            if events is None:
+                events = extract_json_from_string(output)
+            # Validated and coerced once, here; everything downstream gets Events
+            events = events_from_llm(events)
+            if truncated:
+                # Keep what was completed, but let the next run ask again
+                print(f"⚠️ Response was cut off after {len(events)} events; not caching it")
+            elif cache_key is not None:
+                extraction_cache.put(cache_key, [event.to_dict() for event in events])
+            return events
             
         except json.JSONDecodeError:
             print("⚠️ Could not parse JSON. Raw response:")
             print(output)
-            return []
+            return None
     except Exception as e:
         print(f"Error calling Ollama LLM: {e}")
-        return []
+        return None
 
-def main():
-    urls = load_sources_from_csv(INPUT_FILE)
-    all_events = []
-
-    for url in urls:
-        text, images = fetch_page_text_and_images(url)
-        if text:
-            # print(text, images)
-            extracted = extract_event_data(text, images)
-            print(extracted)
-            for event in extracted:
-                event["source"] = url
-            all_events.extend(extracted)
-            time.sleep(2)  # polite delay
-
-    with open(OUTPUT_JSON, "w", encoding="utf-8") as f_json:
-        json.dump(all_events, f_json, indent=2)
 
+def extract_event_data(text, image_urls):
+    text = summarize_page_text(text)
+    return extract_events_from_summary(text, image_urls)
+
+
+def build_batch_prompt(pages):
+    sections = []
+    for page_id, text, image_urls in pages:
+        sections.append(
+            f"=== SOURCE {page_id} ===\n"
+            f"Text:\n{text}\n\n"
+            f"Image URLs:\n{image_urls[:MAX_PROMPT_IMAGES]}\n"
+        )
+    source_ids = ", ".join(f'"{page_id}"' for page_id, _, _ in pages)
+    return f"""
+Below are {len(pages)} web pages, each starting with a "=== SOURCE <id> ===" line.
+For every source, extract a list of structured event entries with the following fields:
+- name
+- venue_name
+- venue_address
+- start_datetime (ISO 8601)
+- end_datetime (ISO 8601)
+- short_description
+- price
+- host
+- source_websites (list of URLs)
+- hero_images (list of image URLs)
+
+{"".join(sections)}
+Return a single JSON object whose keys are the source ids ({source_ids}) and whose values are the
+JSON arrays of events found in that source. Use an empty array for a source without events.
+Only use information from a source's own section for its events. Do not return any extra text except the json
+"""
+
+
+def parse_batch_response(output):
+    """Parse the {source_id: [events]} object returned for a batched prompt"""
+    start = output.find("{")
+    if start == -1:
+        return None
     try:
-        df = pd.DataFrame(all_events)
-        df.to_csv(OUTPUT_CSV, index=False)
-        print(f"✅ Saved {len(all_events)} events to {OUTPUT_JSON} and {OUTPUT_CSV}")
+        data, _ = json.JSONDecoder().raw_decode(output[start:])
+    except json.JSONDecodeError:
+        return None
+    if not isinstance(data, dict):
+        return None
+    return {key: value for key, value in data.items() if isinstance(value, list)}
+
+
+def extract_events_batch(pages):
+    """
+    Extract events for several summarized pages with as few Ollama calls as possible.
+
+    Args:
+        pages: List of (key, summary, image_urls); key is usually the url, or
+            (url, part_index) for the parts of a segmented page
+
+    Returns:
+        dict: key -> list of events, or None for a page whose extraction failed
+    """
+    results = {}
+    pending = []
+    for url, text, image_urls in pages:
+        image_urls = image_urls[:MAX_PROMPT_IMAGES]
+        if extraction_cache is not None:
+            key = extraction_cache.make_key(MODEL, f"batch-{BATCH_PROMPT_VERSION}", text, image_urls)
+            cached = extraction_cache.get(key)
+            if cached is not None:
+                results[url] = events_from_llm(cached)
+                continue
+        pending.append((url, text, image_urls))
+
+    if pending:
+        results.update(_extract_batch_uncached(pending))
+    return results
+
+
+def _extract_batch_uncached(pages):
+    if len(pages) == 1:
+        url, text, image_urls = pages[0]
+        return {url: extract_events_from_summary(text, image_urls)}
+
+    ids = {f"S{i + 1}": page for i, page in enumerate(pages)}
+    prompt = build_batch_prompt([(page_id, text, images) for page_id, (_, text, images) in ids.items()])
+
+    # Overflowing the context window silently truncates the prompt, so split first
+    if estimate_tokens(prompt) + RESPONSE_TOKEN_RESERVE > CONTEXT_TOKENS:
+        return _split_batch(pages)
+
+    try:
+        response = get_session().post(
+            OLLAMA_URL,
+            json={"model": MODEL, "prompt": prompt, "stream": False, "format": "json",
+                  "options": {"num_ctx": CONTEXT_TOKENS}},
+            timeout=60 * len(pages)
+        )
+        body = response.json()
+    except Exception as e:
+        print(f"Error calling Ollama LLM: {e}")
+        return _split_batch(pages)
+
+    parsed = parse_batch_response(body.get("response", ""))
+    if parsed is None or body.get("done_reason") == "length":
+        print(f"⚠️ Batch of {len(pages)} pages did not return a complete JSON object; splitting")
+        return _split_batch(pages)
+
+    results = {}
+    for page_id, (url, text, image_urls) in ids.items():
+        events = events_from_llm(parsed.get(page_id, []))
+        results[url] = events
+        if extraction_cache is not None:
+            key = extraction_cache.make_key(MODEL, f"batch-{BATCH_PROMPT_VERSION}", text, image_urls)
+            extraction_cache.put(key, [event.to_dict() for event in events])
+    return results
+
+
+def _split_batch(pages):
+    middle = len(pages) // 2
+    results = _extract_batch_uncached(pages[:middle])
+    results.update(_extract_batch_uncached(pages[middle:]))
+    return results
+
+
+def tag_events(url, extracted, city=None, state=None):
+    for event in extracted:
+        event.source = url
+        event.event_id = event_id(event, url)
+        # The venue's own address wins over the location of the source listing it
+        event_city, event_state = parse_city_state(event.venue_address)
+        event.city = event_city or city
+        event.state = (event_state or state or "").upper() or None
+    return extracted
+
+
+def extract_structured(page, scheduler=None):
+    """
+    Events read straight from JSON-LD, microdata, iCal or RSS, or None when the
+    page has no structured events and must go through the LLM.
+    """
+    events = extract_structured_events(page.html, page.url, page.content_type)
+    if not events:
+        # Calendars often advertise an iCal export next to the HTML listing
+        for feed_url in find_feed_links(page.html, page.url)[:1]:
+            if scheduler is not None:
+                scheduler.acquire(feed_url)
+            feed = fetch_page(feed_url, scheduler=scheduler)
+            if feed is not None:
+                events = extract_structured_events(feed.html, feed.url, feed.content_type)
+    if not events:
+        return None
+    print(f"🧩 {len(events)} structured events found on {page.url}; skipping LLM")
+    return events
+
+
+def make_shortcut(scheduler, incremental=None, structured=True):
+    """Combine the checks that can finish a page before summarization and the LLM"""
+    def shortcut(url, page):
+        if incremental is not None:
+            events = incremental.shortcut(url, page.text, page.images)
+            if events is not None:
+                return events
+        if structured:
+            return extract_structured(page, scheduler)
+        return None
+    return shortcut
+
+
+def make_fetch(scheduler, health=None, frontier=None):
+    """
+    fetch_page for the crawl, recording each source page's latency and outcome.
+
+    Pages found by following links are not recorded: a broken detail link
+    says nothing about whether the source itself is alive.
+    """
+    if health is None:
+        return partial(fetch_page, scheduler=scheduler)
+
+    def fetch(url):
+        started = time.monotonic()
+        page = fetch_page(url, scheduler=scheduler)
+        if frontier is None or frontier.source_of(url) == url:
+            health.record_fetch(url, page is not None, round(time.monotonic() - started, 2))
+        return page
+    return fetch
+
+
+def crawl_sequential(urls, scheduler, on_result, shortcut=None, batch_size=BATCH_SIZE, frontier=None,
+                     fetch=None):
+    fetch = fetch or partial(fetch_page, scheduler=scheduler)
+    batch = []
+    collector = PartCollector(on_result)
+    segment = page_segmenter()
+
+    def flush_batch():
+        results = extract_events_batch(batch)
+        for key, _, _ in batch:
+            collector.add(key, results.get(key))
+        batch.clear()
+
+    # Visit whichever host is ready next instead of sleeping after every URL;
+    # a frontier keeps growing with the pagination/detail links it finds
+    for url in frontier if frontier is not None else HostQueue(scheduler, urls):
+        page = fetch(url)
+        if frontier is not None:
+            frontier.discover(url, page)
+        if page is not None and page.text:
+            extracted = shortcut(url, page) if shortcut else None
+            if extracted is not None:
+                on_result(url, extracted)
+                continue
+            if segment is not None:
+                parts = segment(page)
+            else:
+                parts = [(summarize_page_text(page.text), page.images)]
+            collector.expect(url, len(parts))
+            for index, (text, images) in enumerate(parts):
+                if batch_size > 1:
+                    batch.append(((url, index), text, images))
+                    if len(batch) >= batch_size:
+                        flush_batch()
+                else:
+                    collector.add((url, index), extract_events_from_summary(text, images))
+
+    if batch:
+        flush_batch()
+
+
+def crawl_async(urls, scheduler, on_result, shortcut=None, batch_size=BATCH_SIZE,
+                fetch_concurrency=FETCH_CONCURRENCY,
+                summarize_workers=SUMMARIZE_WORKERS,
+                llm_concurrency=LLM_CONCURRENCY, queue_size=QUEUE_SIZE, frontier=None, fetch=None):
+    # Text reduction is CPU-bound, so it gets its own process pool while
+    # fetches and LLM calls keep running on threads
+    if REDUCER == "lsa":
+        summarizer_pool = create_summarizer_pool(summarize_workers)
+    else:
+        summarizer_pool = ProcessPoolExecutor(max_workers=summarize_workers)
+    try:
+        asyncio.run(run_pipeline(
+            urls,
+            fetch=fetch or partial(fetch_page, scheduler=scheduler),
+            summarize=page_reducer(),
+            segment=page_segmenter(),
+            extract=extract_events_from_summary,
+            on_result=on_result,
+            fetch_concurrency=fetch_concurrency,
+            summarize_concurrency=summarize_workers,
+            summarize_executor=summarizer_pool,
+            llm_concurrency=llm_concurrency,
+            queue_size=queue_size,
+            scheduler=scheduler,
+            shortcut=shortcut,
+            extract_batch=extract_events_batch,
+            batch_size=batch_size,
+            frontier=frontier,
+        ))
+    finally:
+        summarizer_pool.shutdown()
+
+
+def save_events():
+    try:
+        count = compact(OUTPUT_JSONL, OUTPUT_JSON, OUTPUT_CSV, parquet_dir=OUTPUT_PARQUET)
+        print(f"✅ Saved {count} events to {OUTPUT_JSON} and {OUTPUT_CSV}")
     except Exception as e:
-        print(f"Error saving CSV: {e}")
+        print(f"Error exporting events: {e}")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Crawl event sources and extract events with a local LLM")
+    parser.add_argument("--input", default=INPUT_FILE, help="CSV file with a SourceURL column")
+    parser.add_argument("--async", dest="use_async", action="store_true",
+                        help="Run fetch, summarize and extract as concurrent pipeline stages")
+    parser.add_argument("--fetch-concurrency", type=int, default=FETCH_CONCURRENCY)
+    parser.add_argument("--summarize-workers", type=int, default=SUMMARIZE_WORKERS,
+                        help="Processes used for summarization in --async mode")
+    parser.add_argument("--llm-concurrency", type=int, default=LLM_CONCURRENCY)
+    parser.add_argument("--queue-size", type=int, default=QUEUE_SIZE)
+    parser.add_argument("--reducer", choices=("budget", "lsa"), default=REDUCER,
+                        help="How page text is shortened before extraction: keep event sentences "
+                             "up to --page-tokens (budget) or a fixed 10-sentence LSA summary (lsa)")
+    parser.add_argument("--page-tokens", type=int, default=PAGE_TOKEN_BUDGET,
+                        help="Token budget for page text in each prompt (budget reducer)")
+    parser.add_argument("--no-segment", action="store_true",
+                        help="Reduce listing pages as one text instead of splitting them into event cards")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE,
+                        help="Pack up to this many pages into one Ollama request")
+    parser.add_argument("--resume", action="store_true",
+                        help="Continue an interrupted run, skipping sources already checkpointed")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Skip sources whose page text is unchanged since the last run "
+                             "and carry their previous events forward")
+    parser.add_argument("--no-structured", action="store_true",
+                        help="Send every page through the LLM, even when it has JSON-LD/microdata/iCal/RSS events")
+    parser.add_argument("--no-llm-cache", action="store_true",
+                        help="Always call Ollama, even for pages extracted before")
+    parser.add_argument("--follow-links", action="store_true",
+                        help="Also crawl \"next page\" links and the detail pages linked from event cards")
+    parser.add_argument("--max-pages", type=int, default=MAX_PAGES,
+                        help="Listing pages crawled per source with --follow-links")
+    parser.add_argument("--max-details", type=int, default=MAX_DETAILS,
+                        help="Detail pages crawled per source with --follow-links (0 to skip them)")
+    parser.add_argument("--max-depth", type=int, default=MAX_DEPTH,
+                        help="Detail-link hops from a listing with --follow-links")
+    parser.add_argument("--host-delay", type=float, default=HOST_DELAY,
+                        help="Minimum seconds between requests to the same host")
+    parser.add_argument("--crawl-budget", type=float, default=None,
+                        help="Seconds of fetching to spend, estimated from each source's latency; "
+                             "the best sources (fast, high-yield, often changing) are crawled first")
+    parser.add_argument("--all-sources", action="store_true",
+                        help="Also crawl sources that are backing off after repeated failures or empty crawls")
+    return parser.parse_args()
+
+
+def main():
+    global extraction_cache, REDUCER, PAGE_TOKEN_BUDGET, SEGMENT_LISTINGS
+    args = parse_args()
+    REDUCER = args.reducer
+    PAGE_TOKEN_BUDGET = args.page_tokens
+    SEGMENT_LISTINGS = not args.no_segment
+    if args.no_llm_cache:
+        extraction_cache = None
+    urls = load_sources_from_csv(args.input)
+    scheduler = HostScheduler(rate=1 / args.host_delay)
+
+    # Events are streamed to an append-only log as each source finishes
+    sink = JsonlEventSink(OUTPUT_JSONL, CHECKPOINT_FILE, resume=args.resume)
+    # ...and indexed for get_events_by_city.py
+    store = EventStore(EVENT_DB)
+    locations = load_source_locations(args.input)
+    if sink.done:
+        urls = [url for url in urls if url not in sink.done]
+        print(f"⏩ Resuming: {len(sink.done)} sources already done, {len(urls)} remaining")
+
+    # Best sources first; dead and barren ones wait out their back-off
+    health = SourceHealth()
+    plan = health.plan(urls, budget=args.crawl_budget, include_paused=args.all_sources)
+    urls = plan.urls
+    health.report(plan)
+
+    frontier = None
+    if args.follow_links:
+        frontier = Frontier(scheduler, urls, max_depth=args.max_depth, max_pages=args.max_pages,
+                            max_details=args.max_details, follow_details=args.max_details > 0)
+        frontier.mark_seen(sink.done)
+
+    incremental = None
+    if args.incremental:
+        incremental = IncrementalCrawl(SourceManifest.load(), load_events_by_source(OUTPUT_JSON))
+
+    def on_result(url, extracted):
+        print(extracted)
+        # Pages found by the frontier are located by the source they came from
+        source = frontier.source_of(url) if frontier is not None else url
+        if extracted is None:
+            # A failed LLM call says nothing about whether the source has
+            # events: leave its health, stored events and manifest as they
+            # were, and keep it out of the checkpoint so --resume retries it
+            print(f"⚠️ Extraction failed for {url}; it will be retried")
+            return
+        city, state = locations.get(source, (None, None))
+        tag_events(url, extracted, city, state)
+        if incremental is not None:
+            incremental.record(url, extracted)
+        health.record_events(source, extracted, follow_up=url != source)
+        store.replace_source(url, extracted, city, state)
+        sink.write(url, extracted)
+
+    shortcut = make_shortcut(scheduler, incremental, structured=not args.no_structured)
+    fetch = make_fetch(scheduler, health, frontier)
+
+    if args.use_async:
+        crawl_async(
+            urls,
+            scheduler,
+            on_result,
+            shortcut=shortcut,
+            batch_size=args.batch_size,
+            fetch_concurrency=args.fetch_concurrency,
+            summarize_workers=args.summarize_workers,
+            llm_concurrency=args.llm_concurrency,
+            queue_size=args.queue_size,
+            frontier=frontier,
+            fetch=fetch,
+        )
+    else:
+        crawl_sequential(urls, scheduler, on_result, shortcut=shortcut, batch_size=args.batch_size,
+                         frontier=frontier, fetch=fetch)
+
+    sink.close()
+    store.close()
+    health.close()
+    save_events()
+
+    if frontier is not None:
+        frontier.report()
+    if incremental is not None:
+        incremental.manifest.save()
+        incremental.report()
+
+    if extraction_cache is not None:
+        extraction_cache.report()
+    connection_stats().report()
 
 if __name__ == "__main__":
     main()
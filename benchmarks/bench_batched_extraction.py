@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Batched vs one-call-per-page extraction benchmark
+Fetches and summarizes a sample of sources once, then measures pages per
+minute for the current single-page Ollama path and for batched prompts.
+
+Requires a running Ollama with the crawler's model, e.g. `ollama run llama3.2`.
+
+Usage:
+    python benchmarks/bench_batched_extraction.py [--pages 12] [--batch-sizes 2 4 8]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import ai_event_crawler as crawler
+from utils.html_scraper import fetch_page_text_and_images
+
+
+def load_pages(input_csv, count):
+    pages = []
+    for url in crawler.load_sources_from_csv(input_csv):
+        text, images = fetch_page_text_and_images(url)
+        if text:
+            pages.append((url, crawler.summarize_page_text(text), images))
+        if len(pages) >= count:
+            break
+    return pages
+
+
+def time_single(pages):
+    start = time.perf_counter()
+    events = sum(len(crawler.extract_events_from_summary(text, images) or []) for _, text, images in pages)
+    return time.perf_counter() - start, events
+
+
+def time_batched(pages, batch_size):
+    start = time.perf_counter()
+    events = 0
+    for i in range(0, len(pages), batch_size):
+        results = crawler.extract_events_batch(pages[i:i + batch_size])
+        events += sum(len(found or []) for found in results.values())
+    return time.perf_counter() - start, events
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--input", default=crawler.INPUT_FILE)
+    parser.add_argument("--pages", type=int, default=12)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[2, 4, 8])
+    args = parser.parse_args()
+
+    # Every call must reach the model for the timings to mean anything
+    crawler.extraction_cache = None
+
+    pages = load_pages(args.input, args.pages)
+    if not pages:
+        print("No pages could be fetched")
+        return
+    print(f"Benchmarking extraction over {len(pages)} summarized pages with {crawler.MODEL}\n")
+
+    rows = [("single", *time_single(pages))]
+    for batch_size in args.batch_sizes:
+        rows.append((f"batch={batch_size}", *time_batched(pages, batch_size)))
+
+    baseline = rows[0][1]
+    print(f"\n{'mode':12} {'seconds':>9} {'pages/min':>10} {'events':>7} {'speedup':>8}")
+    for mode, elapsed, events in rows:
+        print(f"{mode:12} {elapsed:9.1f} {len(pages) / elapsed * 60:10.1f} {events:7} {baseline / elapsed:7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
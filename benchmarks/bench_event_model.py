@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Event model benchmark
+Compares the slotted utils.schema.Event with the plain dicts the pipeline
+used to pass around: memory held per event, coercion of raw LLM output and
+JSON serialization throughput (Event.to_json, and json.dumps of to_dict()).
+
+Usage:
+    python benchmarks/bench_event_model.py [--events 100000]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.schema import events_from_llm
+
+VENUES = ["Pérez Art Museum", "The Fillmore", "Bayfront Park", "Wynwood Walls", "Adrienne Arsht Center"]
+HOSTS = ["City of Miami", "Live Nation", "Miami-Dade Parks", ""]
+
+
+def raw_events(count, seed=7):
+    """LLM-shaped event dicts, each with its own string objects as json.loads returns them"""
+    rng = random.Random(seed)
+    events = []
+    for i in range(count):
+        venue = rng.choice(VENUES)
+        day = rng.randint(1, 28)
+        events.append(json.loads(json.dumps({
+            "name": f"Event {i} at {venue}",
+            "venue_name": venue,
+            "venue_address": f"{rng.randint(1, 999)} Biscayne Blvd, Miami, FL",
+            "start_datetime": f"2026-05-{day:02d}T{rng.randint(10, 21)}:00:00",
+            "end_datetime": "",
+            "short_description": "An evening of live music and food trucks.",
+            "price": rng.choice(["Free", "$10", "$25"]),
+            "host": rng.choice(HOSTS),
+            "source_websites": [f"https://example.com/events/{i}"],
+            "hero_images": [],
+            "source": "https://example.com/events/",
+            "event_id": f"{i:016x}",
+            "city": "Miami",
+            "state": "FL",
+        })))
+    return events
+
+
+def measure(build):
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - started
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, size, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=100_000)
+    args = parser.parse_args()
+
+    dicts, dict_bytes, _ = measure(lambda: raw_events(args.events))
+    # The raw dicts are dropped inside the measurement, so only what the Events keep counts
+    events, event_bytes, _ = measure(lambda: events_from_llm(raw_events(args.events)))
+    source = raw_events(args.events)
+    started = time.perf_counter()
+    events_from_llm(source)
+    coerce_seconds = time.perf_counter() - started
+    del source
+
+    started = time.perf_counter()
+    for event in dicts:
+        json.dumps(event, ensure_ascii=False)
+    dict_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for event in events:
+        json.dumps(event.to_dict(), ensure_ascii=False)
+    to_dict_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for event in events:
+        event.to_json()
+    event_seconds = time.perf_counter() - started
+    mismatches = sum(event.to_json() != json.dumps(event.to_dict(), ensure_ascii=False) for event in events)
+
+    n = args.events
+    print(f"{n} events\n")
+    print(f"{'':12} {'bytes/event':>12} {'serialize ev/s':>16}")
+    print(f"{'dict':12} {dict_bytes / n:12.0f} {n / dict_seconds:16,.0f}")
+    print(f"{'Event':12} {event_bytes / n:12.0f} {n / event_seconds:16,.0f}")
+    print(f"{'  to_dict':12} {'':>12} {n / to_dict_seconds:16,.0f}")
+    print(f"\nCoercion of LLM output: {n / coerce_seconds:,.0f} events/s "
+          f"| memory saved: {1 - event_bytes / dict_bytes:.0%}")
+    if mismatches:
+        print(f"⚠️ Event.to_json differs from json.dumps(to_dict()) for {mismatches} events")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+HTML parser backend benchmark
+Times visible-text + image extraction for each installed parser backend over
+the saved HTML fixtures in benchmarks/fixtures/ and checks that the fast
+backends agree with BeautifulSoup.
+
+Usage:
+    python benchmarks/bench_html_parsers.py [--repeat 20] [--save URL ...]
+
+--save downloads pages into the fixtures directory first, so real calendar
+pages can be added to the comparison.
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+from urllib.parse import urlparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.html_parsers import PARSERS, available_backends
+from utils.http_client import get_session
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+BASE_URL = "https://example.com/events/"
+
+
+def save_fixture(url):
+    response = get_session().get(url, timeout=30)
+    response.raise_for_status()
+    parsed = urlparse(url)
+    name = (parsed.netloc + parsed.path).strip("/").replace("/", "_") or parsed.netloc
+    path = os.path.join(FIXTURES_DIR, f"{name}.html")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(response.text)
+    print(f"Saved {url} -> {path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--save", nargs="*", default=[], metavar="URL")
+    args = parser.parse_args()
+
+    for url in args.save:
+        save_fixture(url)
+
+    fixtures = sorted(glob.glob(os.path.join(FIXTURES_DIR, "*.html")))
+    if not fixtures:
+        print(f"No fixtures found in {FIXTURES_DIR}")
+        return
+
+    backends = available_backends()
+    print(f"Backends: {', '.join(backends)} | fixtures: {len(fixtures)} | repeat: {args.repeat}\n")
+    print(f"{'fixture':40} {'KB':>6} " + " ".join(f"{b + ' ms':>14}" for b in backends) + "  agrees")
+
+    totals = dict.fromkeys(backends, 0.0)
+    for path in fixtures:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            html = f.read()
+
+        timings = {}
+        outputs = {}
+        for backend in backends:
+            parse = PARSERS[backend]
+            start = time.perf_counter()
+            for _ in range(args.repeat):
+                outputs[backend] = parse(html, BASE_URL)
+            timings[backend] = (time.perf_counter() - start) / args.repeat * 1000
+            totals[backend] += timings[backend]
+
+        reference = outputs["bs4"]
+        agrees = ",".join(b for b in backends if b != "bs4" and outputs[b] == reference) or "-"
+        print(f"{os.path.basename(path)[:40]:40} {len(html) / 1024:6.0f} "
+              + " ".join(f"{timings[b]:14.2f}" for b in backends) + f"  {agrees}")
+
+    print("\nSpeedup vs bs4: " + ", ".join(
+        f"{b} {totals['bs4'] / totals[b]:.1f}x" for b in backends if b != "bs4"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+JSON extraction benchmark
+Fuzzes utils.ollama_client.find_json_objects with generated LLM answers
+(prose around the array, nested URL lists, braces and escaped quotes inside
+strings, stray braces in the prose, truncated endings) and checks it
+recovers exactly the complete events. Then times it against the non-greedy
+regex the crawler used before, and on adversarial answers (thousands of
+unclosed braces, arrays of malformed objects) whose time must grow
+linearly with their length.
+
+Usage:
+    python benchmarks/bench_json_extraction.py [--cases 2000] [--events 200] [--seed 1] [--scale 1]
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import textwrap
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.ollama_client import find_json_objects
+
+OLD_PATTERN = re.compile(r"\[\s*{.*?}\s*\]", re.DOTALL)
+PREFIXES = ["", "Sure! Here are the events:\n", "```json\n", 'Found these "events" [see below]:\n',
+            "Use { carefully.\n", "Note {this} first:\n"]
+SUFFIXES = ["", "\n```", "\nLet me know if you need anything else {or more}!"]
+AWKWARD_TEXT = ['Rock {and} roll', 'The "Big" Show', "Back\\slash", "[Free] entry", "Café ☕ night", "}]"]
+
+
+def old_extract(text):
+    match = OLD_PATTERN.search(text)
+    if not match:
+        return []
+    try:
+        return json.loads(match.group(0))
+    except json.JSONDecodeError:
+        return []
+
+
+def random_event(rng, i, texts=AWKWARD_TEXT):
+    return {
+        "name": f"{rng.choice(texts)} {i}",
+        "venue_name": rng.choice(["Hall", "Park", ""]),
+        "start_datetime": f"2026-05-{rng.randint(1, 28):02d}T19:00:00",
+        "short_description": " ".join(rng.choice(texts) for _ in range(rng.randint(0, 4))),
+        "source_websites": [f"https://example.com/e/{i}/{j}" for j in range(rng.randint(0, 3))],
+        "hero_images": [],
+    }
+
+
+def render(events, indent, ascii_only):
+    """json.dumps of the array, plus the offset where each element ends"""
+    elements = [json.dumps(e, indent=indent, ensure_ascii=ascii_only) for e in events]
+    if indent:
+        elements = [textwrap.indent(element, " " * indent) for element in elements]
+        opening, separator, closing = "[\n", ",\n", "\n]"
+    else:
+        opening, separator, closing = "[", ", ", "]"
+    ends = []
+    offset = len(opening)
+    for element in elements:
+        offset += len(element)
+        ends.append(offset)
+        offset += len(separator)
+    return opening + separator.join(elements) + closing, ends
+
+
+def random_case(rng, max_events):
+    """(model output, events a correct parser must return)"""
+    events = [random_event(rng, i) for i in range(rng.randint(0, max_events))]
+    body, ends = render(events, rng.choice([None, 2]), rng.random() < 0.5)
+    prefix = rng.choice(PREFIXES)
+    text = prefix + body + rng.choice(SUFFIXES)
+    if events and rng.random() < 0.3:
+        # Cut the answer off mid-way, as when the model hits its token limit
+        cut = rng.randint(len(prefix) + 1, len(prefix) + len(body) - 1)
+        return text[:cut], [e for e, end in zip(events, ends) if len(prefix) + end <= cut]
+    return text, events
+
+
+def fuzz(cases, max_events, seed):
+    rng = random.Random(seed)
+    failures = 0
+    for _ in range(cases):
+        text, expected = random_case(rng, max_events)
+        found = find_json_objects(text)
+        if found != expected:
+            failures += 1
+            if failures <= 3:
+                print(f"Mismatch: expected {len(expected)} events, got {len(found)}\n{text[:300]!r}\n")
+    return failures
+
+
+def timed(function, texts):
+    started = time.perf_counter()
+    recovered = sum(len(function(text)) for text in texts)
+    return time.perf_counter() - started, recovered
+
+
+def adversarial(events, scale):
+    """(label, model output, events a correct parser must return) that would be quadratic for a rescanning parser"""
+    array = json.dumps([{"name": f"Event {i}"} for i in range(events)])
+    expected = [{"name": f"Event {i}"} for i in range(events)]
+    cases = []
+    for braces in (2000 * scale, 4000 * scale, 8000 * scale):
+        cases.append((f"{braces} stray braces", "Use { carefully. " * braces + array, expected))
+    for count in (10000 * scale, 20000 * scale):
+        malformed = "[" + ", ".join('{"name": Event}' for _ in range(count)) + "]"
+        cases.append((f"{count} malformed", malformed, []))
+    return cases
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cases", type=int, default=2000)
+    parser.add_argument("--events", type=int, default=200, help="events per benchmark response")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--scale", type=int, default=1, help="multiplies the size of the adversarial answers")
+    args = parser.parse_args()
+
+    failures = fuzz(args.cases, 12, args.seed)
+    print(f"Fuzz: {args.cases} cases, {failures} mismatches\n")
+
+    # Text the old regex can handle, so both extract the same events
+    rng = random.Random(args.seed)
+    plain = ["Free entry", "Live jazz", "Food trucks"]
+    texts = [PREFIXES[1] + json.dumps([random_event(rng, i, plain) for i in range(args.events)], indent=2)
+             + SUFFIXES[2] for _ in range(20)]
+    size = sum(len(text) for text in texts)
+    print(f"{'extractor':12} {'MB/s':>8} {'events':>8}")
+    for label, function in (("regex", old_extract), ("scanner", find_json_objects)):
+        seconds, recovered = timed(function, texts)
+        print(f"{label:12} {size / seconds / 1e6:8.1f} {recovered:8}")
+    print(f"\n{len(texts) * args.events} events in total\n")
+
+    print(f"{'adversarial':22} {'KB':>8} {'seconds':>8} {'us/KB':>8} {'events':>8}")
+    for label, text, expected in adversarial(args.events, args.scale):
+        seconds, _ = timed(find_json_objects, [text])
+        if find_json_objects(text) != expected:
+            failures += 1
+            print(f"Mismatch on {label}")
+        print(f"{label:22} {len(text) / 1e3:8.0f} {seconds:8.3f} {seconds * 1e9 / len(text):8.1f} {len(expected):8}")
+
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
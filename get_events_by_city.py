@@ -3,8 +3,12 @@ import json
 import pandas as pd
 from pathlib import Path
 
+from utils.event_store import EventStore
+
 OUTPUT_JSON = "output/events.json"
+EVENT_DB = "output/events.sqlite3"
 #python get_events_by_city.py "miami"
+#python get_events_by_city.py "springfield" IL
 
 
 FIELDS = [
@@ -24,12 +28,8 @@ def print_event(event):
         print(f"- {field}: {event.get(field, '')}")
     print("\n" + "-" * 60 + "\n")
 
-def main():
-    if len(sys.argv) < 2:
-        print("Usage: python get_events_by_city.py <city_name>")
-        sys.exit(1)
-
-    city_name = sys.argv[1].lower()
+def find_events_in_json(city_name):
+    """Fallback for output from older runs that has no event index yet"""
     path = Path(OUTPUT_JSON)
 
     if not path.exists():
@@ -43,13 +43,28 @@ def main():
             print("❌ Failed to load JSON.")
             sys.exit(1)
 
-    filtered_events = [
+    return [
     e for e in events if any(
         city_name in (e.get(field, "") or "").lower()
         for field in ["venue_name", "venue_address", "source"]
     )
     ]
 
+def main():
+    if len(sys.argv) < 2:
+        print("Usage: python get_events_by_city.py <city_name> [state_code]")
+        sys.exit(1)
+
+    city_name = sys.argv[1].lower()
+    state = sys.argv[2] if len(sys.argv) > 2 else None
+
+    if Path(EVENT_DB).exists():
+        store = EventStore(EVENT_DB)
+        filtered_events = store.find_by_city(city_name, state)
+        store.close()
+    else:
+        filtered_events = find_events_in_json(city_name)
+
     if not filtered_events:
         print(f"⚠️ No events found for city: {city_name}")
     else:
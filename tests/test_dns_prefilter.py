@@ -0,0 +1,83 @@
+import asyncio
+import os
+import socket
+import struct
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.dns_prefilter import NXDOMAIN, RESOLVED, AiodnsResolver, DnsPrefilter, StaticResolver, aiodns
+
+# Names the stub nameserver answers with an A record; everything else is NXDOMAIN
+FOUND_HOST = "found.test"
+MISSING_HOST = "no-such-host.test"
+
+
+def _answer(query):
+    """NXDOMAIN for every question, or 127.0.0.1 for FOUND_HOST"""
+    query_id, flags = struct.unpack(">HH", query[:4])
+    end = 12
+    labels = []
+    while query[end]:
+        labels.append(query[end + 1:end + 1 + query[end]].decode("ascii"))
+        end += query[end] + 1
+    question = query[12:end + 5]
+    found = ".".join(labels).lower() == FOUND_HOST
+    rcode = 0 if found else 3
+    header = struct.pack(">HHHHHH", query_id, 0x8180 | (flags & 0x0100) | rcode, 1, int(found), 0, 0)
+    answer = b""
+    if found:
+        answer = struct.pack(">HHHIH", 0xC00C, 1, 1, 60, 4) + socket.inet_aton("127.0.0.1")
+    return header + question + answer
+
+
+@pytest.fixture
+def nameserver():
+    """address:port of a local UDP nameserver, so the aiodns tests need no network"""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(("127.0.0.1", 0))
+
+    def serve():
+        while True:
+            try:
+                query, client = sock.recvfrom(512)
+                sock.sendto(_answer(query), client)
+            except OSError:
+                return
+
+    threading.Thread(target=serve, daemon=True).start()
+    yield "127.0.0.1:%d" % sock.getsockname()[1]
+    sock.close()
+
+
+def test_static_resolver_drops_nxdomain_rows():
+    resolver = StaticResolver({FOUND_HOST: RESOLVED})
+    prefilter = DnsPrefilter(resolver)
+    rows = [{"SourceURL": f"http://{FOUND_HOST}/a"}, {"SourceURL": f"http://{MISSING_HOST}/b"},
+            {"SourceURL": f"https://{MISSING_HOST}/c"}]
+    assert [exists for _, exists in prefilter.filter_rows(rows, batch_rows=2)] == [True, False, False]
+    assert prefilter.dropped == 2
+    # Each host is looked up once, however many rows it has
+    assert resolver.lookups == 2
+
+
+@pytest.mark.skipif(aiodns is None, reason="aiodns not installed")
+def test_aiodns_drops_nxdomain_across_event_loops(nameserver):
+    prefilter = DnsPrefilter(AiodnsResolver(nameservers=[nameserver]))
+    # Every batch runs on its own loop, as do the async validator's runs
+    rows = [{"SourceURL": f"http://{MISSING_HOST}/a"}, {"SourceURL": f"http://{FOUND_HOST}/"},
+            {"SourceURL": f"http://second-{MISSING_HOST}/"}]
+    assert [exists for _, exists in prefilter.filter_rows(rows, batch_rows=1)] == [False, True, False]
+    assert asyncio.run(prefilter.check(f"third-{MISSING_HOST}")) == NXDOMAIN
+    assert prefilter.dropped == 2
+
+
+@pytest.mark.skipif(aiodns is None, reason="aiodns not installed")
+def test_resolver_can_be_created_after_a_loop_closed(nameserver):
+    asyncio.run(asyncio.sleep(0))
+    prefilter = DnsPrefilter(AiodnsResolver(nameservers=[nameserver]))
+    assert asyncio.run(prefilter.check(MISSING_HOST)) == NXDOMAIN
+    assert asyncio.run(prefilter.check(FOUND_HOST)) == RESOLVED
@@ -0,0 +1,28 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.event_store import EventStore
+from utils.schema import Event
+
+
+def make_event(event_id, name, venue_name, venue_address):
+    event = Event(name=name, venue_name=venue_name, venue_address=venue_address)
+    event.event_id = event_id
+    return event
+
+
+def test_duplicate_ids_in_one_batch_leave_no_stale_fts_rows(tmp_path):
+    store = EventStore(str(tmp_path / "events.sqlite3"))
+    jazz = make_event("1", "Jazz", "Miami Hall", "1 Main St")
+    store.replace_source("https://a.example/", [jazz, jazz])
+    assert [e["name"] for e in store.find_by_city("miami")] == ["Jazz"]
+    assert store.count() == 1
+
+    # Emptying the table lets SQLite hand the next event a freed rowid
+    store.replace_source("https://a.example/", [])
+    store.replace_source("https://b.example/", [make_event("2", "Opera", "Boston Hall", "2 Main St, Boston, MA")])
+    assert store.find_by_city("miami") == []
+    assert [e["name"] for e in store.find_by_city("boston")] == ["Opera"]
+    store.close()
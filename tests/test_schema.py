@@ -0,0 +1,26 @@
+import json
+import os
+import sys
+from datetime import date, datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.schema import Event
+
+
+def test_to_json_matches_json_dumps_of_to_dict():
+    events = [
+        Event.from_dict({
+            "name": 'The "Big" Show\n\tCafé ☕ \\ night',
+            "venue_name": "Pérez Art Museum",
+            "start_datetime": "2026-05-07T19:30:00",
+            "end_datetime": "2026-05-07",
+            "source_websites": ["https://example.com/a", "https://example.com/b"],
+            "city": "Miami",
+        }),
+        Event(name="Jazz", start_datetime=date(2026, 5, 7), end_datetime=datetime(2026, 5, 7, 22),
+              price=10, hero_images=["https://example.com/i.jpg"]),
+        Event(name="\x00  control"),
+    ]
+    for event in events:
+        assert event.to_json() == json.dumps(event.to_dict(), ensure_ascii=False)
@@ -0,0 +1,47 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import segmentation
+
+ARTICLE = ('<article><h3>Concert number {i}</h3><p>March {day}, 7pm at the park bandshell, free entry.</p>'
+           '</article>')
+CARD = ('<div class="card"><div><h3>Concert number {i}</h3><div>March {day}, 7pm</div>'
+        '<p>Live music at the park bandshell, free entry.</p></div></div>')
+
+
+@pytest.mark.parametrize("backend", ["lxml", "bs4"])
+def test_cards_win_over_plain_div_wrappers(backend, monkeypatch):
+    if backend == "bs4":
+        monkeypatch.setattr(segmentation, "lxml", None)
+    elif segmentation.lxml is None:
+        pytest.skip("lxml not installed")
+    cards = "".join(CARD.format(i=i, day=i + 1) for i in range(10))
+    html = f"<html><body><div><div>{cards}</div></div></body></html>"
+
+    blocks = segmentation.find_event_blocks(html)
+
+    assert len(blocks) == 10
+    assert [f"March {i + 1}, 7pm" in text for i, (text, _) in enumerate(blocks)] == [True] * 10
+
+
+@pytest.mark.parametrize("backend", ["lxml", "bs4"])
+def test_classed_day_sections_do_not_swallow_their_cards(backend, monkeypatch):
+    if backend == "bs4":
+        monkeypatch.setattr(segmentation, "lxml", None)
+    elif segmentation.lxml is None:
+        pytest.skip("lxml not installed")
+    days = "".join(
+        f'<section class="day"><h2>Day {day}</h2>'
+        + "".join(ARTICLE.format(i=f"{day}.{i}", day=day) for i in range(3))
+        + "</section>"
+        for day in range(1, 5)
+    )
+
+    blocks = segmentation.find_event_blocks(f"<html><body>{days}</body></html>")
+
+    assert len(blocks) == 12
+    assert all(text.startswith("Concert number") for text, _ in blocks)
@@ -0,0 +1,39 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.soft404 import Soft404Detector
+
+CONTENT = "<main>" + "<p>Tickets, dates and directions to the venue for this show.</p>" * 20 + "</main>"
+
+
+def page(title, heading=""):
+    return f"<html><head><title>{title}</title></head><body><h1>{heading}</h1>{CONTENT}</body></html>"
+
+
+@pytest.mark.parametrize("title, heading", [
+    ("Forbidden Broadway | Arsht Center", "Forbidden Broadway"),
+    ("Coming Soon: Summer Concerts - City Parks", "Coming Soon: Summer Concerts"),
+])
+def test_error_phrase_inside_a_real_title_is_not_a_soft_404(title, heading):
+    assert Soft404Detector().reason(page(title, heading)) is None
+
+
+@pytest.mark.parametrize("title, heading", [
+    ("Page Not Found | City of Miami", ""),
+    ("403 Forbidden", ""),
+    ("Events", "Coming Soon"),
+])
+def test_title_or_heading_that_is_an_error_phrase_is_a_soft_404(title, heading):
+    assert Soft404Detector().reason(page(title, heading)).startswith("Error phrase in page title/heading")
+
+
+def test_phrase_shared_with_the_hosts_random_path_page_is_a_soft_404():
+    detector = Soft404Detector()
+    probe = detector.make_probe(200, "https://example.com/x", "<title>Sorry, that page is no longer available</title>")
+    html = page("Sorry, this event is no longer available | Example")
+    assert detector.reason(html) is None
+    assert detector.reason(html, probe=probe) is not None
@@ -1,6 +1,5 @@
 
-import requests
-import json
+from utils.ollama_client import find_json_objects, stream_generate_events
 
 def extract_event_data_with_ollama(text, image_urls, model="mistral"):
     prompt = f"""
@@ -25,18 +24,16 @@ Image URLs:
 Return a list of events in JSON array format.
 """
     try:
-        response = requests.post(
-            "http://localhost:11434/api/generate",
-            json={"model": model, "prompt": prompt, "stream": False},
-            timeout=60
-        )
-        output = response.json().get("response", "").strip()
-        try:
-            return json.loads(output)
-        except json.JSONDecodeError:
+        events, output, truncated = stream_generate_events(prompt, model, timeout=60)
+        if truncated:
+            print("⚠️ Response was cut off; keeping the events completed before the cut")
+        if events is not None:
+            return events
+        events = find_json_objects(output)
+        if not events:
             print("⚠️ Could not parse JSON. Raw response:")
-            print(output)
-            return []
+            print(output.strip())
+        return events
     except Exception as e:
         print(f"Error calling Ollama LLM: {e}")
         return []
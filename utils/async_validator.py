@@ -0,0 +1,333 @@
+import asyncio
+import time
+from functools import partial
+
+try:
+    import aiohttp
+except ImportError:  # optional async validation engine
+    aiohttp = None
+
+from utils.politeness import host_key
+from utils.soft404 import Soft404Detector
+
+SNIFF_BYTES = 16 * 1024   # start of the page read for error-page detection
+MAX_CACHED_BYTES = 8 * 1024 * 1024  # larger pages are sniffed but not cached
+MAX_IN_FLIGHT = 1000      # requests open at once across all hosts
+PER_HOST_LIMIT = 4        # requests open at once to a single host
+MIN_CONTENT_CHARS = 100   # shorter pages are reported as minimal_content
+
+# Pages whose content is worth sniffing; feeds, PDFs etc. are judged on status alone
+SNIFF_CONTENT_TYPES = ("text/html", "application/xhtml+xml", "text/plain", "")
+# HEAD answers that say nothing about the page, only that the server does not do HEAD
+HEAD_UNSUPPORTED = {403, 405, 501}
+
+
+def empty_result(url):
+    return {
+        'url': url,
+        'status': 'unknown',
+        'status_code': None,
+        'response_time': None,
+        'error': None,
+        'redirect_url': None,
+        'content_length': None,
+        'content_type': None
+    }
+
+
+def unresolvable_result(url):
+    """Result for a URL whose domain does not exist (no request was made)"""
+    result = empty_result(url)
+    result['status'] = 'dns_error'
+    result['error'] = 'Domain does not resolve (NXDOMAIN)'
+    return result
+
+
+def classify(status_code, text=None, content_length=None, soft_404=None):
+    """
+    Validation status for a response.
+
+    Args:
+        status_code: Final HTTP status (after redirects)
+        text: Page text, or the start of it; None when the body was not read
+        content_length: Full body size in bytes, if known
+        soft_404: Why the page is an error page despite its status
+            (utils.soft404.Soft404Detector.reason), or None
+
+    Returns:
+        tuple: (status, error message or None)
+    """
+    if status_code in (200, 206):
+        if text is None:
+            return 'success', None
+        if soft_404:
+            return 'error_page', soft_404
+        length = content_length if content_length is not None else len(text)
+        if length < MIN_CONTENT_CHARS:  # Very short content might indicate an error
+            return 'minimal_content', 'Page has minimal content'
+        return 'success', None
+    if status_code in (301, 302, 303, 307, 308):
+        return 'redirect', None
+    if status_code == 404:
+        return 'not_found', 'Page not found'
+    if status_code == 403:
+        return 'forbidden', 'Access forbidden'
+    if status_code == 429:
+        return 'rate_limited', 'Too many requests'
+    if status_code >= 500:
+        return 'server_error', f'Server error: {status_code}'
+    return 'other_error', f'HTTP {status_code}'
+
+
+def _content_length(headers, body):
+    content_range = headers.get('Content-Range', '')
+    if '/' in content_range:
+        total = content_range.rsplit('/', 1)[1]
+        if total.isdigit():
+            return int(total)
+    length = headers.get('Content-Length')
+    if length and length.isdigit() and 'Content-Range' not in headers:
+        return int(length)
+    return len(body) if body is not None else None
+
+
+class AsyncURLChecker:
+    """
+    asyncio URL validation engine for large source lists.
+
+    Each URL costs one ranged GET that reads at most sniff_bytes of the
+    page, enough for error-page detection without downloading it. With
+    sniff_bytes=0 only a HEAD is sent (falling back to GET for servers that
+    reject HEAD). Thousands of requests can be open at once, while each
+    host gets at most per_host of them and the shared HostScheduler's rate
+    limit and 429 back-off.
+
+    With a cache (the HttpCache shared with the crawler), the GET is
+    conditional on the stored copy instead: a 304 is judged on the cached
+    body, and a 200 that carries an ETag or Last-Modified is read in full
+    and stored, so the crawl that follows revalidates it rather than
+    downloading it again. Pages without validators are still only sniffed.
+    """
+
+    def __init__(self, scheduler=None, timeout=10, headers=None, max_in_flight=MAX_IN_FLIGHT,
+                 per_host=PER_HOST_LIMIT, sniff_bytes=SNIFF_BYTES, max_rate_limit_retries=2,
+                 detector=None, probe_hosts=True, dns=None, cache=None):
+        """
+        Args:
+            scheduler: Optional HostScheduler for per-host rate limits and 429 back-off
+            timeout: Seconds allowed per request
+            headers: Headers sent with every request
+            max_in_flight: Requests open at once across all hosts
+            per_host: Requests open at once to a single host
+            sniff_bytes: Bytes of each page read for error-page detection (0: HEAD only)
+            max_rate_limit_retries: Times a 429 answer is retried once its host is ready again
+            detector: Soft404Detector (shared with other validators to reuse its host probes)
+            probe_hosts: Compare 200 pages with the host's answer for a nonexistent path
+            dns: Optional utils.dns_prefilter.DnsPrefilter; URLs on domains that
+                do not exist are reported without an HTTP request
+            cache: Optional utils.http_cache.HttpCache to revalidate against and fill
+        """
+        if aiohttp is None:
+            raise ImportError("aiohttp is required for async validation (pip install aiohttp)")
+        self.scheduler = scheduler
+        self.timeout = timeout
+        self.headers = dict(headers or {})
+        self.max_in_flight = max_in_flight
+        self.per_host = per_host
+        self.sniff_bytes = sniff_bytes
+        self.max_rate_limit_retries = max_rate_limit_retries
+        self.detector = detector or Soft404Detector()
+        self.probe_hosts = probe_hosts
+        self.dns = dns
+        self.cache = cache
+        self._host_limits = {}
+        self._in_flight = None
+
+    def create_session(self):
+        connector = aiohttp.TCPConnector(
+            limit=self.max_in_flight,
+            limit_per_host=self.per_host,
+            ssl=False,  # Skip SSL verification for problematic sites
+            ttl_dns_cache=300,
+        )
+        return aiohttp.ClientSession(
+            connector=connector,
+            headers=self.headers,
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+        )
+
+    async def _throttle(self, url):
+        if self.scheduler is None:
+            return
+        while True:
+            wait = self.scheduler.try_acquire(url)
+            if wait == 0:
+                return
+            await asyncio.sleep(wait)
+
+    async def _read_start(self, response, limit=None):
+        limit = limit or self.sniff_bytes
+        chunks = []
+        size = 0
+        while size < limit:
+            chunk = await response.content.read(limit - size)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            size += len(chunk)
+        return b"".join(chunks)
+
+    async def _fetch(self, session, url):
+        """(status_code, final_url, headers, text or None, content_length)"""
+        if not self.sniff_bytes:
+            async with session.head(url, allow_redirects=True) as response:
+                if response.status not in HEAD_UNSUPPORTED:
+                    return (response.status, str(response.url), response.headers, None,
+                            _content_length(response.headers, None))
+
+        return await self._get_start(session, url, self.cache)
+
+    async def _get_start(self, session, url, cache=None):
+        meta = cached = None
+        if cache is not None:
+            meta, cached = cache.load(url)
+            headers = cache.validators(meta)
+        else:
+            headers = {'Range': f'bytes=0-{max(self.sniff_bytes, 1) - 1}'}
+        async with session.get(url, allow_redirects=True, headers=headers) as response:
+            status = response.status
+            content_type = response.headers.get('Content-Type', '').split(';')[0].strip().lower()
+            if status == 304 and meta:
+                cache.count(hit=True)
+                text = cached[:self.sniff_bytes].decode(meta.get('encoding') or 'utf-8', errors='replace')
+                return (200, meta.get('final_url') or url, {'Content-Type': meta.get('content_type', '')},
+                        text, len(cached))
+            if cache is not None:
+                cache.count(hit=False)
+            body = None
+            if status == 416:
+                # Range not satisfiable: the page is empty
+                status, body = 200, b""
+            elif self.sniff_bytes and status in (200, 206) and content_type in SNIFF_CONTENT_TYPES:
+                if cache is not None and cache.storable(status, response.headers):
+                    body = await self._read_start(response, MAX_CACHED_BYTES + 1)
+                    if len(body) <= MAX_CACHED_BYTES:
+                        cache.write(url, str(response.url), response.headers, body, response.charset)
+                else:
+                    body = await self._read_start(response)
+            # Leaving the block without reading the rest drops the connection
+            # instead of downloading pages that ignored the Range header
+            length = _content_length(response.headers, body)
+            if body is not None:
+                body = body[:self.sniff_bytes]
+            text = body.decode(response.charset or 'utf-8', errors='replace') if body is not None else None
+            return status, str(response.url), response.headers, text, length
+
+    async def check_url(self, session, url):
+        """
+        Check if a URL is accessible
+
+        Returns:
+            dict: Result dictionary with URL status information, as URLValidator.check_url
+        """
+        result = empty_result(url)
+        start_time = time.monotonic()
+        try:
+            status_code, final_url, headers, text, content_length = await self._fetch(session, url)
+        except asyncio.TimeoutError:
+            result['status'] = 'timeout'
+            result['error'] = f'Request timeout after {self.timeout}s'
+            return result
+        except aiohttp.TooManyRedirects:
+            result['status'] = 'redirect_error'
+            result['error'] = 'Too many redirects'
+            return result
+        except aiohttp.ClientSSLError:
+            result['status'] = 'ssl_error'
+            result['error'] = 'SSL certificate error'
+            return result
+        except (aiohttp.ClientConnectionError, OSError):
+            result['status'] = 'connection_error'
+            result['error'] = 'Connection failed'
+            return result
+        except Exception as e:
+            result['status'] = 'unknown_error'
+            result['error'] = str(e)
+            return result
+
+        if self.scheduler is not None:
+            self.scheduler.record_response(url, status_code, headers)
+        result.update({
+            'status_code': 200 if status_code == 206 else status_code,
+            'response_time': round(time.monotonic() - start_time, 2),
+            'content_length': content_length,
+            'content_type': headers.get('content-type', '').split(';')[0]
+        })
+        if final_url != url:
+            result['redirect_url'] = final_url
+        soft_404 = None
+        if text is not None and status_code in (200, 206):
+            probe = None
+            if self.probe_hosts:
+                probe = await self.detector.probe_async(url, partial(self._probe_fetch, session))
+            soft_404 = self.detector.reason(text, url, final_url, probe)
+        result['status'], result['error'] = classify(status_code, text, content_length, soft_404)
+        return result
+
+    async def _probe_fetch(self, session, url):
+        status_code, final_url, _, text, _ = await self._get_start(session, url)
+        return status_code, final_url, text or ""
+
+    async def process_row(self, session, row, key='SourceURL'):
+        """Check one input row; returns the row combined with its result"""
+        url = row[key]
+        if self.dns is not None and not await self.dns.exists(url):
+            return {**row, **unresolvable_result(url)}
+        host = host_key(url)
+        limit = self._host_limits.get(host)
+        if limit is None:
+            limit = self._host_limits[host] = [asyncio.Semaphore(self.per_host), 0]
+        limit[1] += 1
+        try:
+            async with limit[0]:
+                for attempt in range(self.max_rate_limit_retries + 1):
+                    # Rate-limited URLs wait here until the scheduler
+                    # releases their host after Retry-After
+                    await self._throttle(url)
+                    async with self._in_flight:
+                        result = await self.check_url(session, url)
+                    if result['status'] != 'rate_limited':
+                        break
+        finally:
+            limit[1] -= 1
+            if not limit[1]:
+                del self._host_limits[host]
+        return {**row, **result}
+
+    async def run(self, rows, on_result, key='SourceURL'):
+        """
+        Validate rows, calling on_result(row, combined_row) as each check completes.
+
+        Rows are read lazily and at most a few times max_in_flight checks
+        are pending at once, so the input can be a generator of any size.
+        """
+        self._in_flight = asyncio.Semaphore(self.max_in_flight)
+        pending = asyncio.Semaphore(self.max_in_flight * 4)
+        tasks = set()
+
+        async def process(row):
+            try:
+                on_result(row, await self.process_row(session, row, key))
+            except Exception as e:
+                print(f"Error processing URL: {e}")
+            finally:
+                pending.release()
+
+        async with self.create_session() as session:
+            for row in rows:
+                await pending.acquire()
+                task = asyncio.create_task(process(row))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks)
@@ -0,0 +1,158 @@
+import os
+import re
+import shutil
+
+from datetime import datetime
+
+from utils.schema import parse_when
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # optional columnar export
+    pa = None
+
+PARQUET_DIR = "output/events_parquet"
+PARTITION_COLUMNS = ("state", "event_month")
+UNKNOWN_PARTITION = "unknown"
+ROWS_PER_FILE = 50_000        # rows buffered per partition before a file is written
+MAX_BUFFERED_ROWS = 200_000   # rows buffered across all partitions
+
+_SAFE_PARTITION = re.compile(r"^[A-Za-z0-9_-]+$")
+
+
+def event_schema():
+    """Arrow schema of the data files (partition columns live in the directory names)"""
+    text = pa.string()
+    category = pa.dictionary(pa.int32(), pa.string())
+    return pa.schema([
+        ("event_id", text),
+        ("name", text),
+        ("venue_name", category),
+        ("venue_address", text),
+        ("start_datetime", pa.timestamp("ms")),
+        ("start_date", pa.date32()),
+        ("end_datetime", pa.timestamp("ms")),
+        ("end_date", pa.date32()),
+        ("short_description", text),
+        ("price", text),
+        ("host", category),
+        ("source_websites", pa.list_(text)),
+        ("hero_images", pa.list_(text)),
+        ("source", category),
+        ("city", category),
+    ])
+
+
+def _partition_value(value):
+    value = str(value or "").strip()
+    return value if _SAFE_PARTITION.match(value) else UNKNOWN_PARTITION
+
+
+def _when_columns(value):
+    """(timestamp, date) of a start/end; the timestamp stays empty when only the day is known"""
+    when = parse_when(value)
+    if isinstance(when, datetime):
+        return when, when.date()
+    return None, when
+
+
+def _list_value(value):
+    if isinstance(value, list):
+        return [str(item) for item in value if item]
+    return [str(value)] if value else []
+
+
+class ParquetEventWriter:
+    """
+    Columnar event export, hive-partitioned as state=XX/event_month=YYYY-MM.
+
+    Dates are typed timestamps (plus a date column, the only one filled
+    when the source gave no time of day), venue/host/source/city are dictionary
+    encoded and URL lists are native list columns, so readers can prune
+    partitions and load only the columns they query. Rows are buffered per
+    partition and written as separate files, so no writer stays open and
+    memory is bounded by MAX_BUFFERED_ROWS. The export is built next to the
+    target directory and swapped in on close().
+    """
+
+    def __init__(self, base_dir=PARQUET_DIR):
+        if pa is None:
+            raise ImportError("pyarrow is required for the Parquet export (pip install pyarrow)")
+        self.base_dir = base_dir
+        self.tmp_dir = base_dir + ".tmp"
+        self.schema = event_schema()
+        self.count = 0
+        self._buffers = {}
+        self._buffered = 0
+        self._files = 0
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+        os.makedirs(self.tmp_dir)
+
+    def write(self, event):
+        start, start_date = _when_columns(event.get("start_datetime"))
+        end, end_date = _when_columns(event.get("end_datetime"))
+        partition = (
+            _partition_value((event.get("state") or "").upper()),
+            start_date.strftime("%Y-%m") if start_date else UNKNOWN_PARTITION,
+        )
+        rows = self._buffers.setdefault(partition, [])
+        rows.append({
+            "event_id": event.get("event_id"),
+            "name": event.get("name"),
+            "venue_name": event.get("venue_name") or None,
+            "venue_address": event.get("venue_address"),
+            "start_datetime": start,
+            "start_date": start_date,
+            "end_datetime": end,
+            "end_date": end_date,
+            "short_description": event.get("short_description"),
+            "price": event.get("price"),
+            "host": event.get("host") or None,
+            "source_websites": _list_value(event.get("source_websites")),
+            "hero_images": _list_value(event.get("hero_images")),
+            "source": event.get("source"),
+            "city": event.get("city") or None,
+        })
+        self.count += 1
+        self._buffered += 1
+        if len(rows) >= ROWS_PER_FILE:
+            self._flush(partition)
+        elif self._buffered >= MAX_BUFFERED_ROWS:
+            for key in list(self._buffers):
+                self._flush(key)
+
+    def _flush(self, partition):
+        rows = self._buffers.pop(partition, None)
+        if not rows:
+            return
+        state, month = partition
+        directory = os.path.join(self.tmp_dir, f"state={state}", f"event_month={month}")
+        os.makedirs(directory, exist_ok=True)
+        table = pa.Table.from_pylist(rows, schema=self.schema)
+        pq.write_table(table, os.path.join(directory, f"part-{self._files:05d}.parquet"))
+        self._files += 1
+        self._buffered -= len(rows)
+
+    def close(self):
+        for key in list(self._buffers):
+            self._flush(key)
+        shutil.rmtree(self.base_dir, ignore_errors=True)
+        os.replace(self.tmp_dir, self.base_dir)
+        return self.count
+
+
+def read_events(base_dir=PARQUET_DIR, columns=None, filters=None):
+    """
+    Read the Parquet export, touching only the requested columns and partitions.
+
+    Example:
+        read_events(columns=["name", "start_datetime"],
+                    filters=[("state", "=", "FL"), ("event_month", "=", "2026-05")])
+
+    Returns:
+        pyarrow.Table
+    """
+    if pa is None:
+        raise ImportError("pyarrow is required to read the Parquet export (pip install pyarrow)")
+    return pq.read_table(base_dir, columns=columns, filters=filters, partitioning="hive")
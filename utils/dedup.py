@@ -0,0 +1,202 @@
+import re
+import unicodedata
+import zlib
+from datetime import datetime
+
+import numpy as np
+
+NUM_PERM = 64
+BANDS = 16                # 16 bands x 4 rows: pairs above ~0.5 Jaccard usually share a band
+THRESHOLD = 0.5           # estimated Jaccard of name+venue shingles to call two events the same
+UNDATED_THRESHOLD = 0.8   # stricter when either event has no start date
+MAX_HOUR_GAP = 1          # a 2pm matinee and an 8pm show are different events
+
+LIST_FIELDS = ("source_websites", "hero_images")
+FILL_FIELDS = ("venue_name", "venue_address", "start_datetime", "end_datetime",
+               "short_description", "price", "host")
+
+_STOPWORDS = {"the", "a", "an", "and", "at", "of", "in", "on", "with", "presents", "live", "feat", "featuring"}
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+_ISO_DATE = re.compile(r"(\d{4})-(\d{2})-(\d{2})(?:[T ](\d{1,2}):(\d{2}))?")
+
+# Odd 64-bit multipliers: the product has to wrap modulo 2**64, otherwise the
+# hash grows with the crc32 and every permutation picks the same gram
+_rng = np.random.default_rng(20240601)
+_PERM_A = _rng.integers(0, 2 ** 64, size=NUM_PERM, dtype=np.uint64) | np.uint64(1)
+_PERM_B = _rng.integers(0, 2 ** 64, size=NUM_PERM, dtype=np.uint64)
+_SHIFT = np.uint64(32)
+
+# Band key "dates" for events without a start date, and for the copy of every
+# dated event that only undated events probe
+_UNDATED = ""
+_ANY_DATE = "*"
+
+
+def normalize_text(value):
+    """Lowercase ASCII words without punctuation, accents or filler words"""
+    value = unicodedata.normalize("NFKD", str(value or "")).encode("ascii", "ignore").decode("ascii")
+    words = _NON_ALNUM.sub(" ", value.lower()).split()
+    return " ".join(word for word in words if word not in _STOPWORDS)
+
+
+def normalize_start(value):
+    """(date, hour) of a start datetime; either part is None when unknown"""
+    value = str(value or "").strip()
+    match = _ISO_DATE.search(value)
+    if match:
+        year, month, day, hour, _ = match.groups()
+        return f"{year}-{month}-{day}", int(hour) if hour is not None else None
+    for fmt in ("%B %d, %Y", "%b %d, %Y", "%m/%d/%Y"):
+        try:
+            return datetime.strptime(value, fmt).strftime("%Y-%m-%d"), None
+        except ValueError:
+            continue
+    return None, None
+
+
+def shingles(event):
+    """Character 3-grams of the name plus the venue's words"""
+    venue = normalize_text(event.get("venue_name")).split()
+    # "Jazz Night at Pérez Art Museum" and "Jazz Night" at that venue are one event
+    name = " ".join(word for word in normalize_text(event.get("name")).split() if word not in venue)
+    padded = f" {name} "
+    grams = {padded[i:i + 3] for i in range(len(padded) - 2)} if name else set()
+    grams.update("v:" + word for word in venue)
+    return grams
+
+
+def minhash(grams):
+    """MinHash signature (NUM_PERM uint32 values) with multiply-shift hashing"""
+    if not grams:
+        return np.full(NUM_PERM, 2 ** 32 - 1, dtype=np.uint64)
+    values = np.fromiter((zlib.crc32(g.encode("utf-8")) for g in grams), dtype=np.uint64, count=len(grams))
+    hashed = (_PERM_A[:, None] * values[None, :] + _PERM_B[:, None]) >> _SHIFT
+    return hashed.min(axis=1)
+
+
+def unique(values):
+    """List items in first-seen order without repeats"""
+    seen = set()
+    result = []
+    for value in values or []:
+        key = value.strip() if isinstance(value, str) else value
+        if key and key not in seen:
+            seen.add(key)
+            result.append(key)
+    return result
+
+
+def merge_events(event, duplicate):
+    """Fold a duplicate into event: union the URL lists and fill empty fields"""
+    for field in LIST_FIELDS:
+        event[field] = unique(list(event.get(field) or []) + list(duplicate.get(field) or []))
+    for field in FILL_FIELDS:
+        if not event.get(field) and duplicate.get(field):
+            event[field] = duplicate[field]
+    return event
+
+
+class Deduplicator:
+    """
+    Incremental near-duplicate detection for events.
+
+    Each event gets a MinHash signature over its normalized name and venue.
+    The signature is cut into bands keyed by band and start date, and only
+    events that share a key are compared, so adding an event costs about
+    the same however many came before it, even for a series recurring on
+    hundreds of dates. Undated events go into undated buckets, which dated
+    events also probe, and probe a second set of buckets that holds every
+    dated event, so a copy without a date still meets its dated twin (at the
+    stricter UNDATED_THRESHOLD) in either order.
+    """
+
+    def __init__(self, threshold=THRESHOLD, bands=BANDS):
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = NUM_PERM // bands
+        self._buckets = {}
+        self._signatures = []
+        self._starts = []
+        self.duplicates = 0
+
+    def _bands(self, signature):
+        rows = signature.astype(np.uint32).reshape(self.bands, self.rows)
+        return [rows[band].tobytes() for band in range(self.bands)]
+
+    @staticmethod
+    def _keys(bands, date):
+        return [hash((band, date, rows)) for band, rows in enumerate(bands)]
+
+    def _same_event(self, candidate, signature, start):
+        (date, hour), (other_date, other_hour) = start, self._starts[candidate]
+        if date and other_date and date != other_date:
+            return False
+        if hour is not None and other_hour is not None and abs(hour - other_hour) > MAX_HOUR_GAP:
+            return False
+        threshold = self.threshold if date and other_date else UNDATED_THRESHOLD
+        return np.mean(self._signatures[candidate] == signature) >= threshold
+
+    def add(self, event):
+        """
+        Register an event.
+
+        Returns:
+            int or None: index (in add order, counting only distinct events)
+            of the earlier event this one duplicates, or None if it is new
+        """
+        grams = shingles(event)
+        signature = minhash(grams)
+        start = normalize_start(event.get("start_datetime"))
+        # Nameless events cannot be matched reliably; keep them all
+        bands = self._bands(signature) if grams else []
+        date = start[0]
+        if date:
+            probe = self._keys(bands, date) + self._keys(bands, _UNDATED)
+            keys = self._keys(bands, date) + self._keys(bands, _ANY_DATE)
+        else:
+            probe = self._keys(bands, _UNDATED) + self._keys(bands, _ANY_DATE)
+            keys = self._keys(bands, _UNDATED)
+
+        checked = set()
+        for key in probe:
+            for candidate in self._buckets.get(key, ()):
+                if candidate not in checked:
+                    checked.add(candidate)
+                    if self._same_event(candidate, signature, start):
+                        self.duplicates += 1
+                        return candidate
+
+        index = len(self._signatures)
+        self._signatures.append(signature.astype(np.uint32))
+        self._starts.append(start)
+        for key in keys:
+            self._buckets.setdefault(key, []).append(index)
+        return None
+
+
+def find_duplicates(events, deduplicator=None):
+    """
+    One streaming pass over events.
+
+    Returns:
+        tuple: (duplicate_positions, merged) where duplicate_positions is the
+        set of stream positions to drop and merged maps the stream position of
+        each kept event that had duplicates to the fields folded in from them,
+        plus a "merged_from" list of the duplicates' source and event_id
+    """
+    deduplicator = deduplicator or Deduplicator()
+    kept_positions = []
+    duplicate_positions = set()
+    merged = {}
+    for position, event in enumerate(events):
+        original = deduplicator.add(event)
+        if original is None:
+            kept_positions.append(position)
+            continue
+        duplicate_positions.add(position)
+        extra = merged.setdefault(kept_positions[original], {"merged_from": []})
+        merge_events(extra, event)
+        # Lets an incremental run carry this source's events forward even
+        # though the export only keeps the first copy
+        extra["merged_from"].append({"source": event.get("source", ""), "event_id": event.get("event_id", "")})
+    return duplicate_positions, merged
@@ -0,0 +1,258 @@
+import asyncio
+import ipaddress
+import os
+import socket
+import sqlite3
+import time
+
+try:
+    import aiodns
+except ImportError:  # optional c-ares resolver; getaddrinfo is used otherwise
+    aiodns = None
+
+from utils.politeness import host_key
+
+NEGATIVE_CACHE_PATH = ".cache/dns_negative.sqlite3"
+NEGATIVE_TTL = 24 * 3600    # seconds a nonexistent domain is remembered
+MAX_LOOKUPS = 256           # DNS queries in flight at once
+LOOKUP_TIMEOUT = 5.0
+BATCH_ROWS = 5000           # rows resolved together by filter_rows()
+
+# Lookup outcomes. Only NXDOMAIN drops a URL; a timeout or SERVFAIL says
+# nothing about the site, so those URLs still get their HTTP request.
+RESOLVED = "resolved"
+NXDOMAIN = "nxdomain"
+UNKNOWN = "unknown"
+
+_NAME_ERRORS = {socket.EAI_NONAME, getattr(socket, "EAI_NODATA", socket.EAI_NONAME)}
+
+
+def hostname(url):
+    """Hostname of a URL, without port or credentials"""
+    host = host_key(url).rsplit("@", 1)[-1]
+    host = host[1:].split("]")[0] if host.startswith("[") else host.split(":")[0]
+    return host.rstrip(".")
+
+
+def _is_ip(host):
+    try:
+        ipaddress.ip_address(host)
+        return True
+    except ValueError:
+        return False
+
+
+class SystemResolver:
+    """Resolves through the OS (getaddrinfo on the event loop's thread pool)"""
+
+    async def resolve(self, host):
+        loop = asyncio.get_running_loop()
+        try:
+            await loop.getaddrinfo(host, None, type=socket.SOCK_STREAM)
+            return RESOLVED
+        except socket.gaierror as e:
+            return NXDOMAIN if e.errno in _NAME_ERRORS else UNKNOWN
+        except UnicodeError:
+            # Not encodable as IDNA; let the HTTP request report it
+            return UNKNOWN
+
+
+class AiodnsResolver:
+    """
+    Resolves with c-ares (aiodns), without a thread per lookup.
+
+    A c-ares channel belongs to the event loop it was created on, and the
+    prefilter runs one loop per batch, so the channel is created inside
+    the running loop and replaced whenever the loop changes.
+    """
+
+    def __init__(self, nameservers=None):
+        self.nameservers = nameservers
+        self._loop = None
+        self._resolver = None
+
+    def _channel(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._resolver = aiodns.DNSResolver(nameservers=self.nameservers, loop=loop)
+            self._loop = loop
+        return self._resolver
+
+    async def resolve(self, host):
+        resolver = self._channel()
+        # query() is deprecated in favour of query_dns() since aiodns 4
+        query = getattr(resolver, "query_dns", None) or resolver.query
+        try:
+            await query(host, "A")
+            return RESOLVED
+        except aiodns.error.DNSError as e:
+            code = e.args[0] if e.args else None
+            if code == aiodns.error.ARES_ENOTFOUND:
+                return NXDOMAIN
+            # ENODATA: the name exists but has no A record (maybe AAAA only)
+            return UNKNOWN
+
+
+class StaticResolver:
+    """
+    Resolver answering from a fixed table, for tests and offline runs.
+
+    Example:
+        StaticResolver({"cityofanytown.gov": RESOLVED}, default=NXDOMAIN)
+    """
+
+    def __init__(self, records, default=NXDOMAIN, delay=0.0):
+        self.records = {host.lower(): outcome for host, outcome in records.items()}
+        self.default = default
+        self.delay = delay
+        self.lookups = 0
+
+    async def resolve(self, host):
+        self.lookups += 1
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        return self.records.get(host.lower(), self.default)
+
+
+def default_resolver():
+    return AiodnsResolver() if aiodns is not None else SystemResolver()
+
+
+class NegativeCache:
+    """Domains that did not exist, in SQLite so later runs skip them too"""
+
+    def __init__(self, path=NEGATIVE_CACHE_PATH, ttl=NEGATIVE_TTL):
+        self.path = path
+        self.ttl = ttl
+        self._conn = None
+
+    def _connect(self):
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._conn = sqlite3.connect(self.path)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS nxdomain ("
+                " host TEXT PRIMARY KEY,"
+                " checked_at REAL NOT NULL)"
+            )
+        return self._conn
+
+    def __contains__(self, host):
+        row = self._connect().execute("SELECT checked_at FROM nxdomain WHERE host = ?", (host,)).fetchone()
+        return row is not None and row[0] >= time.time() - self.ttl
+
+    def add(self, host):
+        conn = self._connect()
+        conn.execute("INSERT OR REPLACE INTO nxdomain (host, checked_at) VALUES (?, ?)", (host, time.time()))
+        conn.commit()
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+class DnsPrefilter:
+    """
+    Drops URLs whose domain does not exist before any HTTP request is made.
+
+    Each hostname is looked up once, however many URLs share it, and up to
+    max_lookups queries run at once. Nonexistent domains are kept in a
+    negative cache, so later runs (and every other URL on the host) fail
+    without a query.
+    """
+
+    def __init__(self, resolver=None, negative_cache=None, max_lookups=MAX_LOOKUPS, timeout=LOOKUP_TIMEOUT):
+        """
+        Args:
+            resolver: Object with `async resolve(host) -> RESOLVED | NXDOMAIN | UNKNOWN`
+                (default: aiodns if installed, else the system resolver)
+            negative_cache: NegativeCache, or None to keep negatives in memory only
+            max_lookups: DNS queries in flight at once
+            timeout: Seconds before a lookup counts as UNKNOWN
+        """
+        self.resolver = resolver or default_resolver()
+        self.negative_cache = negative_cache
+        self.max_lookups = max_lookups
+        self.timeout = timeout
+        self.lookups = 0
+        self.dropped = 0
+        self._outcomes = {}
+        self._pending = {}
+        self._semaphore = None
+
+    async def _lookup(self, host):
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_lookups)
+        async with self._semaphore:
+            self.lookups += 1
+            try:
+                return await asyncio.wait_for(self.resolver.resolve(host), self.timeout)
+            except asyncio.TimeoutError:
+                return UNKNOWN
+
+    async def check(self, host):
+        """RESOLVED, NXDOMAIN or UNKNOWN for a hostname; concurrent callers share one lookup"""
+        host = host.lower().rstrip(".")
+        outcome = self._outcomes.get(host)
+        if outcome is not None:
+            return outcome
+        if not host or _is_ip(host) or host == "localhost":
+            return RESOLVED
+        if self.negative_cache is not None and host in self.negative_cache:
+            self._outcomes[host] = NXDOMAIN
+            return NXDOMAIN
+
+        task = self._pending.get(host)
+        if task is None:
+            task = self._pending[host] = asyncio.ensure_future(self._lookup(host))
+        outcome = await task
+        if self._pending.pop(host, None) is not None:
+            self._outcomes[host] = outcome
+            if outcome == NXDOMAIN and self.negative_cache is not None:
+                self.negative_cache.add(host)
+        return outcome
+
+    async def exists(self, url):
+        """False only when the URL's domain is known not to exist"""
+        exists = await self.check(hostname(url)) != NXDOMAIN
+        if not exists:
+            self.dropped += 1
+        return exists
+
+    async def check_all(self, hosts):
+        """{host: outcome} for a batch of hostnames, resolved concurrently"""
+        hosts = list(dict.fromkeys(hosts))
+        outcomes = await asyncio.gather(*(self.check(host) for host in hosts))
+        return dict(zip(hosts, outcomes))
+
+    def filter_rows(self, rows, key='SourceURL', batch_rows=BATCH_ROWS):
+        """
+        (row, exists) for each row, resolving each batch's distinct hosts together.
+
+        For synchronous callers; runs its own event loop per batch, so it
+        must not be used from inside a running loop.
+        """
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= batch_rows:
+                yield from self._filter_batch(batch, key)
+                batch = []
+        if batch:
+            yield from self._filter_batch(batch, key)
+
+    def _filter_batch(self, batch, key):
+        # Each batch runs on its own loop, so tasks and the semaphore start fresh
+        self._semaphore = None
+        self._pending = {}
+        outcomes = asyncio.run(self.check_all(hostname(row[key]) for row in batch))
+        for row in batch:
+            exists = outcomes.get(hostname(row[key])) != NXDOMAIN
+            if not exists:
+                self.dropped += 1
+            yield row, exists
+
+    def report(self):
+        print(f"🌐 DNS prefilter: {self.lookups} lookups, {self.dropped} URLs dropped "
+              f"on nonexistent domains")
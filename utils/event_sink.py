@@ -0,0 +1,197 @@
+import csv
+import json
+import os
+import time
+
+from utils import columnar
+from utils.dedup import LIST_FIELDS, find_duplicates, merge_events, unique
+
+EVENTS_JSONL = "output/events.jsonl"
+CHECKPOINT_PATH = "output/checkpoint.tsv"
+
+CSV_FIELDS = [
+    "name",
+    "venue_name",
+    "venue_address",
+    "start_datetime",
+    "end_datetime",
+    "short_description",
+    "price",
+    "host",
+    "source_websites",
+    "hero_images",
+    "source",
+    "event_id",
+]
+
+
+class JsonlEventSink:
+    """
+    Append-only JSON Lines sink for extracted events, with a resumable checkpoint.
+
+    Events are appended as each source finishes. After a source's events are
+    written, the checkpoint records the source URL together with the JSONL
+    byte offset at that point; a resumed run truncates the JSONL back to the
+    last checkpointed offset (dropping any half-written source) and skips
+    every source already listed in the checkpoint. Only sources whose
+    extraction succeeded are written, so a failed source is retried.
+    """
+
+    def __init__(self, path=EVENTS_JSONL, checkpoint_path=CHECKPOINT_PATH,
+                 resume=False, fsync_every=25, fsync_interval=10.0):
+        """
+        Args:
+            path: JSONL output file
+            checkpoint_path: File listing completed sources
+            resume: Keep previous output and skip completed sources
+            fsync_every: fsync after this many completed sources
+            fsync_interval: ...or after this many seconds, whichever comes first
+        """
+        self.path = path
+        self.checkpoint_path = checkpoint_path
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self.done = set()
+        self.event_count = 0
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        offset = self._load_checkpoint() if resume else 0
+
+        self._events = open(path, "a+b")
+        self._events.truncate(offset)
+        self._events.seek(offset)
+        self._checkpoint = open(checkpoint_path, "a" if resume else "w", encoding="utf-8")
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def _load_checkpoint(self):
+        offset = 0
+        valid_bytes = 0
+        try:
+            with open(self.checkpoint_path, "rb") as f:
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break  # torn write from a crash
+                    line_offset, url = line.decode("utf-8").rstrip("\n").split("\t", 1)
+                    offset = int(line_offset)
+                    self.done.add(url)
+                    valid_bytes += len(line)
+            with open(self.checkpoint_path, "r+b") as f:
+                f.truncate(valid_bytes)
+        except FileNotFoundError:
+            pass
+        return offset
+
+    def write(self, url, events):
+        """Append a finished source's events and mark the source as done (not for failed sources)"""
+        for event in events:
+            self._events.write(event.to_json().encode("utf-8"))
+            self._events.write(b"\n")
+        self._events.flush()
+        self.event_count += len(events)
+
+        self._checkpoint.write(f"{self._events.tell()}\t{url}\n")
+        self._checkpoint.flush()
+        self.done.add(url)
+
+        self._unsynced += 1
+        if (self._unsynced >= self.fsync_every
+                or time.monotonic() - self._last_sync >= self.fsync_interval):
+            self.sync()
+
+    def sync(self):
+        # Events must hit disk before the checkpoint that vouches for them
+        os.fsync(self._events.fileno())
+        os.fsync(self._checkpoint.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def close(self):
+        self.sync()
+        self._events.close()
+        self._checkpoint.close()
+
+
+def iter_jsonl(path):
+    """Stream events from a JSONL file, skipping a torn trailing line"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    print(f"⚠️ Skipping unreadable line in {path}")
+    except FileNotFoundError:
+        return
+
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, (list, dict)):
+        return str(value)
+    return value
+
+
+def compact(jsonl_path, json_path, csv_path, dedupe=True, parquet_dir=None):
+    """
+    Produce the final events.json / events.csv exports from the JSONL log.
+
+    Events are streamed one at a time, so memory use does not depend on the
+    size of the dataset. With dedupe, a first pass finds near-duplicate events
+    (see utils.dedup); the export then keeps the first copy of each event with
+    the source websites and images of its duplicates merged in. With
+    parquet_dir, the same events are also written as a partitioned Parquet
+    dataset (see utils.columnar); this is skipped if pyarrow is not installed.
+
+    Returns:
+        int: Number of events exported
+    """
+    duplicates, merged = set(), {}
+    if dedupe:
+        duplicates, merged = find_duplicates(iter_jsonl(jsonl_path))
+        if duplicates:
+            print(f"🔁 Merged {len(duplicates)} duplicate events into {len(merged)}")
+
+    parquet = None
+    if parquet_dir:
+        if columnar.pa is None:
+            print("⚠️ pyarrow is not installed; skipping the Parquet export")
+        else:
+            parquet = columnar.ParquetEventWriter(parquet_dir)
+
+    count = 0
+    json_tmp = json_path + ".tmp"
+    csv_tmp = csv_path + ".tmp"
+
+    with open(json_tmp, "w", encoding="utf-8") as f_json, \
+            open(csv_tmp, "w", encoding="utf-8", newline="") as f_csv:
+        writer = csv.DictWriter(f_csv, fieldnames=CSV_FIELDS, extrasaction="ignore")
+        writer.writeheader()
+
+        f_json.write("[")
+        for position, event in enumerate(iter_jsonl(jsonl_path)):
+            if position in duplicates:
+                continue
+            event.pop("merged_from", None)
+            if position in merged:
+                merge_events(event, merged[position])
+                event["merged_from"] = merged[position]["merged_from"]
+            for field in LIST_FIELDS:
+                if isinstance(event.get(field), list):
+                    event[field] = unique(event[field])
+            f_json.write(",\n" if count else "\n")
+            f_json.write("  " + json.dumps(event, indent=2).replace("\n", "\n  "))
+            writer.writerow({field: _csv_value(event.get(field)) for field in CSV_FIELDS})
+            if parquet is not None:
+                parquet.write(event)
+            count += 1
+        f_json.write("\n]" if count else "]")
+
+    os.replace(json_tmp, json_path)
+    os.replace(csv_tmp, csv_path)
+    if parquet is not None:
+        parquet.close()
+    return count
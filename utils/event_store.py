@@ -0,0 +1,146 @@
+import json
+import os
+import re
+import sqlite3
+import threading
+
+EVENT_DB = "output/events.sqlite3"
+
+# "Springfield, IL 62701" -> ("Springfield", "IL")
+_CITY_STATE = re.compile(r"([A-Za-z][A-Za-z .'-]*?),\s*([A-Z]{2})\b(?:\s+\d{5}(?:-\d{4})?)?")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    event_id TEXT PRIMARY KEY,
+    source TEXT NOT NULL,
+    name TEXT,
+    venue_name TEXT,
+    venue_address TEXT,
+    city TEXT,
+    state TEXT,
+    start_datetime TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_events_city_state ON events(city, state);
+CREATE INDEX IF NOT EXISTS idx_events_source ON events(source);
+
+-- Trigram FTS gives the same case-insensitive substring semantics as the old
+-- linear scan (e.g. "miami" matches "miamigov.com"), but from an index
+CREATE VIRTUAL TABLE IF NOT EXISTS events_fts USING fts5(
+    venue_name, venue_address, source,
+    content='events', content_rowid='rowid', tokenize='trigram'
+);
+CREATE TRIGGER IF NOT EXISTS events_ai AFTER INSERT ON events BEGIN
+    INSERT INTO events_fts(rowid, venue_name, venue_address, source)
+    VALUES (new.rowid, new.venue_name, new.venue_address, new.source);
+END;
+CREATE TRIGGER IF NOT EXISTS events_ad AFTER DELETE ON events BEGIN
+    INSERT INTO events_fts(events_fts, rowid, venue_name, venue_address, source)
+    VALUES ('delete', old.rowid, old.venue_name, old.venue_address, old.source);
+END;
+"""
+
+
+def parse_city_state(address):
+    """Best-effort (city, state) from a US-style street address"""
+    matches = _CITY_STATE.findall(address or "")
+    if not matches:
+        return None, None
+    city, state = matches[-1]
+    # Drop any street part that ended up before the city ("600 Fourth Ave. Seattle")
+    city = city.split(".")[-1].strip()
+    return city or None, state
+
+
+def _fts_phrase(text):
+    return '"' + text.replace('"', '""') + '"'
+
+
+class EventStore:
+    """
+    Embedded SQLite index over extracted events.
+
+    Events are stored with a normalized city/state (indexed) and a trigram
+    full-text index over venue_name, venue_address and source, so city
+    lookups no longer parse and scan the whole events.json.
+    """
+
+    def __init__(self, path=EVENT_DB):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+
+    def replace_source(self, source, events, city=None, state=None):
+        """
+        Replace every stored event of a source with a fresh extraction.
+
+        Args:
+            source: Source URL the events were extracted from
+            events: utils.schema.Event objects (with event_id)
+            city, state: Location of the source itself, used when the venue
+                address does not name one
+        """
+        # One row per event_id, the last copy winning. INSERT OR REPLACE would
+        # drop the earlier copy without firing events_ad, leaving a stale
+        # entry in the FTS index for a rowid that may later be reused.
+        events = list({event.event_id: event for event in events}.values())
+        rows = []
+        for event in events:
+            event_city, event_state = parse_city_state(event.get("venue_address"))
+            rows.append((
+                event.event_id,
+                source,
+                event.get("name"),
+                event.get("venue_name"),
+                event.get("venue_address"),
+                (event_city or city or "").lower() or None,
+                (event_state or state or "").upper() or None,
+                event.get("start_datetime"),
+                event.to_json(),
+            ))
+
+        with self._lock:
+            with self._conn:
+                self._conn.execute("DELETE FROM events WHERE source = ?", (source,))
+                # ...and any copy filed under another source, through the trigger too
+                self._conn.executemany("DELETE FROM events WHERE event_id = ?", [row[:1] for row in rows])
+                self._conn.executemany(
+                    "INSERT INTO events (event_id, source, name, venue_name, venue_address,"
+                    " city, state, start_datetime, data) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+
+    def find_by_city(self, city, state=None):
+        """Events whose city matches, or whose venue/address/source mentions the city"""
+        city = city.strip().lower()
+        params = [city]
+        state_clause = ""
+        if state:
+            state_clause = " AND state = ?"
+            params.append(state.upper())
+
+        query = f"SELECT rowid, data FROM events WHERE city = ?{state_clause}"
+        if len(city) >= 3:
+            # Trigram FTS needs at least three characters per term
+            query += (
+                f" UNION SELECT e.rowid, e.data FROM events_fts f JOIN events e ON e.rowid = f.rowid"
+                f" WHERE events_fts MATCH ?{state_clause.replace('state', 'e.state')}"
+            )
+            params.append(_fts_phrase(city))
+            if state:
+                params.append(state.upper())
+        query += " ORDER BY 1"
+
+        with self._lock:
+            return [json.loads(data) for _, data in self._conn.execute(query, params)]
+
+    def count(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM events").fetchone()[0]
+
+    def close(self):
+        self._conn.close()
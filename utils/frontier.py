@@ -0,0 +1,183 @@
+import hashlib
+import math
+import re
+from collections import Counter, namedtuple
+from html import unescape
+from urllib.parse import urljoin, urlsplit
+
+from utils.http_cache import normalize_url
+from utils.politeness import HostQueue
+from utils.segmentation import find_block_links
+
+MAX_DEPTH = 1             # detail-link hops from a listing; pagination does not add depth
+MAX_PAGES = 30            # listing pages fetched per source, seed included
+MAX_DETAILS = 50          # detail pages fetched per source
+SEEN_CAPACITY = 1_000_000
+SEEN_ERROR_RATE = 0.001
+
+# Lower runs first within a host: more listing pages before detail pages
+LISTING_PRIORITY = 0
+DETAIL_PRIORITY = 10
+
+_LINK_TAG = re.compile(r"<(?:a|link)\b([^>]*)>(?:(.*?)</a>)?", re.IGNORECASE | re.DOTALL)
+_ATTR = re.compile(r"([\w-]+)\s*=\s*(?:\"([^\"]*)\"|'([^']*)')")
+_TAGS = re.compile(r"<[^>]+>")
+_NEXT_TEXT = re.compile(r"^\s*(?:next(?:\s+page)?|more events|older(?:\s+events)?|load more|[›»→>]+)\s*[›»→>]*\s*$",
+                        re.IGNORECASE)
+_NEXT_CLASS = re.compile(r"\bnext\b|pagination[_-]*next|pager[_-]*next", re.IGNORECASE)
+_SKIP_EXTENSIONS = (".jpg", ".jpeg", ".png", ".gif", ".webp", ".svg", ".pdf", ".zip", ".ics", ".css", ".js")
+
+# A page in the crawl: which source it belongs to and how it was reached
+CrawlTask = namedtuple("CrawlTask", ["url", "source", "depth", "kind"])
+
+
+class BloomFilter:
+    """
+    Fixed-size set membership with no false negatives.
+
+    Every URL the frontier has considered is recorded here, including the
+    (much larger) set of links it chose not to follow, in a few bits each.
+    """
+
+    def __init__(self, capacity=SEEN_CAPACITY, error_rate=SEEN_ERROR_RATE):
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item):
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        # Double hashing: k positions from two 64-bit halves
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return [(first + i * second) % self.size for i in range(self.hashes)]
+
+    def add(self, item):
+        """Add item; return True if it was not seen before"""
+        new = False
+        for position in self._positions(item):
+            byte, bit = divmod(position, 8)
+            if not self.bits[byte] & (1 << bit):
+                self.bits[byte] |= 1 << bit
+                new = True
+        return new
+
+    def __contains__(self, item):
+        return all(self.bits[p // 8] & (1 << (p % 8)) for p in self._positions(item))
+
+
+def _followable(url, host):
+    parts = urlsplit(url)
+    return (parts.scheme in ("http", "https") and parts.hostname == host
+            and not parts.path.lower().endswith(_SKIP_EXTENSIONS))
+
+
+def find_next_links(html, page_url):
+    """Pagination links: rel="next", or anchors labelled/classed as the next page"""
+    host = urlsplit(page_url).hostname
+    links = []
+    for attrs_text, label in _LINK_TAG.findall(html):
+        attrs = {name.lower(): unescape(double or single) for name, double, single in _ATTR.findall(attrs_text)}
+        href = attrs.get("href", "").strip()
+        if not href or href.startswith(("#", "javascript:")):
+            continue
+        label = unescape(_TAGS.sub(" ", label or ""))
+        is_next = (
+            "next" in attrs.get("rel", "").lower().split()
+            or _NEXT_CLASS.search(attrs.get("class", ""))
+            or _NEXT_CLASS.search(attrs.get("aria-label", ""))
+            or _NEXT_TEXT.match(label)
+        )
+        if is_next:
+            url = urljoin(page_url, href).split("#")[0]
+            if _followable(url, host) and url not in links:
+                links.append(url)
+    return links
+
+
+def find_detail_links(html, page_url):
+    """Same-host links from the page's event cards"""
+    host = urlsplit(page_url).hostname
+    return [url for url in find_block_links(html, page_url) if _followable(url, host)]
+
+
+class Frontier(HostQueue):
+    """
+    URLs still to crawl, discovered from pagination and event-card links.
+
+    A HostQueue of URLs: hosts are served as soon as their rate limit
+    allows, so one source's long pagination never holds up the others, and
+    within a host listing pages go before detail pages. Each source has its
+    own depth and page budgets.
+    """
+
+    def __init__(self, scheduler, seeds=(), max_depth=MAX_DEPTH, max_pages=MAX_PAGES,
+                 max_details=MAX_DETAILS, follow_details=True, seen=None):
+        """
+        Args:
+            scheduler: HostScheduler used to order hosts
+            seeds: Source URLs from the input CSV
+            max_depth: Maximum detail-link hops; following "next" keeps the depth
+            max_pages: Maximum listing pages fetched per source
+            max_details: Maximum detail pages fetched per source
+            follow_details: Also queue the detail pages linked from event cards
+            seen: Optional BloomFilter shared across frontiers
+        """
+        super().__init__(scheduler)
+        self.max_depth = max_depth
+        self.max_pages = max_pages
+        self.max_details = max_details
+        self.follow_details = follow_details
+        self.seen = seen if seen is not None else BloomFilter()
+        self.tasks = {}
+        self.pages = Counter()
+        self.skipped = 0
+        for url in seeds:
+            self.add(url, source=url)
+
+    def add(self, url, source, depth=0, kind="seed"):
+        """Queue url unless it was seen already or its source is out of budget"""
+        budget = self.max_details if kind == "detail" else self.max_pages
+        if depth > self.max_depth or self.pages[source, kind == "detail"] >= budget:
+            self.skipped += 1
+            return False
+        if not self.seen.add(normalize_url(url)):
+            return False
+        self.tasks[url] = CrawlTask(url, source, depth, kind)
+        self.pages[source, kind == "detail"] += 1
+        priority = DETAIL_PRIORITY if kind == "detail" else LISTING_PRIORITY
+        self.put(url, priority=priority + depth)
+        return True
+
+    def mark_seen(self, urls):
+        """Record URLs (e.g. already checkpointed pages) so they are not queued"""
+        for url in urls:
+            self.seen.add(normalize_url(url))
+
+    def source_of(self, url):
+        task = self.tasks.get(url)
+        return task.source if task is not None else url
+
+    def links_from(self, url, page):
+        """
+        (url, source, depth, kind) for the pagination and detail links on a
+        fetched page. Only parses, so it can run off the thread that owns the queue.
+        """
+        task = self.tasks.get(url)
+        if task is None or page is None or not page.html:
+            return []
+        # Pages may redirect; resolve links against the final URL
+        next_kind = "detail" if task.kind == "detail" else "listing"
+        links = [(link, task.source, task.depth, next_kind) for link in find_next_links(page.html, page.url)]
+        if self.follow_details and task.kind != "detail" and task.depth < self.max_depth:
+            links.extend((link, task.source, task.depth + 1, "detail")
+                         for link in find_detail_links(page.html, page.url))
+        return links
+
+    def discover(self, url, page):
+        """Queue the links found on a fetched page; returns how many were new"""
+        return sum(self.add(*link) for link in self.links_from(url, page))
+
+    def report(self):
+        sources = len({source for source, _ in self.pages})
+        print(f"🧭 Frontier: {len(self.tasks)} pages queued across {sources} sources, "
+              f"{self.skipped} links over the depth/page budget")
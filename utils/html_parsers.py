@@ -0,0 +1,121 @@
+from urllib.parse import urljoin
+
+from bs4 import BeautifulSoup
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as HTMLParser
+except ImportError:
+    try:  # selectolax < 0.3.13 only ships the Modest backend
+        from selectolax.parser import HTMLParser
+    except ImportError:  # optional fast path
+        HTMLParser = None
+
+try:
+    import lxml.html
+    from lxml import etree
+except ImportError:  # optional fast path
+    lxml = None
+
+# Tags whose text is never visible on the page
+_INVISIBLE_TAGS = ("script", "style", "template")
+
+
+def _absolute_images(srcs, base_url):
+    images = []
+    seen = set()
+    for src in srcs:
+        src = (src or "").strip()
+        if not src or src.startswith("data:"):
+            continue
+        url = urljoin(base_url, src) if base_url else src
+        if url.startswith("http") and url not in seen:
+            seen.add(url)
+            images.append(url)
+    return images
+
+
+def parse_with_selectolax(html, base_url=None):
+    tree = HTMLParser(html)
+    tree.strip_tags(list(_INVISIBLE_TAGS))
+    images = _absolute_images((node.attributes.get("src") for node in tree.css("img[src]")), base_url)
+    root = tree.root
+    text = root.text(separator="\n", strip=True) if root is not None else ""
+    lines = [line for line in text.split("\n") if line]
+    return "\n".join(lines), images
+
+
+def parse_with_lxml(html, base_url=None):
+    doc = lxml.html.document_fromstring(html)
+    texts = []
+    srcs = []
+    skip_depth = 0
+
+    # Single pass over the tree: visible text and <img src> together
+    for action, element in etree.iterwalk(doc, events=("start", "end")):
+        tag = element.tag if isinstance(element.tag, str) else None
+        if action == "start":
+            if tag in _INVISIBLE_TAGS:
+                skip_depth += 1
+            elif tag is not None and not skip_depth:
+                if tag == "img":
+                    srcs.append(element.get("src"))
+                if element.text and element.text.strip():
+                    texts.append(element.text.strip())
+        else:
+            if tag in _INVISIBLE_TAGS:
+                skip_depth -= 1
+            if not skip_depth and element.tail and element.tail.strip():
+                texts.append(element.tail.strip())
+
+    return "\n".join(texts), _absolute_images(srcs, base_url)
+
+
+def parse_with_bs4(html, base_url=None):
+    soup = BeautifulSoup(html, "html.parser")
+    text = soup.get_text(separator="\n", strip=True)
+    images = _absolute_images((img["src"] for img in soup.find_all("img", src=True)), base_url)
+    return text, images
+
+
+PARSERS = {
+    "selectolax": parse_with_selectolax,
+    "lxml": parse_with_lxml,
+    "bs4": parse_with_bs4,
+}
+
+
+def available_backends():
+    backends = []
+    if HTMLParser is not None:
+        backends.append("selectolax")
+    if lxml is not None:
+        backends.append("lxml")
+    backends.append("bs4")
+    return backends
+
+
+def parse_page(html, base_url=None, backend="auto"):
+    """
+    Extract visible text and absolute image URLs from an HTML page.
+
+    Args:
+        html: Page markup
+        base_url: URL the page was fetched from, used to resolve relative image URLs
+        backend: "auto" (fastest installed parser), "selectolax", "lxml" or "bs4"
+
+    Returns:
+        tuple: (text, image_urls); falls back to BeautifulSoup if a fast
+        parser fails or finds no text
+    """
+    if backend == "auto":
+        backend = available_backends()[0]
+
+    if backend != "bs4":
+        try:
+            text, images = PARSERS[backend](html, base_url)
+            if text:
+                return text, images
+        except Exception as e:
+            print(f"⚠️ {backend} parser failed, falling back to BeautifulSoup: {e}")
+
+    return parse_with_bs4(html, base_url)
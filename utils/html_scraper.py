@@ -4,10 +4,29 @@ from bs4 import BeautifulSoup
 
 import requests
 from bs4 import BeautifulSoup
+from collections import namedtuple
 
+from utils.http_cache import default_cache
+from utils.html_parsers import parse_page
+from utils.http_client import get_session
 
+# "auto" uses the fastest installed parser (selectolax, then lxml) and falls
+# back to BeautifulSoup if it fails
+PARSER_BACKEND = "auto"
 
-def fetch_page_text_and_images(url):
+# A fetched page: raw markup is kept so structured data (JSON-LD, iCal, RSS)
+# can be read directly, alongside the visible text and image URLs
+Page = namedtuple("Page", ["url", "html", "text", "images", "content_type"])
+
+
+def fetch_page_text_and_images(url, scheduler=None, cache=default_cache, parser=None):
+    page = fetch_page(url, scheduler=scheduler, cache=cache, parser=parser)
+    if page is None:
+        return "", []
+    return page.text, page.images
+
+
+def fetch_page(url, scheduler=None, cache=default_cache, parser=None):
     try:
         print(f"Fetching: {url}")
         headers = {
@@ -18,17 +37,19 @@ def fetch_page_text_and_images(url):
             )
         }
 
-        response = requests.get(url, headers=headers, timeout=30)
+        session = get_session()
+        if cache is not None:
+            response = cache.get(session, url, headers=headers, timeout=30)
+        else:
+            response = session.get(url, headers=headers, timeout=30)
+        if scheduler is not None:
+            scheduler.record_response(url, response.status_code, response.headers)
         response.raise_for_status()
 
-        soup = BeautifulSoup(response.text, "html.parser")
-        text = soup.get_text(separator="\n", strip=True)
-        images = [
-            img["src"] for img in soup.find_all("img", src=True)
-            if img["src"].startswith("http")
-        ]
-
-        return text, images
+        html = response.text
+        text, images = parse_page(html, response.url, backend=parser or PARSER_BACKEND)
+        content_type = response.headers.get("Content-Type", "").split(";")[0].strip().lower()
+        return Page(response.url, html, text, images, content_type)
 
     except requests.exceptions.Timeout:
         print(f"⏳ Timeout error: {url}")
@@ -39,7 +60,7 @@ def fetch_page_text_and_images(url):
     except Exception as e:
         print(f"❌ Unexpected error: {url} – {e}")
 
-    return "", []
+    return None
 
 
 
@@ -64,7 +85,7 @@ def fetch_page_text(url):
         }
 
         # Increase timeout to tolerate slow-loading pages
-        response = requests.get(url, headers=headers, timeout=30)
+        response = get_session().get(url, headers=headers, timeout=30)
         response.raise_for_status()
 
         # Parse HTML with BeautifulSoup
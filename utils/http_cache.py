@@ -0,0 +1,177 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+from requests.structures import CaseInsensitiveDict
+
+CACHE_DIR = ".cache/http"
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def normalize_url(url):
+    """Canonical form of a URL used as the cache key"""
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and parts.port != _DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    path = parts.path or "/"
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((scheme, host, path, query, ""))
+
+
+class CachedResponse:
+    """Response served from the cache after a 304 Not Modified"""
+
+    from_cache = True
+
+    def __init__(self, url, status_code, headers, content, encoding):
+        self.url = url
+        self.status_code = status_code
+        self.headers = CaseInsensitiveDict(headers)
+        self.content = content
+        self.encoding = encoding
+
+    @property
+    def text(self):
+        return self.content.decode(self.encoding or "utf-8", errors="replace")
+
+    def raise_for_status(self):
+        pass
+
+
+class HttpCache:
+    """
+    On-disk response cache keyed by normalized URL.
+
+    Stores the body with its ETag / Last-Modified so later requests can be
+    revalidated with If-None-Match / If-Modified-Since; a 304 reuses the
+    stored body instead of downloading the page again.
+    """
+
+    def __init__(self, cache_dir=CACHE_DIR):
+        self.cache_dir = cache_dir
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def _paths(self, url):
+        key = hashlib.sha256(normalize_url(url).encode("utf-8")).hexdigest()
+        base = os.path.join(self.cache_dir, key[:2], key)
+        return base + ".json", base + ".body"
+
+    def load(self, url):
+        """Return (metadata, body) for a cached URL, or (None, None)"""
+        meta_path, body_path = self._paths(url)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            with open(body_path, "rb") as f:
+                return meta, f.read()
+        except (OSError, ValueError):
+            return None, None
+
+    @staticmethod
+    def storable(status_code, headers):
+        """True for a 200 response that carries a validator (ETag or Last-Modified)"""
+        return status_code == 200 and bool(headers.get("ETag") or headers.get("Last-Modified"))
+
+    @staticmethod
+    def validators(meta):
+        """If-None-Match / If-Modified-Since headers revalidating a cached entry"""
+        headers = {}
+        if meta:
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+        return headers
+
+    def count(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def store(self, url, response):
+        """Save a 200 response that carries a validator (ETag or Last-Modified)"""
+        if not self.storable(response.status_code, response.headers):
+            return
+        self.write(url, response.url, response.headers, response.content,
+                   response.encoding or response.apparent_encoding)
+
+    def write(self, url, final_url, headers, content, encoding):
+        """
+        Save a complete response body under url.
+
+        Args:
+            url: Requested URL (the cache key)
+            final_url: URL after redirects
+            headers: Response headers (ETag, Last-Modified, Content-Type are kept)
+            content: Whole body as bytes
+            encoding: Text encoding of the body, or None for UTF-8
+        """
+        meta_path, body_path = self._paths(url)
+        os.makedirs(os.path.dirname(meta_path), exist_ok=True)
+        meta = {
+            "url": url,
+            "final_url": final_url,
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+            "content_type": headers.get("Content-Type", ""),
+            "encoding": encoding,
+            "stored_at": time.time(),
+        }
+
+        # Write to temp files first so concurrent readers never see a partial
+        # entry; the name is per thread, as workers may store the same URL at once
+        for path, data, mode in ((body_path, content, "wb"),
+                                 (meta_path, json.dumps(meta), "w")):
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, mode) as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+
+    def get(self, session, url, **kwargs):
+        """
+        GET a URL through the cache.
+
+        Args:
+            session: requests.Session (or the requests module) used for the request
+            url: URL to fetch
+            **kwargs: Passed through to session.get
+
+        Returns:
+            requests.Response for fresh downloads, CachedResponse on a 304
+        """
+        meta, body = self.load(url)
+        headers = dict(kwargs.pop("headers", None) or {})
+        headers.update(self.validators(meta))
+
+        response = session.get(url, headers=headers, **kwargs)
+
+        if response.status_code == 304 and meta:
+            self.count(hit=True)
+            return CachedResponse(
+                url=meta.get("final_url") or url,
+                status_code=200,
+                headers={"Content-Type": meta.get("content_type", ""),
+                         "ETag": meta.get("etag") or "",
+                         "Last-Modified": meta.get("last_modified") or ""},
+                content=body,
+                encoding=meta.get("encoding"),
+            )
+
+        self.count(hit=False)
+        self.store(url, response)
+        return response
+
+
+# Shared by the crawler and the validator so a validate-then-crawl cycle
+# downloads each page only once
+default_cache = HttpCache()
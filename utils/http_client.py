@@ -0,0 +1,124 @@
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.retry import Retry
+
+POOL_CONNECTIONS = 100    # number of per-host pools kept alive
+POOL_MAXSIZE = 4          # connections per host
+RETRY_TOTAL = 3
+RETRY_BACKOFF = 1
+RETRY_STATUSES = [500, 502, 503, 504]
+
+
+class ConnectionStats:
+    """Counts requests against newly opened connections to measure keep-alive reuse"""
+
+    def __init__(self):
+        self.requests = 0
+        self.new_connections = 0
+        self._lock = threading.Lock()
+
+    def count_request(self):
+        with self._lock:
+            self.requests += 1
+
+    def count_connection(self):
+        with self._lock:
+            self.new_connections += 1
+
+    @property
+    def reused(self):
+        return max(0, self.requests - self.new_connections)
+
+    def as_dict(self):
+        rate = self.reused / self.requests * 100 if self.requests else 0.0
+        return {
+            "requests": self.requests,
+            "new_connections": self.new_connections,
+            "reused_connections": self.reused,
+            "reuse_rate": round(rate, 1),
+        }
+
+    def report(self):
+        stats = self.as_dict()
+        print(f"🔗 HTTP connections: {stats['requests']} requests over {stats['new_connections']} "
+              f"connections ({stats['reuse_rate']}% reused)")
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter whose connection pools report every new TCP/TLS connection"""
+
+    def __init__(self, stats, **kwargs):
+        self.stats = stats
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        stats = self.stats
+
+        class CountingHTTPConnectionPool(HTTPConnectionPool):
+            def _new_conn(self):
+                stats.count_connection()
+                return super()._new_conn()
+
+        class CountingHTTPSConnectionPool(HTTPSConnectionPool):
+            def _new_conn(self):
+                stats.count_connection()
+                return super()._new_conn()
+
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": CountingHTTPConnectionPool,
+            "https": CountingHTTPSConnectionPool,
+        }
+
+    def send(self, request, *args, **kwargs):
+        self.stats.count_request()
+        return super().send(request, *args, **kwargs)
+
+
+def create_session(stats=None, pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE):
+    """
+    Create a keep-alive requests session with per-host connection limits and retry/backoff
+
+    Args:
+        stats: ConnectionStats to record into (a new one is created if omitted)
+        pool_connections: Number of hosts whose connections are kept alive
+        pool_maxsize: Maximum concurrent connections to a single host; further
+            requests to that host wait for a free connection
+    """
+    session = requests.Session()
+    retry_strategy = Retry(
+        total=RETRY_TOTAL,
+        backoff_factor=RETRY_BACKOFF,
+        status_forcelist=RETRY_STATUSES,
+    )
+    adapter = PooledHTTPAdapter(
+        stats or ConnectionStats(),
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        pool_block=True,
+        max_retries=retry_strategy,
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.stats = adapter.stats
+    return session
+
+
+_shared_session = None
+_shared_lock = threading.Lock()
+
+
+def get_session():
+    """Process-wide session shared by the scraper, the validator and the Ollama client"""
+    global _shared_session
+    with _shared_lock:
+        if _shared_session is None:
+            _shared_session = create_session()
+        return _shared_session
+
+
+def connection_stats():
+    return get_session().stats
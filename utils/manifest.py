@@ -0,0 +1,137 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+
+from utils.schema import Event
+
+MANIFEST_PATH = "output/manifest.json"
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def fingerprint_text(text):
+    """Content fingerprint of cleaned page text (insensitive to whitespace changes)"""
+    normalized = _WHITESPACE.sub(" ", text).strip()
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+def event_id(event, source=None):
+    """Stable ID for an extracted event, derived from its source and identifying fields"""
+    parts = [source or event.get("source", "")]
+    for field in ("name", "start_datetime", "venue_name"):
+        parts.append(str(event.get(field) or "").strip().lower())
+    return hashlib.sha1("|".join(parts).encode("utf-8")).hexdigest()[:16]
+
+
+class SourceManifest:
+    """
+    Per-source record of the last crawl: fetch time, content fingerprint and
+    the IDs of the events extracted from it.
+    """
+
+    def __init__(self, path=MANIFEST_PATH):
+        self.path = path
+        self.sources = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path=MANIFEST_PATH):
+        manifest = cls(path)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                manifest.sources = json.load(f)
+        except FileNotFoundError:
+            pass
+        except json.JSONDecodeError:
+            print(f"⚠️ Ignoring unreadable manifest: {path}")
+        return manifest
+
+    def get(self, url):
+        return self.sources.get(url)
+
+    def update(self, url, fingerprint, event_ids):
+        with self._lock:
+            self.sources[url] = {
+                "last_fetched": time.time(),
+                "fingerprint": fingerprint,
+                "event_ids": list(event_ids),
+            }
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with self._lock:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.sources, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+
+def load_events_by_source(path):
+    """Group a previous run's events.json by source URL, as utils.schema.Event objects"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            events = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+    by_source = {}
+    for event in events:
+        # Deduplicated exports keep one copy; give each merged source its own back
+        duplicates = event.pop("merged_from", None) or []
+        for data in [event] + [{**event, **duplicate} for duplicate in duplicates]:
+            previous = Event.from_dict(data)
+            if previous is not None:
+                by_source.setdefault(previous.source, []).append(previous)
+    return by_source
+
+
+class IncrementalCrawl:
+    """
+    Skips sources whose cleaned page text has not changed since the last run
+    and carries their previous events forward instead of re-extracting them.
+    """
+
+    def __init__(self, manifest, previous_events):
+        """
+        Args:
+            manifest: SourceManifest from the previous run
+            previous_events: Dict of source URL -> events from the previous run
+        """
+        self.manifest = manifest
+        self.previous_events = previous_events
+        self.carried = 0
+        self.changed = 0
+        self._fingerprints = {}
+        self._lock = threading.Lock()
+
+    def shortcut(self, url, text, images):
+        """Return the previous events for an unchanged source, or None to extract it"""
+        fingerprint = fingerprint_text(text)
+        with self._lock:
+            self._fingerprints[url] = fingerprint
+
+        entry = self.manifest.get(url)
+        if entry and entry.get("fingerprint") == fingerprint:
+            previous = self.previous_events.get(url, [])
+            known_ids = {e.get("event_id") for e in previous}
+            if all(eid in known_ids for eid in entry.get("event_ids", [])):
+                with self._lock:
+                    self.carried += 1
+                return [e.copy() for e in previous]
+
+        with self._lock:
+            self.changed += 1
+        return None
+
+    def record(self, url, events):
+        with self._lock:
+            fingerprint = self._fingerprints.pop(url, None)
+        if fingerprint is not None:
+            self.manifest.update(url, fingerprint, [e.event_id for e in events])
+
+    def report(self):
+        print(f"♻️ Incremental crawl: {self.carried} unchanged sources carried forward, "
+              f"{self.changed} re-extracted")
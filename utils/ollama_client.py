@@ -0,0 +1,227 @@
+import json
+import re
+
+from utils.http_client import get_session
+
+OLLAMA_URL = "http://localhost:11434/api/generate"
+
+# Outside any bracket only an opening bracket matters (quotes there are prose);
+# inside, everything up to the next bracket is skipped in one match, strings
+# whole. An unterminated string runs to the end of the text, so every
+# character is read once.
+_OPEN = re.compile(r"[\[{]")
+_SKIP = re.compile(r'(?:[^"\[\]{}]+|"[^"\\]*(?:\\.[^"\\]*)*")*')
+_decoder = json.JSONDecoder()
+
+
+def _is_member_value(text, position):
+    """True if the brace at position follows a ':' (an object's value, not an element)"""
+    position -= 1
+    while position >= 0 and text[position].isspace():
+        position -= 1
+    return position >= 0 and text[position] == ":"
+
+
+def _decode_object(text):
+    try:
+        obj = json.loads(text)
+    except ValueError:
+        return None
+    return obj if isinstance(obj, dict) else None
+
+
+def _decode_objects(text, spans):
+    """The objects among the (start, end) slices of text that decode"""
+    return [obj for obj in (_decode_object(text[start:end]) for start, end in spans) if obj is not None]
+
+
+def find_json_objects(text):
+    """
+    Every complete top-level JSON object in free-form model output.
+
+    A single pass over the brackets outside strings keeps a stack of open
+    brackets, and each balanced object that is not nested in another one
+    (the elements of an array, however it is wrapped in prose, or bare
+    objects) is decoded from its own slice, so no region is scanned or
+    decoded more than a bounded number of times. An element that does not
+    decode is dropped and the objects around it are kept. Objects inside a
+    brace that is never closed are kept when that brace is prose, such as
+    the "{" in "Use { carefully", and dropped when it is an array element
+    cut off by a truncated response.
+
+    Returns:
+        list: decoded objects (dicts) in order
+    """
+    objects = []
+    # Open brackets as (bracket, start of a candidate object or None, opened
+    # inside an array); `inner` holds, per open object, the (start, end) of
+    # the candidates closed inside it
+    stack = []
+    inner = []
+    arrays = 0
+    # Well-formed elements are decoded straight from the text; the first one
+    # that fails (its error counts the lines of everything before it) hands
+    # the rest of the answer to the bracket pass
+    fast = True
+    position = 0
+    while True:
+        if stack:
+            position = _SKIP.match(text, position).end()
+            if position == len(text) or text[position] == '"':
+                break
+        else:
+            match = _OPEN.search(text, position)
+            if match is None:
+                break
+            position = match.start()
+        token = text[position]
+        at = position
+        position += 1
+        if token == "[":
+            stack.append(("[", None, False))
+            arrays += 1
+        elif token == "{":
+            start = None if _is_member_value(text, at) else at
+            if fast and start is not None and not inner:
+                try:
+                    obj, position = _decoder.raw_decode(text, start)
+                except json.JSONDecodeError:
+                    fast = False
+                else:
+                    objects.append(obj)
+                    continue
+            stack.append(("{", start, arrays > 0))
+            inner.append([])
+        elif token in "]}":
+            bracket, start, in_array = stack.pop()
+            if bracket == "[":
+                arrays -= 1
+                continue
+            candidates = inner.pop()
+            if inner:
+                # Nested in another object: decoded with it, or later if
+                # that object turns out to be prose
+                if start is not None:
+                    inner[-1].append((start, position))
+                continue
+            obj = _decode_object(text[start:position]) if start is not None else None
+            if obj is not None:
+                objects.append(obj)
+            elif not in_array:
+                # A balanced pair of braces in prose, e.g. "Note {this} first"
+                objects.extend(_decode_objects(text, candidates))
+    # Braces never closed: prose outside any array, truncated elements inside one
+    opened = iter(inner)
+    for bracket, _, in_array in stack:
+        if bracket == "{":
+            candidates = next(opened)
+            if not in_array:
+                objects.extend(_decode_objects(text, candidates))
+    return objects
+
+
+class JsonArrayStreamParser:
+    """
+    Incremental parser for a JSON array of objects arriving token by token.
+
+    Each `{...}` element is decoded as soon as its closing brace arrives, and
+    `closed` flips once the array's closing `]` is seen, so the caller can
+    stop generation instead of waiting for whatever the model says next.
+    Text before the array (e.g. "Sure! Here are the events:") is ignored.
+    """
+
+    def __init__(self):
+        self.started = False
+        self.closed = False
+        self.events = []
+        self._buf = []
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+
+    def feed(self, chunk):
+        """Consume a chunk of model output; return the objects completed by it"""
+        completed = []
+        for ch in chunk:
+            if self.closed:
+                break
+
+            if self._depth:
+                # Inside an element: track strings so braces in text don't count
+                self._buf.append(ch)
+                if self._in_string:
+                    if self._escape:
+                        self._escape = False
+                    elif ch == "\\":
+                        self._escape = True
+                    elif ch == '"':
+                        self._in_string = False
+                elif ch == '"':
+                    self._in_string = True
+                elif ch in "{[":
+                    self._depth += 1
+                elif ch in "}]":
+                    self._depth -= 1
+                    if self._depth == 0:
+                        self._finish_element(completed)
+            elif not self.started:
+                if ch == "[":
+                    self.started = True
+            elif ch == "{":
+                self._depth = 1
+                self._buf = [ch]
+            elif ch == "]":
+                self.closed = True
+            elif not (ch.isspace() or ch == ","):
+                # "[" was prose like "[note]", not the start of the array
+                self.started = False
+        return completed
+
+    def _finish_element(self, completed):
+        try:
+            obj = json.loads("".join(self._buf))
+        except json.JSONDecodeError:
+            obj = None
+        self._buf = []
+        if isinstance(obj, dict):
+            self.events.append(obj)
+            completed.append(obj)
+
+
+def stream_generate_events(prompt, model, url=OLLAMA_URL, timeout=60, options=None):
+    """
+    Call Ollama's /api/generate in streaming mode and parse events as they close.
+
+    The response is closed as soon as the JSON array ends, which makes Ollama
+    stop generating instead of spending tokens on trailing commentary.
+
+    Returns:
+        tuple: (events or None if no JSON array was seen, raw output text,
+        truncated). truncated is True when the answer stopped before it was
+        complete: the array never closed, the model hit its token limit
+        (done_reason "length") or the stream ended without "done". The
+        events are then only those completed before the cut.
+    """
+    payload = {"model": model, "prompt": prompt, "stream": True}
+    if options:
+        payload["options"] = options
+
+    parser = JsonArrayStreamParser()
+    output = []
+    done, done_reason = False, None
+    with get_session().post(url, json=payload, stream=True, timeout=timeout) as response:
+        response.raise_for_status()
+        for line in response.iter_lines():
+            if not line:
+                continue
+            chunk = json.loads(line)
+            token = chunk.get("response", "")
+            output.append(token)
+            parser.feed(token)
+            if chunk.get("done"):
+                done, done_reason = True, chunk.get("done_reason")
+            if parser.closed or done:
+                break
+
+    truncated = not parser.closed and (parser.started or not done or done_reason == "length")
+    return (parser.events if parser.started else None), "".join(output), truncated
@@ -0,0 +1,231 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.politeness import HostQueue
+
+_DONE = object()
+# Seconds the feed waits for in-flight fetches to discover more frontier URLs
+FRONTIER_POLL = 0.05
+
+
+class PartCollector:
+    """
+    Gathers the events of a page that was split into several extraction parts
+    and reports the page once every part is done. A page with a failed part
+    is reported with None instead of its events, so it is not mistaken for
+    a page without events.
+    """
+
+    def __init__(self, on_result):
+        self.on_result = on_result
+        self._remaining = {}
+        self._events = {}
+
+    def expect(self, url, parts):
+        if parts == 0:
+            self.on_result(url, [])
+            return
+        self._remaining[url] = parts
+        self._events[url] = []
+
+    def add(self, key, events):
+        """key is the (url, part_index) the part was queued under; events is None if it failed"""
+        url = key[0]
+        if events is None:
+            self._events[url] = None
+        elif self._events[url] is not None:
+            self._events[url].extend(events)
+        self._remaining[url] -= 1
+        if self._remaining[url] == 0:
+            del self._remaining[url]
+            self.on_result(url, self._events.pop(url))
+
+
+async def run_pipeline(urls, fetch, summarize, extract, on_result,
+                       fetch_concurrency=8, summarize_concurrency=2,
+                       llm_concurrency=1, queue_size=32, scheduler=None,
+                       shortcut=None, extract_batch=None, batch_size=1, batch_wait=0.5,
+                       summarize_executor=None, segment=None, frontier=None):
+    """
+    Run fetch -> summarize -> extract as separate stages joined by bounded queues.
+
+    Each stage callable is blocking (requests / sumy / Ollama) and runs on a
+    thread pool, so page downloads overlap with summarization and inference.
+
+    Args:
+        urls: Iterable of source URLs
+        fetch: fetch(url) -> Page (with .text and .images) or None
+        summarize: summarize(text) -> summary
+        extract: extract(summary, image_urls) -> list of events, or None if extraction failed
+        on_result: on_result(url, events), called on the event loop as each source finishes;
+            events is None when the page's extraction failed
+        fetch_concurrency: Number of pages downloaded at once
+        summarize_concurrency: Number of pages summarized at once
+        llm_concurrency: Number of in-flight LLM requests
+        queue_size: Capacity of each inter-stage queue
+        scheduler: Optional HostScheduler; URLs are then released to the fetch
+            stage as soon as their own host is ready, instead of in input order,
+            and each fetch takes its host's token right before the request
+        shortcut: Optional shortcut(url, page) -> events or None; returning
+            events finishes the page without summarizing or extracting it
+        extract_batch: Optional extract_batch([(key, summary, image_urls), ...]) -> {key: events},
+            used instead of extract when batch_size > 1
+        batch_size: Maximum number of pages sent to extract_batch at once
+        batch_wait: Seconds to wait for a batch to fill before sending it partially full
+        summarize_executor: Optional executor for the summarize stage (e.g. a
+            process pool, since summarization is CPU-bound); summarize must then
+            be picklable
+        segment: Optional segment(page) -> [(text, image_urls), ...] used
+            instead of summarize; each part is extracted separately and the
+            page is reported once all of its parts are done
+        frontier: Optional utils.frontier.Frontier used instead of urls; links
+            found on each fetched page are added to it as the crawl runs
+    """
+    loop = asyncio.get_running_loop()
+    url_q = asyncio.Queue(maxsize=queue_size)
+    fetched_q = asyncio.Queue(maxsize=queue_size)
+    summary_q = asyncio.Queue(maxsize=queue_size)
+
+    executor = ThreadPoolExecutor(
+        max_workers=fetch_concurrency + summarize_concurrency + llm_concurrency
+    )
+    collector = PartCollector(on_result)
+    fetching = 0
+    limiter = frontier.scheduler if frontier is not None else scheduler
+
+    async def feed():
+        nonlocal fetching
+        if scheduler is None and frontier is None:
+            for url in urls:
+                await url_q.put(url)
+        else:
+            pending = frontier if frontier is not None else HostQueue(scheduler, urls)
+            # A frontier grows as pages are fetched, so it is only exhausted
+            # once no fetch is still in flight
+            while len(pending) or (frontier is not None and fetching):
+                # Only orders the URLs; the host token is taken by the fetch
+                # worker, so URLs waiting in url_q cannot fire back to back
+                url, wait = pending.next_ready(acquire=False)
+                if url is None:
+                    await asyncio.sleep(wait or FRONTIER_POLL)
+                    continue
+                fetching += 1
+                await url_q.put(url)
+        for _ in range(fetch_concurrency):
+            await url_q.put(_DONE)
+
+    async def throttle(url):
+        while True:
+            wait = limiter.try_acquire(url)
+            if wait == 0:
+                return
+            await asyncio.sleep(wait)
+
+    async def fetch_worker():
+        nonlocal fetching
+        while True:
+            url = await url_q.get()
+            if url is _DONE:
+                return
+            try:
+                if limiter is not None:
+                    await throttle(url)
+                page = await loop.run_in_executor(executor, fetch, url)
+                if frontier is not None and page is not None:
+                    # Links are parsed on a worker thread but queued here,
+                    # on the event loop that also reads the frontier
+                    for link in await loop.run_in_executor(executor, frontier.links_from, url, page):
+                        frontier.add(*link)
+                if page is None or not page.text:
+                    continue
+                events = None
+                if shortcut is not None:
+                    events = await loop.run_in_executor(executor, shortcut, url, page)
+            except Exception as e:
+                print(f"❌ Fetch stage failed for {url}: {e}")
+                continue
+            finally:
+                fetching -= 1
+            if events is not None:
+                on_result(url, events)
+                continue
+            await fetched_q.put((url, page))
+
+    async def summarize_worker():
+        while True:
+            item = await fetched_q.get()
+            if item is _DONE:
+                return
+            url, page = item
+            try:
+                if segment is not None:
+                    parts = await loop.run_in_executor(summarize_executor or executor, segment, page)
+                else:
+                    summary = await loop.run_in_executor(summarize_executor or executor, summarize, page.text)
+                    parts = [(summary, page.images)]
+            except Exception as e:
+                print(f"❌ Summarize stage failed for {url}: {e}")
+                continue
+            collector.expect(url, len(parts))
+            for index, (summary, images) in enumerate(parts):
+                await summary_q.put(((url, index), summary, images))
+
+    async def extract_batch_worker():
+        while True:
+            item = await summary_q.get()
+            if item is _DONE:
+                return
+            batch = [item]
+            finished = False
+            while len(batch) < batch_size:
+                try:
+                    item = await asyncio.wait_for(summary_q.get(), timeout=batch_wait)
+                except asyncio.TimeoutError:
+                    break
+                if item is _DONE:
+                    finished = True
+                    break
+                batch.append(item)
+            try:
+                results = await loop.run_in_executor(executor, extract_batch, batch)
+            except Exception as e:
+                print(f"❌ Extract stage failed for a batch of {len(batch)} pages: {e}")
+                results = {}
+            for key, _, _ in batch:
+                collector.add(key, results.get(key))
+            if finished:
+                return
+
+    async def extract_worker():
+        if extract_batch is not None and batch_size > 1:
+            return await extract_batch_worker()
+        while True:
+            item = await summary_q.get()
+            if item is _DONE:
+                return
+            key, summary, images = item
+            try:
+                events = await loop.run_in_executor(executor, extract, summary, images)
+            except Exception as e:
+                print(f"❌ Extract stage failed for {key[0]}: {e}")
+                events = None
+            collector.add(key, events)
+
+    async def stage(workers, next_q, next_count):
+        # Once every worker of a stage has drained, tell the next stage to stop
+        await asyncio.gather(*workers)
+        if next_q is not None:
+            for _ in range(next_count):
+                await next_q.put(_DONE)
+
+    try:
+        await asyncio.gather(
+            feed(),
+            stage([fetch_worker() for _ in range(fetch_concurrency)],
+                  fetched_q, summarize_concurrency),
+            stage([summarize_worker() for _ in range(summarize_concurrency)],
+                  summary_q, llm_concurrency),
+            stage([extract_worker() for _ in range(llm_concurrency)], None, 0),
+        )
+    finally:
+        executor.shutdown(wait=False)
@@ -0,0 +1,209 @@
+import heapq
+import itertools
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+DEFAULT_BACKOFF = 30      # seconds to pause a host after a 429 without Retry-After
+MAX_BACKOFF = 600         # cap for repeated 429s and Retry-After values
+
+
+def host_key(url):
+    """Return the scheduling key (netloc) for a URL"""
+    return urlparse(url).netloc.lower()
+
+
+def parse_retry_after(value):
+    """Parse a Retry-After header (delta-seconds or HTTP date) into seconds"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class _Bucket:
+    __slots__ = ("tokens", "updated", "blocked_until", "strikes")
+
+    def __init__(self, capacity, now):
+        self.tokens = capacity
+        self.updated = now
+        self.blocked_until = 0.0
+        self.strikes = 0
+
+
+class HostScheduler:
+    """
+    Token bucket per host, shared by every worker of a crawl or validation run.
+
+    Hosts are throttled independently, so one slow or rate-limited domain no
+    longer delays requests to every other domain.
+    """
+
+    def __init__(self, rate=0.5, burst=1):
+        """
+        Args:
+            rate: Requests per second allowed for each host
+            burst: Number of requests a host may receive back to back
+        """
+        self.rate = rate
+        self.burst = burst
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, host, now):
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = self._buckets[host] = _Bucket(self.burst, now)
+        return bucket
+
+    def _refill(self, bucket, now):
+        bucket.tokens = min(self.burst, bucket.tokens + (now - bucket.updated) * self.rate)
+        bucket.updated = now
+
+    def _wait(self, bucket, now):
+        if now < bucket.blocked_until:
+            return bucket.blocked_until - now
+        if bucket.tokens >= 1:
+            return 0.0
+        return (1 - bucket.tokens) / self.rate
+
+    def delay_for(self, url):
+        """Seconds until a request to this URL's host is allowed"""
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._bucket(host_key(url), now)
+            self._refill(bucket, now)
+            return self._wait(bucket, now)
+
+    def try_acquire(self, url):
+        """Take a token for the URL's host; return 0 on success or the seconds to wait"""
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._bucket(host_key(url), now)
+            self._refill(bucket, now)
+            wait = self._wait(bucket, now)
+            if wait == 0:
+                bucket.tokens -= 1
+            return wait
+
+    def acquire(self, url):
+        """Block until a request to the URL's host is allowed"""
+        while True:
+            wait = self.try_acquire(url)
+            if wait == 0:
+                return
+            time.sleep(wait)
+
+    def record_response(self, url, status_code, headers=None):
+        """
+        Feed a response back into the scheduler.
+
+        429 and 503 responses pause the host for Retry-After seconds, or for an
+        exponentially growing backoff when the server does not say how long.
+        """
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._bucket(host_key(url), now)
+            if status_code in (429, 503):
+                retry_after = parse_retry_after((headers or {}).get("Retry-After"))
+                if retry_after is None and status_code == 503:
+                    return
+                bucket.strikes += 1
+                if retry_after is None:
+                    retry_after = DEFAULT_BACKOFF * 2 ** (bucket.strikes - 1)
+                bucket.blocked_until = max(bucket.blocked_until, now + min(retry_after, MAX_BACKOFF))
+                bucket.tokens = 0
+            elif status_code and status_code < 400:
+                bucket.strikes = 0
+
+
+class HostQueue:
+    """
+    Pending work grouped by host, handed out in whichever order hosts become ready.
+
+    Workers never sleep on a throttled host while another host has capacity;
+    the caller only waits when every host with queued work is throttled.
+    Within a host, items come out by priority (lowest first), then in the
+    order they were added.
+    """
+
+    def __init__(self, scheduler, items=(), key=None):
+        """
+        Args:
+            scheduler: HostScheduler that owns the per-host token buckets
+            items: Initial work items
+            key: Function mapping an item to its URL (defaults to the item itself)
+        """
+        self.scheduler = scheduler
+        self.key = key or (lambda item: item)
+        self._pending = {}
+        self._heap = []
+        self._counter = itertools.count()
+        self._size = 0
+        for item in items:
+            self.put(item)
+
+    def __len__(self):
+        return self._size
+
+    def put(self, item, priority=0):
+        url = self.key(item)
+        host = host_key(url)
+        queue = self._pending.get(host)
+        if queue is None:
+            queue = self._pending[host] = []
+            heapq.heappush(self._heap, (0.0, next(self._counter), host))
+        heapq.heappush(queue, (priority, next(self._counter), item))
+        self._size += 1
+
+    def next_ready(self, acquire=True):
+        """
+        Return (item, 0) for the next item whose host has a free token,
+        or (None, seconds) when every queued host is still throttled.
+
+        With acquire=False the token is only checked, not taken, for callers
+        that queue items and take the token right before the request; items
+        of one host are then still handed out one request interval apart.
+        """
+        while self._heap:
+            ready_at, _, host = self._heap[0]
+            now = time.monotonic()
+            if ready_at > now:
+                return None, ready_at - now
+
+            heapq.heappop(self._heap)
+            queue = self._pending[host]
+            url = self.key(queue[0][2])
+            wait = self.scheduler.try_acquire(url) if acquire else self.scheduler.delay_for(url)
+            if wait > 0:
+                # Host was throttled (or paused by a 429) since it was queued
+                heapq.heappush(self._heap, (now + wait, next(self._counter), host))
+                continue
+
+            item = heapq.heappop(queue)[2]
+            self._size -= 1
+            if queue:
+                ready_in = self.scheduler.delay_for(self.key(queue[0][2]))
+                if not acquire:
+                    ready_in = max(ready_in, 1 / self.scheduler.rate)
+                heapq.heappush(self._heap, (now + ready_in, next(self._counter), host))
+            else:
+                del self._pending[host]
+            return item, 0.0
+
+        return None, 0.0
+
+    def __iter__(self):
+        """Yield items in ready order, sleeping only when no host is ready"""
+        while self._size:
+            item, wait = self.next_ready()
+            if item is None:
+                time.sleep(wait)
+                continue
+            yield item
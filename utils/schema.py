@@ -1,19 +1,248 @@
+import json
+import re
+import sys
+from datetime import date, datetime
+from json.encoder import encode_basestring
+
+_DATETIME_FORMATS = (
+    "%Y-%m-%dT%H:%M:%S", "%Y-%m-%dT%H:%M", "%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M",
+    "%B %d, %Y %I:%M %p",
+)
+_DATE_FORMATS = ("%Y-%m-%d", "%B %d, %Y", "%b %d, %Y", "%m/%d/%Y")
+_ISO_DATE_ONLY = re.compile(r"\d{4}-\d{2}-\d{2}$")
+
+
+def parse_when(value):
+    """
+    When an event happens, from an extracted date string: a naive datetime
+    (local wall-clock time at the venue), a date when the text gives no
+    time of day, or None if it cannot be read.
+    """
+    if isinstance(value, datetime):
+        return value.replace(tzinfo=None)
+    if isinstance(value, date):
+        return value
+    value = str(value or "").strip()
+    if not value:
+        return None
+    if _ISO_DATE_ONLY.match(value):
+        try:
+            return date.fromisoformat(value)
+        except ValueError:
+            return None
+    try:
+        # Offsets are dropped: events are compared in their own local time
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).replace(tzinfo=None)
+    except ValueError:
+        pass
+    for fmt in _DATETIME_FORMATS:
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+    for fmt in _DATE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
+def parse_timestamp(value):
+    """
+    Naive datetime from an extracted date string, or None if it cannot be
+    read or gives no time of day.
+    """
+    parsed = parse_when(value)
+    return parsed if isinstance(parsed, datetime) else None
+
+
+def _text(value):
+    if value is None:
+        return ""
+    if isinstance(value, (list, tuple)):
+        return ", ".join(_text(item) for item in value if item)
+    if isinstance(value, dict):
+        return _text(value.get("name") or value.get("text") or "")
+    return str(value).strip()
+
+
+def _interned(value):
+    # Venues, hosts and sources repeat across thousands of events
+    value = _text(value)
+    return sys.intern(value) if value else ""
+
+
+def _urls(value):
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = [value]
+    urls = []
+    for item in value:
+        if isinstance(item, str):
+            item = item.strip()
+            if item and item not in urls:
+                urls.append(item)
+    return urls
+
+
+def _when(value):
+    # Keep what the page said when it is not a date we can read ("Every Saturday")
+    parsed = parse_when(value)
+    return parsed if parsed is not None else _text(value)
+
+
+def _iso(value):
+    # Dates stay "YYYY-MM-DD": no midnight is made up for events without a time
+    return value.isoformat() if isinstance(value, date) else value
+
+
+# Event.to_json fills this straight from the slots. Keys, order and
+# separators are json.dumps's, so the output is byte for byte
+# json.dumps(event.to_dict(), ensure_ascii=False)
+_JSON_TEMPLATE = (
+    '{"name": %s, "venue_name": %s, "venue_address": %s, "start_datetime": %s, "end_datetime": %s, '
+    '"short_description": %s, "price": %s, "host": %s, "source_websites": %s, "hero_images": %s, '
+    '"source": %s, "event_id": %s, "city": %s, "state": %s}'
+)
+
+
+def _json(value):
+    if type(value) is str:
+        return encode_basestring(value)
+    if value is None:
+        return "null"
+    return json.dumps(value, ensure_ascii=False)
+
+
+def _json_list(values):
+    return "[" + ", ".join(map(_json, values)) + "]" if values else "[]"
 
-from dataclasses import dataclass, asdict
-from typing import List
 
-@dataclass
 class Event:
-    name: str
-    venue_name: str
-    venue_address: str
-    start_datetime: str
-    end_datetime: str
-    short_description: str
-    price: str
-    host: str
-    source_websites: List[str]
-    hero_images: List[str]
+    """
+    An extracted event.
+
+    Slotted and with interned venue/host/source/location strings, so large
+    crawls hold many events cheaply. start_datetime / end_datetime are
+    datetimes when the extracted text could be parsed, dates when it gave
+    no time of day, otherwise the text itself ("" when missing).
+    """
+
+    __slots__ = (
+        "name", "venue_name", "venue_address", "start_datetime", "end_datetime",
+        "short_description", "price", "host", "source_websites", "hero_images",
+        "source", "event_id", "city", "state",
+    )
+
+    def __init__(self, name, venue_name="", venue_address="", start_datetime="", end_datetime="",
+                 short_description="", price="", host="", source_websites=None, hero_images=None,
+                 source="", event_id="", city=None, state=None):
+        self.name = name
+        self.venue_name = venue_name
+        self.venue_address = venue_address
+        self.start_datetime = start_datetime
+        self.end_datetime = end_datetime
+        self.short_description = short_description
+        self.price = price
+        self.host = host
+        self.source_websites = source_websites if source_websites is not None else []
+        self.hero_images = hero_images if hero_images is not None else []
+        self.source = source
+        self.event_id = event_id
+        self.city = city
+        self.state = state
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Validate and coerce one event object (LLM output or a stored event).
+
+        Returns:
+            Event, or None if data is not an object with a name
+        """
+        if not isinstance(data, dict):
+            return None
+        name = _text(data.get("name"))
+        if not name:
+            return None
+        return cls(
+            name=name,
+            venue_name=_interned(data.get("venue_name")),
+            venue_address=_interned(data.get("venue_address")),
+            start_datetime=_when(data.get("start_datetime")),
+            end_datetime=_when(data.get("end_datetime")),
+            short_description=_text(data.get("short_description")),
+            price=_text(data.get("price")),
+            host=_interned(data.get("host")),
+            source_websites=_urls(data.get("source_websites")),
+            hero_images=_urls(data.get("hero_images")),
+            source=_interned(data.get("source")),
+            event_id=_text(data.get("event_id")),
+            city=_interned(data.get("city")) or None,
+            state=_interned(data.get("state")) or None,
+        )
+
+    def get(self, field, default=None):
+        """Mapping-style read, so code written for event dicts keeps working"""
+        value = getattr(self, field, default)
+        return _iso(value) if field in ("start_datetime", "end_datetime") else value
 
     def to_dict(self):
-        return asdict(self)
+        return {
+            "name": self.name,
+            "venue_name": self.venue_name,
+            "venue_address": self.venue_address,
+            "start_datetime": _iso(self.start_datetime),
+            "end_datetime": _iso(self.end_datetime),
+            "short_description": self.short_description,
+            "price": self.price,
+            "host": self.host,
+            "source_websites": list(self.source_websites),
+            "hero_images": list(self.hero_images),
+            "source": self.source,
+            "event_id": self.event_id,
+            "city": self.city,
+            "state": self.state,
+        }
+
+    def to_json(self):
+        """json.dumps(self.to_dict(), ensure_ascii=False), without building the dict"""
+        return _JSON_TEMPLATE % (
+            _json(self.name), _json(self.venue_name), _json(self.venue_address),
+            _json(_iso(self.start_datetime)), _json(_iso(self.end_datetime)),
+            _json(self.short_description), _json(self.price), _json(self.host),
+            _json_list(self.source_websites), _json_list(self.hero_images),
+            _json(self.source), _json(self.event_id), _json(self.city), _json(self.state),
+        )
+
+    def copy(self):
+        event = Event.__new__(Event)
+        for field in self.__slots__:
+            setattr(event, field, getattr(self, field))
+        event.source_websites = list(self.source_websites)
+        event.hero_images = list(self.hero_images)
+        return event
+
+    def __eq__(self, other):
+        if not isinstance(other, Event):
+            return NotImplemented
+        return all(getattr(self, f) == getattr(other, f) for f in self.__slots__)
+
+    def __repr__(self):
+        return f"Event(name={self.name!r}, start_datetime={_iso(self.start_datetime)!r}, venue_name={self.venue_name!r})"
+
+
+def events_from_llm(items):
+    """Events from a parsed LLM answer, dropping anything that is not a named event object"""
+    if isinstance(items, dict):
+        items = [items]
+    if not isinstance(items, list):
+        return []
+    events = []
+    for item in items:
+        event = Event.from_dict(item)
+        if event is not None:
+            events.append(event)
+    return events
@@ -0,0 +1,233 @@
+from collections import defaultdict
+from urllib.parse import urljoin
+
+from bs4 import BeautifulSoup
+
+from utils.html_parsers import _absolute_images
+from utils.text_reducer import DATE_FEATURE, FEATURES, estimate_tokens
+
+try:
+    import lxml.html
+except ImportError:  # optional fast path
+    lxml = None
+
+DATE_PATTERN = FEATURES[DATE_FEATURE][2]
+
+# A listing needs at least this many repeated, dated blocks to be segmented
+MIN_BLOCKS = 3
+# Share of a block group that must contain a date
+MIN_DATED_FRACTION = 0.6
+# Blocks shorter than this (on average) are fragments of a card, e.g. <time>
+MIN_BLOCK_CHARS = 40
+# Cards per LLM call; each extracted event costs ~120 response tokens, so this
+# keeps the JSON answer within the crawler's response reserve
+MAX_GROUP_BLOCKS = 15
+
+_SKIP_TAGS = {"html", "head", "body", "script", "style", "template", "noscript", "option", "select"}
+BLOCK_SEPARATOR = "\n---\n"
+
+
+def _signature(tag, classes):
+    # BEM modifiers ("event-card--featured") vary between cards of one listing,
+    # so only the first class counts
+    classes = (classes or "").split()
+    return tag, classes[0] if classes else ""
+
+
+def _lxml_candidates(html):
+    doc = lxml.html.document_fromstring(html)
+    groups = defaultdict(list)
+    for element in doc.iter():
+        if isinstance(element.tag, str) and element.tag not in _SKIP_TAGS:
+            groups[_signature(element.tag, element.get("class"))].append(element)
+
+    def text(element):
+        parts = (t.strip() for t in element.xpath(".//text()[not(ancestor::script or ancestor::style)]"))
+        return "\n".join(t for t in parts if t)
+
+    def images(element):
+        return [img.get("src") for img in element.iter("img")]
+
+    def links(element):
+        return [a.get("href") for a in element.iter("a")]
+
+    def ancestors(element):
+        return element.iterancestors()
+
+    return groups, text, images, links, ancestors, lambda element: element
+
+
+def _bs4_candidates(html):
+    soup = BeautifulSoup(html, "html.parser")
+    for tag in soup(["script", "style", "template"]):
+        tag.decompose()
+    groups = defaultdict(list)
+    for element in soup.find_all(True):
+        if element.name not in _SKIP_TAGS:
+            classes = " ".join(element.get("class") or [])
+            groups[_signature(element.name, classes)].append(element)
+
+    def text(element):
+        return element.get_text(separator="\n", strip=True)
+
+    def images(element):
+        return [img.get("src") for img in element.find_all("img")]
+
+    def links(element):
+        return [a.get("href") for a in element.find_all("a")]
+
+    def ancestors(element):
+        return (id(parent) for parent in element.parents)
+
+    return groups, text, images, links, ancestors, id
+
+
+def _event_block_group(html, base_url=None):
+    """(blocks, images, links) for the page's event cards, or None"""
+    try:
+        if lxml is not None:
+            groups, text, images, links, ancestors, key = _lxml_candidates(html)
+        else:
+            groups, text, images, links, ancestors, key = _bs4_candidates(html)
+    except Exception as e:
+        print(f"⚠️ Could not segment page {base_url}: {e}")
+        return None
+
+    candidates = []
+    for (_, css_class), members in groups.items():
+        if len(members) < MIN_BLOCKS:
+            continue
+        # A card nested inside another card of the same kind is already
+        # covered, and a wrapper holding every card is one block, not many
+        keys = {key(member) for member in members}
+        members = [member for member in members if not any(parent in keys for parent in ancestors(member))]
+        if len(members) < MIN_BLOCKS:
+            continue
+        texts = [text(member) for member in members]
+        dated = [member for member, t in zip(members, texts) if DATE_PATTERN.search(t)]
+        total_chars = sum(len(t) for t in texts)
+        if (len(dated) < MIN_BLOCKS or len(dated) < MIN_DATED_FRACTION * len(members)
+                or total_chars < MIN_BLOCK_CHARS * len(members)):
+            continue
+        # Classed elements first (plain <div> wrappers sit around every card),
+        # then most dated blocks; on a tie the outer element (more text) wins
+        rank = (bool(css_class), len(dated), total_chars)
+        candidates.append((rank, members, texts, dated))
+
+    # Elements holding several dated blocks of one group (a day's listings,
+    # the list itself) are containers of cards, not cards
+    containers = set()
+    for _, _, _, dated in candidates:
+        seen = set()
+        for member in dated:
+            for parent in ancestors(member):
+                if parent in seen:
+                    containers.add(parent)
+                seen.add(parent)
+
+    best = None
+    for rank, members, texts, _ in candidates:
+        held = sum(1 for member in members if key(member) in containers)
+        if held * 2 > len(members):
+            continue
+        if best is None or rank > best[0]:
+            best = (rank, members, texts)
+
+    if best is None:
+        return None
+
+    _, members, texts = best
+    blocks = [(member, block_text) for member, block_text in zip(members, texts) if block_text]
+    return blocks, images, links
+
+
+def find_event_blocks(html, base_url=None):
+    """
+    Split a listing page into its repeated event cards.
+
+    Elements are grouped by tag and first class; the group with the most
+    members containing a date (and enough text to be a whole card rather
+    than its <time> element) is taken as the list of events. Class-less
+    wrappers only win when no classed group qualifies, and groups whose
+    members hold several dated members of another group (day sections,
+    the list itself) are containers, not cards.
+
+    Args:
+        html: Page markup
+        base_url: URL the page was fetched from, used to resolve image URLs
+
+    Returns:
+        list: (text, image_urls) per block in page order, or [] if the page
+        does not look like a listing
+    """
+    found = _event_block_group(html, base_url)
+    if found is None:
+        return []
+    blocks, images, _ = found
+    return [(block_text, _absolute_images(images(member), base_url)) for member, block_text in blocks]
+
+
+def find_block_links(html, base_url):
+    """Absolute URLs linked from the page's event cards (usually their detail pages)"""
+    found = _event_block_group(html, base_url)
+    if found is None:
+        return []
+    blocks, _, links = found
+    urls = []
+    for member, _ in blocks:
+        for href in links(member):
+            href = (href or "").strip()
+            if href and not href.startswith(("#", "mailto:", "tel:", "javascript:")):
+                url = urljoin(base_url, href).split("#")[0]
+                if url not in urls:
+                    urls.append(url)
+    return urls
+
+
+def group_blocks(blocks, token_budget, max_blocks=MAX_GROUP_BLOCKS):
+    """Pack consecutive blocks into groups of at most token_budget tokens and max_blocks blocks"""
+    groups = []
+    texts, images, tokens = [], [], 0
+    for text, block_images in blocks:
+        if block_images:
+            # The prompt only lists a few page-level images, so keep each
+            # card's own images next to its text
+            text = f"{text}\nImages: {', '.join(block_images[:2])}"
+        cost = estimate_tokens(BLOCK_SEPARATOR + text)
+        if texts and (tokens + cost > token_budget or len(texts) >= max_blocks):
+            groups.append((BLOCK_SEPARATOR.join(texts), images))
+            texts, images, tokens = [], [], 0
+        texts.append(text)
+        images.extend(url for url in block_images if url not in images)
+        tokens += cost
+    if texts:
+        groups.append((BLOCK_SEPARATOR.join(texts), images))
+    return groups
+
+
+def split_page(page, reduce, token_budget):
+    """
+    Text sent to extraction for a page, as one or more independent parts.
+
+    Listing pages are split into groups of event cards that each fit the
+    token budget, so every card reaches the LLM. Other pages (and oversized
+    single cards) go through `reduce`.
+
+    Args:
+        page: utils.html_scraper.Page
+        reduce: reduce(text) -> shortened text
+        token_budget: Maximum estimated tokens of text per part
+
+    Returns:
+        list: (text, image_urls) parts
+    """
+    blocks = find_event_blocks(page.html, page.url) if page.html else []
+    if not blocks:
+        return [(reduce(page.text), page.images)]
+
+    parts = []
+    for text, images in group_blocks(blocks, token_budget):
+        if estimate_tokens(text) > token_budget:
+            text = reduce(text)
+        parts.append((text, images))
+    return parts
@@ -0,0 +1,241 @@
+import asyncio
+import re
+import secrets
+import threading
+import zlib
+from collections import deque, namedtuple
+from html import unescape
+from urllib.parse import urlsplit, urlunsplit
+
+from utils.politeness import host_key
+
+# Phrases that mark an error page when they head it (title or <h1>), or
+# make up most of a thin page's main content. A listing that merely
+# mentions "coming soon" further down is not an error page.
+SOFT_404_PHRASES = [
+    'not found', 'page not found', '404 not found', 'file not found', 'error 404', '404 error',
+    'page does not exist', "page doesn't exist", 'page cannot be found', 'page could not be found',
+    'no longer available', 'under construction', 'coming soon', 'temporarily unavailable',
+    'site maintenance', 'under maintenance', 'access denied', 'forbidden',
+]
+MAIN_CHARS = 3000          # main-region text kept for matching and comparison
+THIN_MAIN_CHARS = 600      # main regions shorter than this are checked for error phrases
+PROBE_SIMILARITY = 0.85    # shingle Jaccard above which a page "is" the host's not-found page
+SHINGLE_WORDS = 3
+
+_SCRIPT = re.compile(r"<(script|style|noscript|template)\b.*?(?:</\1\s*>|$)", re.IGNORECASE | re.DOTALL)
+_TITLE = re.compile(r"<title\b[^>]*>(.*?)(?:</title\s*>|$)", re.IGNORECASE | re.DOTALL)
+_H1 = re.compile(r"<h1\b[^>]*>(.*?)(?:</h1\s*>|$)", re.IGNORECASE | re.DOTALL)
+_MAIN = re.compile(r"<main\b[^>]*>(.*?)(?:</main\s*>|$)|<[a-z]+\b[^>]*role=[\"']main[\"'][^>]*>(.*)",
+                   re.IGNORECASE | re.DOTALL)
+_BODY = re.compile(r"<body\b[^>]*>(.*)", re.IGNORECASE | re.DOTALL)
+_TAG = re.compile(r"<[^>]*>?")
+_SPACE = re.compile(r"\s+")
+_WORD = re.compile(r"\w+")
+# Title parts: "Page Not Found | City of Miami", "Error 404 - Example" (but not
+# "Coming Soon: Summer Concerts", which is one heading)
+_SEGMENT = re.compile(r"\s[|\-\u2013\u2014\u00b7\u00bb:]+\s|[|\u00b7\u00bb]")
+
+# What a host answers for a path that cannot exist, when that is a 200 page:
+# where it ends up, its main-text shingles and the error phrases in its
+# title and headings
+Probe = namedtuple("Probe", ["final_url", "shingles", "phrases"])
+
+
+class AhoCorasick:
+    """
+    Multi-pattern substring matcher.
+
+    The patterns are compiled into one automaton, so a text is scanned once
+    however many phrases are looked for.
+    """
+
+    def __init__(self, patterns):
+        self.patterns = list(patterns)
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [()]
+        for index, pattern in enumerate(self.patterns):
+            state = 0
+            for ch in pattern:
+                following = self._goto[state].get(ch)
+                if following is None:
+                    following = self._goto[state][ch] = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(())
+                state = following
+            self._out[state] += (index,)
+
+        # Failure links breadth first: the longest proper suffix that is also a prefix
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, following in self._goto[state].items():
+                queue.append(following)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(ch, 0)
+                self._fail[following] = target if target != following else 0
+                self._out[following] += self._out[self._fail[following]]
+
+    def search(self, text):
+        """First pattern (by end position) found in text, or None"""
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                return self.patterns[out[state][0]]
+        return None
+
+    def spans(self, text):
+        """(start, end) of every pattern occurrence in text, overlapping ones included"""
+        goto, fail, out = self._goto, self._fail, self._out
+        found = []
+        state = 0
+        for position, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for index in out[state]:
+                found.append((position + 1 - len(self.patterns[index]), position + 1))
+        return found
+
+
+def _text(fragment):
+    return _SPACE.sub(" ", unescape(_TAG.sub(" ", fragment))).strip()
+
+
+def page_regions(html):
+    """(title, headings, main text) of a page, lowercased; works on a truncated page"""
+    html = _SCRIPT.sub(" ", html or "")
+    title = _TITLE.search(html)
+    headings = " | ".join(_text(h1) for h1 in _H1.findall(html))
+    main = _MAIN.search(html) or _BODY.search(html)
+    main_html = next((group for group in main.groups() if group is not None), "") if main else html
+    return (_text(title.group(1)).lower() if title else "", headings.lower(),
+            _text(main_html)[:MAIN_CHARS].lower())
+
+
+def shingles(text):
+    words = _WORD.findall(text)
+    return {zlib.crc32(" ".join(words[i:i + SHINGLE_WORDS]).encode("utf-8"))
+            for i in range(max(1, len(words) - SHINGLE_WORDS + 1))} if words else set()
+
+
+def _similarity(first, second):
+    if not first or not second:
+        return 0.0
+    return len(first & second) / len(first | second)
+
+
+class Soft404Detector:
+    """
+    Recognizes error pages served with a 200 status.
+
+    A page is a soft 404 when an error phrase makes up most of its title
+    or an <h1> (so "Forbidden Broadway" and "Coming Soon: Summer Concerts"
+    are real pages), when a phrase that only appears in them also heads
+    the host's page for a random path that cannot exist, when its (thin)
+    main content is one, or when it matches that random-path page. The
+    probe is fetched once per host and cached; hosts that answer it with a
+    real 404 need no comparison at all.
+    """
+
+    def __init__(self, phrases=SOFT_404_PHRASES, similarity=PROBE_SIMILARITY):
+        self.matcher = AhoCorasick(phrases)
+        self.similarity = similarity
+        self._probes = {}
+        self._tasks = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def probe_url(url):
+        """A same-host URL that should not exist"""
+        parts = urlsplit(url)
+        return urlunsplit((parts.scheme, parts.netloc, f"/{secrets.token_hex(12)}", "", ""))
+
+    def make_probe(self, status_code, final_url, html):
+        """Probe from the answer to probe_url(), or None if the host said 404 (or anything not 200)"""
+        if status_code not in (200, 206):
+            return None
+        title, headings, main = page_regions(html)
+        phrases = {phrase for phrase in (self.matcher.search(title), self.matcher.search(headings)) if phrase}
+        return Probe(final_url, shingles(main), phrases)
+
+    def dominant_phrase(self, text):
+        """
+        An error phrase that makes up most of a title part or heading in text, or None.
+
+        Status codes do not count as words, so "403 Forbidden" is all phrase
+        while "Forbidden Broadway" is only half.
+        """
+        for segment in _SEGMENT.split(text):
+            spans = self.matcher.spans(segment)
+            if not spans:
+                continue
+            words = [(m.start(), m.end()) for m in _WORD.finditer(segment) if not m.group().isdigit()]
+            covered = sum(1 for start, end in words
+                          if any(first <= start and end <= last for first, last in spans))
+            if covered * 2 > len(words):
+                return self.matcher.search(segment)
+        return None
+
+    def probe(self, url, fetch):
+        """
+        The host's cached probe, fetching it on first use (thread-safe).
+
+        Args:
+            url: Any URL on the host
+            fetch: fetch(probe_url) -> (status_code, final_url, html)
+        """
+        host = host_key(url)
+        with self._lock:
+            entry = self._probes.get(host)
+            if entry is None:
+                entry = self._probes[host] = [threading.Lock(), False, None]
+        with entry[0]:
+            if not entry[1]:
+                try:
+                    entry[2] = self.make_probe(*fetch(self.probe_url(url)))
+                except Exception:
+                    entry[2] = None
+                entry[1] = True
+        return entry[2]
+
+    async def probe_async(self, url, fetch):
+        """As probe(), with fetch a coroutine function; concurrent callers share one request"""
+        host = host_key(url)
+        task = self._tasks.get(host)
+        if task is None:
+            async def run():
+                try:
+                    return self.make_probe(*await fetch(self.probe_url(url)))
+                except Exception:
+                    return None
+            task = self._tasks[host] = asyncio.ensure_future(run())
+        return await task
+
+    def reason(self, html, url=None, final_url=None, probe=None):
+        """Why the page is a soft 404, or None if it looks like a real page"""
+        title, headings, main = page_regions(html)
+        phrase = self.dominant_phrase(title) or self.dominant_phrase(headings)
+        if phrase:
+            return f"Error phrase in page title/heading: '{phrase}'"
+        mentioned = {phrase for phrase in (self.matcher.search(title), self.matcher.search(headings)) if phrase}
+        if probe is not None and mentioned & probe.phrases:
+            return f"Title/heading shares the host's error phrase: '{min(mentioned & probe.phrases)}'"
+        if len(main) < THIN_MAIN_CHARS:
+            phrase = self.matcher.search(main)
+            if phrase:
+                return f"Thin page with error phrase: '{phrase}'"
+        if probe is not None:
+            if final_url and final_url != url and final_url == probe.final_url:
+                return "Redirects to where nonexistent paths go"
+            if _similarity(shingles(main), probe.shingles) >= self.similarity:
+                return "Same content as a nonexistent path on this host"
+        return None
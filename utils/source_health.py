@@ -0,0 +1,313 @@
+import hashlib
+import math
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import namedtuple
+
+SOURCE_HEALTH_DB = "output/source_health.sqlite3"
+HISTORY = 50                      # fetches kept per source for latency percentiles
+COMMIT_EVERY = 200                # updates per SQLite transaction
+
+# A source is paused once it failed (or yielded no events) this many times
+# in a row, for BASE_BACKOFF doubling with every further miss
+DEAD_AFTER = 3
+BARREN_AFTER = 3
+BASE_BACKOFF = 6 * 3600
+MAX_BACKOFF = 30 * 24 * 3600
+
+# What a source without history is assumed to cost and yield, so new sources
+# are ranked among known ones instead of first or last
+PRIOR_EVENTS = 1.0                # events per fetch
+PRIOR_WEIGHT = 2                  # fetches the prior counts as
+PRIOR_LATENCY = 2.0               # seconds per fetch
+MIN_LATENCY = 0.1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS fetches (
+    url TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    origin TEXT NOT NULL,
+    ok INTEGER NOT NULL,
+    latency REAL,
+    status TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_fetches_url ON fetches(url, fetched_at);
+
+CREATE TABLE IF NOT EXISTS sources (
+    url TEXT PRIMARY KEY,
+    fetches INTEGER NOT NULL DEFAULT 0,
+    failures INTEGER NOT NULL DEFAULT 0,
+    failure_streak INTEGER NOT NULL DEFAULT 0,
+    crawls INTEGER NOT NULL DEFAULT 0,
+    events INTEGER NOT NULL DEFAULT 0,
+    barren_streak INTEGER NOT NULL DEFAULT 0,
+    fingerprint TEXT,
+    recrawls INTEGER NOT NULL DEFAULT 0,
+    changes INTEGER NOT NULL DEFAULT 0,
+    last_ok REAL,
+    last_attempt REAL,
+    paused_until REAL NOT NULL DEFAULT 0,
+    last_run TEXT
+);
+"""
+
+# Everything the planner knows about a source. Latencies are None until it
+# was fetched successfully; change_rate is the (smoothed) share of recrawls
+# that found a different set of events.
+SourceStats = namedtuple("SourceStats", [
+    "url", "fetches", "failures", "failure_streak", "crawls", "events", "barren_streak",
+    "p50_latency", "p90_latency", "events_per_fetch", "change_rate", "paused_until",
+])
+
+CrawlPlan = namedtuple("CrawlPlan", ["urls", "paused", "over_budget"])
+
+
+def percentile(values, q):
+    """Nearest-rank percentile of a non-empty sorted list"""
+    return values[max(0, math.ceil(q / 100 * len(values)) - 1)]
+
+
+def events_fingerprint(events):
+    """Identity of a crawl's event set, independent of the order events were found in"""
+    ids = sorted(event.event_id for event in events)
+    return hashlib.sha1("\n".join(ids).encode("utf-8")).hexdigest()
+
+
+def backoff(misses, after):
+    """Seconds a source is paused after `misses` consecutive failed or empty crawls"""
+    if misses < after:
+        return 0
+    return min(BASE_BACKOFF * 2 ** (misses - after), MAX_BACKOFF)
+
+
+def score(stats):
+    """
+    Expected events per second of fetching, weighted by how often the source changes.
+
+    Sources without history get the priors, so they neither jump the queue
+    nor starve behind known ones.
+    """
+    if stats is None:
+        return PRIOR_EVENTS * 0.5 / PRIOR_LATENCY
+    latency = max(stats.p50_latency if stats.p50_latency is not None else PRIOR_LATENCY, MIN_LATENCY)
+    return stats.events_per_fetch * stats.change_rate / latency
+
+
+class SourceHealth:
+    """
+    Persistent per-source record of latency, failures, yield and change frequency.
+
+    The validator feeds it a fetch for every URL it checks and the crawler
+    one for every page it downloads plus the events each source yielded.
+    plan() turns that history into a crawl order and budget: fast,
+    high-yield, frequently changing sources first, while dead and barren
+    sources are paused for exponentially growing periods.
+    """
+
+    def __init__(self, path=SOURCE_HEALTH_DB, history=HISTORY, commit_every=COMMIT_EVERY):
+        """
+        Args:
+            path: SQLite file holding the history
+            history: Fetches kept per source for latency percentiles
+            commit_every: Updates written per transaction
+        """
+        self.path = path
+        self.history = history
+        self.commit_every = commit_every
+        self._uncommitted = 0
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(sources)")}
+        if "last_run" not in columns:
+            self._conn.execute("ALTER TABLE sources ADD COLUMN last_run TEXT")
+        self._lock = threading.Lock()
+        self.start_run()
+
+    def start_run(self):
+        """Begin a new run; record_fetch(once_per_run=True) counts each source once per run"""
+        self.run = uuid.uuid4().hex
+
+    def _source(self, url):
+        self._conn.execute("INSERT OR IGNORE INTO sources (url) VALUES (?)", (url,))
+        return self._conn.execute(
+            "SELECT failure_streak, barren_streak, fingerprint, last_run FROM sources WHERE url = ?", (url,)
+        ).fetchone()
+
+    def _count_write(self):
+        self._uncommitted += 1
+        if self._uncommitted >= self.commit_every:
+            self._conn.commit()
+            self._uncommitted = 0
+
+    def record_fetch(self, url, ok, latency=None, status=None, origin="crawl", once_per_run=False):
+        """
+        Record one request to a source.
+
+        Args:
+            url: Source URL
+            ok: Whether the source answered with a usable page
+            latency: Seconds the request took (only kept for successful fetches)
+            status: Validation status or other short outcome, for inspection
+            origin: "validate" or "crawl"
+            once_per_run: Ignore the fetch if the source was already recorded
+                in this run (e.g. a URL listed under several categories)
+        """
+        now = time.time()
+        with self._lock:
+            failure_streak, barren_streak, _, last_run = self._source(url)
+            if once_per_run and last_run == self.run:
+                return
+            failure_streak = 0 if ok else failure_streak + 1
+            pause = max(backoff(failure_streak, DEAD_AFTER), backoff(barren_streak, BARREN_AFTER))
+            self._conn.execute(
+                "INSERT INTO fetches (url, fetched_at, origin, ok, latency, status) VALUES (?, ?, ?, ?, ?, ?)",
+                (url, now, origin, int(bool(ok)), latency if ok else None, status),
+            )
+            self._conn.execute(
+                "UPDATE sources SET fetches = fetches + 1, failures = failures + ?, failure_streak = ?,"
+                " last_ok = CASE WHEN ? THEN ? ELSE last_ok END, last_attempt = ?, paused_until = ?,"
+                " last_run = ? WHERE url = ?",
+                (0 if ok else 1, failure_streak, int(bool(ok)), now, now, now + pause if pause else 0,
+                 self.run, url),
+            )
+            # Keep only the latest fetches of each source
+            self._conn.execute(
+                "DELETE FROM fetches WHERE url = ? AND rowid NOT IN"
+                " (SELECT rowid FROM fetches WHERE url = ? ORDER BY fetched_at DESC LIMIT ?)",
+                (url, url, self.history),
+            )
+            self._count_write()
+
+    def record_events(self, url, events, follow_up=False):
+        """
+        Record the events a crawl of a source yielded.
+
+        Args:
+            url: Source URL
+            events: utils.schema.Event objects (with event_id)
+            follow_up: True for pages reached by following the source's
+                links; their events count towards its yield, but only the
+                source's own page decides whether it changed or came up empty
+        """
+        with self._lock:
+            failure_streak, barren_streak, previous, _ = self._source(url)
+            if follow_up:
+                self._conn.execute(
+                    "UPDATE sources SET crawls = crawls + 1, events = events + ? WHERE url = ?",
+                    (len(events), url),
+                )
+                self._count_write()
+                return
+            barren_streak = 0 if events else barren_streak + 1
+            pause = max(backoff(failure_streak, DEAD_AFTER), backoff(barren_streak, BARREN_AFTER))
+            current = events_fingerprint(events)
+            compared = int(previous is not None)
+            self._conn.execute(
+                "UPDATE sources SET crawls = crawls + 1, events = events + ?, barren_streak = ?,"
+                " fingerprint = ?, recrawls = recrawls + ?, changes = changes + ?, paused_until = ?"
+                " WHERE url = ?",
+                (len(events), barren_streak, current, compared, int(compared and current != previous),
+                 time.time() + pause if pause else 0, url),
+            )
+            self._count_write()
+
+    def stats(self, urls=None):
+        """{url: SourceStats} for the given sources (default: every known source)"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT url, fetches, failures, failure_streak, crawls, events, barren_streak,"
+                " recrawls, changes, paused_until FROM sources"
+            ).fetchall()
+            latencies = {}
+            for url, latency in self._conn.execute(
+                "SELECT url, latency FROM fetches WHERE latency IS NOT NULL ORDER BY url, latency"
+            ):
+                latencies.setdefault(url, []).append(latency)
+
+        wanted = set(urls) if urls is not None else None
+        stats = {}
+        for (url, fetches, failures, failure_streak, crawls, events, barren_streak,
+             recrawls, changes, paused_until) in rows:
+            if wanted is not None and url not in wanted:
+                continue
+            values = latencies.get(url)
+            stats[url] = SourceStats(
+                url=url,
+                fetches=fetches,
+                failures=failures,
+                failure_streak=failure_streak,
+                crawls=crawls,
+                events=events,
+                barren_streak=barren_streak,
+                p50_latency=percentile(values, 50) if values else None,
+                p90_latency=percentile(values, 90) if values else None,
+                events_per_fetch=(events + PRIOR_EVENTS * PRIOR_WEIGHT) / (crawls + PRIOR_WEIGHT),
+                change_rate=(changes + 1) / (recrawls + 2),
+                paused_until=paused_until,
+            )
+        return stats
+
+    def plan(self, urls, budget=None, include_paused=False):
+        """
+        Order sources for a crawl and cut the order at a time budget.
+
+        Args:
+            urls: Source URLs to consider
+            budget: Seconds of fetching to spend, estimated from each source's
+                p90 latency, or None for no limit
+            include_paused: Also crawl sources that are backing off
+
+        Returns:
+            CrawlPlan: urls to crawl, best first; sources skipped because they
+            are paused; and sources that did not fit the budget
+        """
+        urls = list(dict.fromkeys(urls))
+        stats = self.stats(urls)
+        now = time.time()
+        ranked, paused = [], []
+        for index, url in enumerate(urls):
+            source = stats.get(url)
+            if source is not None and source.paused_until > now and not include_paused:
+                paused.append(url)
+                continue
+            # Equal scores keep their input order
+            ranked.append((-score(source), index, url))
+        ranked.sort()
+
+        planned, over_budget = [], []
+        spent = 0.0
+        for _, _, url in ranked:
+            source = stats.get(url)
+            cost = source.p90_latency if source is not None and source.p90_latency is not None else PRIOR_LATENCY
+            if budget is not None and spent + cost > budget:
+                over_budget.append(url)
+                continue
+            spent += cost
+            planned.append(url)
+        return CrawlPlan(planned, paused, over_budget)
+
+    def commit(self):
+        with self._lock:
+            self._conn.commit()
+            self._uncommitted = 0
+
+    def close(self):
+        self.commit()
+        self._conn.close()
+
+    def report(self, plan=None):
+        with self._lock:
+            known, paused = self._conn.execute(
+                "SELECT COUNT(*), SUM(paused_until > ?) FROM sources", (time.time(),)
+            ).fetchone()
+        line = f"🩺 Source health: {known} sources tracked, {paused or 0} backing off"
+        if plan is not None:
+            line += (f"; crawling {len(plan.urls)}, skipping {len(plan.paused)} paused"
+                     f" and {len(plan.over_budget)} over budget")
+        print(line)
@@ -0,0 +1,327 @@
+import json
+import re
+import xml.etree.ElementTree as ET
+from html import unescape
+from urllib.parse import urljoin
+
+from bs4 import BeautifulSoup
+
+from utils.schema import Event
+
+MAX_DESCRIPTION_CHARS = 300
+
+_JSON_LD = re.compile(
+    r"<script[^>]+type\s*=\s*[\"']application/ld\+json[\"'][^>]*>(.*?)</script>",
+    re.IGNORECASE | re.DOTALL,
+)
+_MICRODATA_EVENT = re.compile(r"itemtype\s*=\s*[\"']https?://schema\.org/\w*Event[\"']", re.IGNORECASE)
+_MICRODATA_EVENT_TYPE = re.compile(r"schema\.org/\w*Event$", re.IGNORECASE)
+_FEED_LINK = re.compile(r"<link\b[^>]*>", re.IGNORECASE)
+_ATTR = re.compile(r"(\w[\w-]*)\s*=\s*[\"']([^\"']*)[\"']")
+_ICAL_DATE = re.compile(r"^(\d{4})(\d{2})(\d{2})(?:T(\d{2})(\d{2})(\d{2})(Z)?)?$")
+
+EVENT_ENDPOINT_TYPES = ("text/calendar", "application/rss+xml", "application/xml", "text/xml")
+RSS_EVENT_NS = "http://purl.org/rss/1.0/modules/event/"
+
+
+def _text(value):
+    if value is None:
+        return ""
+    if isinstance(value, list):
+        return _text(value[0]) if value else ""
+    if isinstance(value, dict):
+        return _text(value.get("name") or value.get("@value") or value.get("url") or "")
+    return unescape(str(value)).strip()
+
+
+def _short(description):
+    description = re.sub(r"\s+", " ", _text(description))
+    if len(description) > MAX_DESCRIPTION_CHARS:
+        description = description[:MAX_DESCRIPTION_CHARS].rsplit(" ", 1)[0] + "…"
+    return description
+
+
+def _as_list(value):
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
+
+
+def _event(**fields):
+    # Same validation and coercion as LLM output (parsed dates, interned strings)
+    return Event.from_dict(fields)
+
+
+def _is_event_type(types):
+    return any(isinstance(t, str) and t.split("/")[-1].endswith("Event") for t in _as_list(types))
+
+
+# --- JSON-LD -----------------------------------------------------------------
+
+def _address(address):
+    if isinstance(address, dict):
+        parts = [
+            address.get("streetAddress"),
+            address.get("addressLocality"),
+            " ".join(p for p in (_text(address.get("addressRegion")), _text(address.get("postalCode"))) if p),
+        ]
+        return ", ".join(_text(p) for p in parts if p and _text(p))
+    return _text(address)
+
+
+def _location(location):
+    location = _as_list(location)
+    if not location:
+        return "", ""
+    place = location[0]
+    if isinstance(place, str):
+        return place.strip(), ""
+    if "VirtualLocation" in _as_list(place.get("@type")):
+        return place.get("name") or "Online", _text(place.get("url"))
+    return _text(place.get("name")), _address(place.get("address"))
+
+
+def _price(offers, free=None):
+    if free is True or str(free).lower() == "true":
+        return "Free"
+    for offer in _as_list(offers):
+        if not isinstance(offer, dict):
+            continue
+        currency = _text(offer.get("priceCurrency"))
+        if offer.get("lowPrice") is not None:
+            high = offer.get("highPrice")
+            price = f"{offer['lowPrice']} - {high}" if high is not None else str(offer["lowPrice"])
+        elif offer.get("price") is not None:
+            price = _text(offer.get("price"))
+        else:
+            continue
+        if price in ("0", "0.0", "0.00"):
+            return "Free"
+        return f"{price} {currency}".strip()
+    return ""
+
+
+def _images(image, base_url):
+    urls = []
+    for item in _as_list(image):
+        url = _text(item.get("url") or item.get("contentUrl")) if isinstance(item, dict) else _text(item)
+        if url:
+            urls.append(urljoin(base_url, url))
+    return urls
+
+
+def _event_from_json_ld(item, page_url):
+    venue_name, venue_address = _location(item.get("location"))
+    host = item.get("organizer") or item.get("performer")
+    sites = [urljoin(page_url, _text(item.get("url")))] if item.get("url") else []
+    if page_url not in sites:
+        sites.append(page_url)
+    return _event(
+        name=_text(item.get("name")),
+        venue_name=venue_name,
+        venue_address=venue_address,
+        start_datetime=_text(item.get("startDate")),
+        end_datetime=_text(item.get("endDate")),
+        short_description=_short(item.get("description")),
+        price=_price(item.get("offers"), item.get("isAccessibleForFree")),
+        host=_text(host),
+        source_websites=sites,
+        hero_images=_images(item.get("image"), page_url),
+    )
+
+
+def _walk_json_ld(node, found):
+    if isinstance(node, list):
+        for item in node:
+            _walk_json_ld(item, found)
+    elif isinstance(node, dict):
+        if _is_event_type(node.get("@type")) and node.get("name") and node.get("startDate"):
+            found.append(node)
+            return  # subEvents are already described by their parent
+        for value in node.values():
+            if isinstance(value, (dict, list)):
+                _walk_json_ld(value, found)
+
+
+def parse_json_ld(html, page_url):
+    """schema.org Event objects from <script type="application/ld+json"> blocks"""
+    items = []
+    for block in _JSON_LD.findall(html):
+        try:
+            data = json.loads(block.strip())
+        except json.JSONDecodeError:
+            continue
+        _walk_json_ld(data, items)
+    events = [_event_from_json_ld(item, page_url) for item in items]
+    return [event for event in events if event is not None]
+
+
+# --- Microdata ---------------------------------------------------------------
+
+def _microdata_props(scope):
+    props = {}
+    for element in scope.find_all(attrs={"itemprop": True}):
+        # Properties of nested items (e.g. location -> Place) belong to that item
+        owner = element.find_parent(attrs={"itemscope": True})
+        if owner is not scope:
+            continue
+        if element.has_attr("itemscope"):
+            value = _microdata_props(element)
+            value["@type"] = element.get("itemtype", "")
+        else:
+            value = (element.get("content") or element.get("datetime") or element.get("src")
+                     or element.get("href") or element.get_text(" ", strip=True))
+        for name in element["itemprop"].split():
+            props.setdefault(name, value)
+    return props
+
+
+def parse_microdata(html, page_url):
+    """schema.org Event items marked up with itemscope/itemtype/itemprop"""
+    if not _MICRODATA_EVENT.search(html):
+        return []
+    soup = BeautifulSoup(html, "html.parser")
+    events = []
+    for scope in soup.find_all(attrs={"itemscope": True, "itemtype": _MICRODATA_EVENT_TYPE}):
+        if scope.find_parent(attrs={"itemscope": True, "itemtype": _MICRODATA_EVENT_TYPE}):
+            continue
+        props = _microdata_props(scope)
+        if props.get("name") and props.get("startDate"):
+            events.append(_event_from_json_ld(props, page_url))
+    return [event for event in events if event is not None]
+
+
+# --- iCalendar ---------------------------------------------------------------
+
+def _ical_datetime(value):
+    match = _ICAL_DATE.match(value.strip())
+    if not match:
+        return value.strip()
+    year, month, day, hour, minute, second, utc = match.groups()
+    if hour is None:
+        return f"{year}-{month}-{day}"
+    return f"{year}-{month}-{day}T{hour}:{minute}:{second}{'Z' if utc else ''}"
+
+
+def _ical_unescape(value):
+    return (value.replace("\\n", "\n").replace("\\N", "\n")
+            .replace("\\,", ",").replace("\\;", ";").replace("\\\\", "\\"))
+
+
+def parse_ical(text, page_url):
+    """VEVENT entries from an iCalendar feed"""
+    # Unfold continuation lines (RFC 5545 3.1)
+    lines = re.sub(r"\r?\n[ \t]", "", text).splitlines()
+    events = []
+    current = None
+    for line in lines:
+        if line == "BEGIN:VEVENT":
+            current = {}
+        elif line == "END:VEVENT" and current is not None:
+            if current.get("SUMMARY"):
+                location = current.get("LOCATION", "")
+                sites = [current["URL"]] if current.get("URL") else []
+                if page_url not in sites:
+                    sites.append(page_url)
+                events.append(_event(
+                    name=current["SUMMARY"],
+                    venue_name=location.split(",")[0].strip(),
+                    venue_address=location,
+                    start_datetime=_ical_datetime(current.get("DTSTART", "")),
+                    end_datetime=_ical_datetime(current.get("DTEND", "")),
+                    short_description=_short(current.get("DESCRIPTION")),
+                    price="",
+                    host=current.get("ORGANIZER", ""),
+                    source_websites=sites,
+                    hero_images=[],
+                ))
+            current = None
+        elif current is not None and ":" in line:
+            name, value = line.split(":", 1)
+            name, *params = name.split(";")
+            name = name.upper()
+            if name == "ORGANIZER":
+                # ORGANIZER;CN=Parks Dept:mailto:parks@example.gov -> "Parks Dept"
+                common_names = [p[3:].strip('"') for p in params if p.upper().startswith("CN=")]
+                value = common_names[0] if common_names else value.replace("mailto:", "")
+            current.setdefault(name, _ical_unescape(value))
+    return events
+
+
+# --- RSS with the RSS 1.0 event module ---------------------------------------
+
+def parse_rss_events(xml_text, page_url):
+    """RSS items carrying ev:startdate (other feed items are not events)"""
+    try:
+        root = ET.fromstring(xml_text.encode("utf-8") if isinstance(xml_text, str) else xml_text)
+    except ET.ParseError:
+        return []
+
+    events = []
+    for item in root.iter():
+        if not item.tag.endswith("item"):
+            continue
+        start = item.findtext(f"{{{RSS_EVENT_NS}}}startdate")
+        if not start:
+            continue
+
+        def child(name):
+            for element in item:
+                if element.tag.split("}")[-1] == name:
+                    return (element.text or "").strip()
+            return ""
+
+        location = item.findtext(f"{{{RSS_EVENT_NS}}}location") or ""
+        link = child("link")
+        events.append(_event(
+            name=child("title"),
+            venue_name=location.split(",")[0].strip(),
+            venue_address=location.strip(),
+            start_datetime=start.strip(),
+            end_datetime=(item.findtext(f"{{{RSS_EVENT_NS}}}enddate") or "").strip(),
+            short_description=_short(re.sub(r"<[^>]+>", " ", child("description"))),
+            price="",
+            host=(item.findtext(f"{{{RSS_EVENT_NS}}}organizer") or "").strip(),
+            source_websites=[link, page_url] if link and link != page_url else [page_url],
+            hero_images=[],
+        ))
+    return [event for event in events if event is not None]
+
+
+# --- Entry points ------------------------------------------------------------
+
+def find_feed_links(html, page_url):
+    """Absolute URLs of iCal feeds advertised with <link rel="alternate">"""
+    links = []
+    for tag in _FEED_LINK.findall(html):
+        attrs = {k.lower(): v for k, v in _ATTR.findall(tag)}
+        if "alternate" in attrs.get("rel", "").lower() and attrs.get("type", "").lower() == "text/calendar":
+            if attrs.get("href"):
+                links.append(urljoin(page_url, unescape(attrs["href"])))
+    return links
+
+
+def extract_structured_events(content, page_url, content_type=""):
+    """
+    Parse events straight from structured data, without the LLM.
+
+    Args:
+        content: Raw response body (HTML, iCalendar or RSS)
+        page_url: URL the content was fetched from
+        content_type: Response media type, used to recognize feeds
+
+    Returns:
+        list: utils.schema.Event objects (empty if the page has no structured events)
+    """
+    head = content.lstrip()[:200]
+    if content_type == "text/calendar" or head.startswith("BEGIN:VCALENDAR"):
+        return parse_ical(content, page_url)
+    if content_type in EVENT_ENDPOINT_TYPES or head.startswith("<?xml") or head.startswith("<rss"):
+        events = parse_rss_events(content, page_url)
+        if events or "<html" not in content[:1000].lower():
+            return events
+
+    events = parse_json_ld(content, page_url)
+    if not events:
+        events = parse_microdata(content, page_url)
+    return events
@@ -0,0 +1,181 @@
+import re
+
+import numpy as np
+
+# Context windows of the models the crawler is run with (tokens)
+MODEL_CONTEXT_TOKENS = {
+    "llama3.2": 8192,
+    "llama3": 8192,
+    "mistral": 8192,
+}
+DEFAULT_CONTEXT_TOKENS = 4096
+PROMPT_OVERHEAD_TOKENS = 300      # fixed schema instructions around the page text
+RESPONSE_TOKEN_RESERVE = 2048
+DEFAULT_PAGE_BUDGET = 1500        # prompts stay small even when the window is large
+
+_SENTENCE_SPLIT = re.compile(r"\n+|(?<=[.!?])\s+(?=[A-Z0-9])")
+_WORD = re.compile(r"[a-z0-9]+")
+
+_MONTH = r"(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\.?"
+_WEEKDAY = r"(?:mon|tue|tues|wed|thu|thur|thurs|fri|sat|sun)[a-z]*\.?"
+
+# Event-signal features; each is counted per sentence
+FEATURES = [
+    ("date", 3.0, re.compile(
+        rf"\b{_MONTH}\s+\d{{1,2}}(?:st|nd|rd|th)?\b|\b\d{{1,2}}[/-]\d{{1,2}}(?:[/-]\d{{2,4}})?\b"
+        rf"|\b\d{{4}}-\d{{2}}-\d{{2}}\b|\b{_WEEKDAY}\b|\b(?:today|tomorrow|tonight)\b", re.I)),
+    ("time", 2.5, re.compile(
+        r"\b\d{1,2}(?::\d{2})?\s*(?:a\.?m\.?|p\.?m\.?)\b|\b\d{1,2}:\d{2}\b|\bnoon\b|\bmidnight\b", re.I)),
+    ("price", 2.0, re.compile(
+        r"\$\s?\d|\bfree\b|\btickets?\b|\badmission\b|\bregist(?:er|ration)\b|\brsvp\b", re.I)),
+    ("address", 2.0, re.compile(
+        r"\b\d+\s+(?:[nsew]\.?\s+)?\w+(?:\s\w+)?\s+(?:st|street|ave|avenue|blvd|boulevard|rd|road|dr|drive"
+        r"|ln|lane|way|pl|place|pkwy|parkway|ct|court|sq|square)\b\.?|\b[A-Z]{2}\s+\d{5}\b", re.I)),
+    ("venue", 1.5, re.compile(
+        r"\b(?:park|center|centre|theat(?:er|re)|hall|museum|library|arena|stadium|gallery|club"
+        r"|venue|auditorium|plaza|church|ballroom|pavilion)\b", re.I)),
+    ("event", 1.5, re.compile(
+        r"\b(?:concert|festival|fair|market|show|exhibit(?:ion)?|performance|workshop|class|tour"
+        r"|meeting|screening|parade|gala|conference|seminar|celebration|tournament|game)s?\b", re.I)),
+]
+FEATURE_WEIGHTS = np.array([weight for _, weight, _ in FEATURES])
+DATE_FEATURE = 0
+CENTRALITY_WEIGHT = 0.5
+MIN_SENTENCE_CHARS = 3
+MIN_SENTENCE_TOKENS = 2
+
+
+def estimate_tokens(text):
+    # ~4 characters per token for English text with Llama-family tokenizers
+    return len(text) // 4 + 1
+
+
+def page_token_budget(model, context_tokens=None, page_budget=DEFAULT_PAGE_BUDGET):
+    """Tokens of page text that fit the model's window next to the prompt and the answer"""
+    context = context_tokens or MODEL_CONTEXT_TOKENS.get(model, DEFAULT_CONTEXT_TOKENS)
+    available = context - PROMPT_OVERHEAD_TOKENS - RESPONSE_TOKEN_RESERVE
+    return max(256, min(page_budget, available))
+
+
+def split_sentences(text):
+    sentences = []
+    for sentence in _SENTENCE_SPLIT.split(text):
+        sentence = sentence.strip()
+        # Venue and address lines legitimately repeat across event cards, so
+        # only back-to-back duplicates are dropped
+        if len(sentence) >= MIN_SENTENCE_CHARS and (not sentences or sentences[-1] != sentence):
+            sentences.append(sentence)
+    return sentences
+
+
+def _feature_matrix(sentences, joined, starts):
+    """(n_sentences, n_features) counts, computed per feature over the whole page at once"""
+    counts = np.zeros((len(sentences), len(FEATURES)))
+    for column, (_, _, pattern) in enumerate(FEATURES):
+        positions = np.fromiter((m.start() for m in pattern.finditer(joined)), dtype=np.int64)
+        if positions.size:
+            owners = np.searchsorted(starts, positions, side="right") - 1
+            counts[:, column] = np.bincount(owners, minlength=len(sentences))
+    return counts
+
+
+def _centrality(joined, starts, n_sentences):
+    """Mean log frequency of each sentence's terms across the page (sparse bag of words)"""
+    lowered = joined.lower()
+    matches = list(_WORD.finditer(lowered))
+    if not matches:
+        return np.zeros(n_sentences)
+    positions = np.fromiter((m.start() for m in matches), dtype=np.int64, count=len(matches))
+    words = np.array([m.group() for m in matches])
+    _, term_ids, term_freq = np.unique(words, return_inverse=True, return_counts=True)
+    owners = np.searchsorted(starts, positions, side="right") - 1
+
+    term_scores = np.log1p(term_freq)[term_ids]
+    totals = np.bincount(owners, weights=term_scores, minlength=n_sentences)
+    lengths = np.bincount(owners, minlength=n_sentences)
+    return totals / np.maximum(lengths, 1)
+
+
+def score_sentences(sentences):
+    """
+    Event-signal score per sentence.
+
+    Returns:
+        tuple: (scores, has_date) arrays; higher scores are more likely to carry event details
+    """
+    joined = "\n".join(sentences)
+    lengths = np.fromiter((len(s) + 1 for s in sentences), dtype=np.int64, count=len(sentences))
+    starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+
+    features = _feature_matrix(sentences, joined, starts)
+    scores = np.log1p(features) @ FEATURE_WEIGHTS
+
+    centrality = _centrality(joined, starts, len(sentences))
+    if centrality.max() > 0:
+        scores += CENTRALITY_WEIGHT * centrality / centrality.max()
+    return scores, features[:, DATE_FEATURE] > 0
+
+
+def event_blocks(has_date):
+    """
+    Block number per sentence. A block opens on the line before each date
+    (where listings put the title) and runs up to the next one, so a title,
+    its date, venue and price are kept or dropped together.
+    """
+    opens = has_date.copy()
+    opens[1:] &= ~has_date[:-1]       # a start date followed by an end date is one event
+    first_lines = np.flatnonzero(opens) - 1
+    block_start = np.zeros(len(has_date), dtype=bool)
+    block_start[np.maximum(first_lines, 0)] = True
+    return np.cumsum(block_start)
+
+
+def reduce_text(text, token_budget=DEFAULT_PAGE_BUDGET):
+    """
+    Shrink page text to the sentences most likely to describe events.
+
+    Sentences are scored for dates, times, prices, addresses, venues and
+    event words. Whole event blocks are picked by score per token until the
+    budget is spent, the remainder is filled with the best single sentences,
+    and the result is returned in page order.
+
+    Args:
+        text: Visible page text (newline separated)
+        token_budget: Maximum estimated tokens to keep
+
+    Returns:
+        str: Reduced text
+    """
+    sentences = split_sentences(text)
+    if not sentences:
+        return ""
+
+    tokens = np.fromiter((estimate_tokens(s) for s in sentences), dtype=np.int64, count=len(sentences))
+    if tokens.sum() <= token_budget:
+        return "\n".join(sentences)
+
+    scores, has_date = score_sentences(sentences)
+    blocks = event_blocks(has_date)
+    block_scores = np.bincount(blocks, weights=scores)
+    block_tokens = np.bincount(blocks, weights=tokens)
+
+    chosen = np.zeros(len(block_scores), dtype=bool)
+    remaining = token_budget
+    density = block_scores / np.maximum(block_tokens, 1)
+    for block in np.argsort(-density, kind="stable"):
+        if remaining < MIN_SENTENCE_TOKENS:
+            break
+        if block_scores[block] > 0 and block_tokens[block] <= remaining:
+            chosen[block] = True
+            remaining -= int(block_tokens[block])
+    keep = chosen[blocks]
+
+    # Spend what is left on the best sentences of blocks that did not fit whole
+    for index in np.argsort(-scores, kind="stable"):
+        if remaining < MIN_SENTENCE_TOKENS:
+            break
+        if not keep[index] and tokens[index] <= remaining:
+            keep[index] = True
+            remaining -= int(tokens[index])
+
+    return "\n".join(sentences[i] for i in np.flatnonzero(keep))
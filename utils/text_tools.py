@@ -1,9 +1,54 @@
-from sumy.parsers.plaintext import PlaintextParser
+from concurrent.futures import ProcessPoolExecutor
+
+from sumy.models.dom import ObjectDocumentModel, Paragraph
+from sumy.nlp.stemmers import Stemmer
 from sumy.nlp.tokenizers import Tokenizer
+from sumy.parsers.plaintext import PlaintextParser
 from sumy.summarizers.lsa import LsaSummarizer
+from sumy.utils import get_stop_words
+
+LANGUAGE = "english"
+# LSA runs an SVD over the sentence-term matrix; long pages are summarized in
+# chunks of this many sentences so the matrix (and the SVD) stays bounded
+CHUNK_SENTENCES = 150
+
+# Loaded once per process (see init_summarizer_worker) instead of per page
+_tokenizer = None
+_summarizer = None
+
+
+def init_summarizer_worker(language=LANGUAGE):
+    """Load the tokenizer, stemmer and stop words; used as the process pool initializer"""
+    global _tokenizer, _summarizer
+    _tokenizer = Tokenizer(language)
+    _summarizer = LsaSummarizer(Stemmer(language))
+    _summarizer.stop_words = get_stop_words(language)
+
+
+def _summarize_sentences(sentences, max_sentences):
+    document = ObjectDocumentModel([Paragraph(list(sentences))])
+    return list(_summarizer(document, max_sentences))
+
 
 def summarize_text(text, max_sentences=10):
-    parser = PlaintextParser.from_string(text, Tokenizer("english"))
-    summarizer = LsaSummarizer()
-    summary = summarizer(parser.document, max_sentences)
+    if _summarizer is None:
+        init_summarizer_worker()
+
+    parser = PlaintextParser.from_string(text, _tokenizer)
+    sentences = parser.document.sentences
+
+    if len(sentences) <= CHUNK_SENTENCES:
+        summary = _summarizer(parser.document, max_sentences)
+    else:
+        # Pick the best sentences of each chunk, then summarize the shortlist
+        shortlist = []
+        for start in range(0, len(sentences), CHUNK_SENTENCES):
+            shortlist.extend(_summarize_sentences(sentences[start:start + CHUNK_SENTENCES], max_sentences))
+        summary = _summarize_sentences(shortlist, max_sentences)
+
     return "\n".join(str(sentence) for sentence in summary)
+
+
+def create_summarizer_pool(workers=None):
+    """Process pool whose workers each load the summarizer once at startup"""
+    return ProcessPoolExecutor(max_workers=workers, initializer=init_summarizer_worker)
@@ -0,0 +1,228 @@
+import csv
+import hashlib
+import json
+import math
+import os
+import sqlite3
+import time
+
+RESULTS_PATH = "output/url_validation.sqlite3"
+RESULT_TTL = 3 * 24 * 3600   # seconds a result stays valid for --resume
+COMMIT_EVERY = 200           # results per SQLite transaction
+
+WORKING_STATUSES = ("success", "redirect")
+
+# Reorder columns for better readability
+RESULT_COLUMNS = [
+    'Category', 'SourceURL', 'status', 'status_code', 'response_time',
+    'City', 'State', 'Generated', 'redirect_url', 'content_length',
+    'content_type', 'error'
+]
+# Keep original format columns plus some useful additional info
+FILTERED_COLUMNS = [
+    'Category', 'SourceURL', 'City', 'State', 'status_code',
+    'response_time', 'redirect_url'
+]
+PERFORMANCE_COLUMNS = [
+    'Category', 'SourceURL', 'City', 'State', 'status_code',
+    'response_time', 'content_length', 'content_type'
+]
+SIMPLE_COLUMNS = ['Category', 'SourceURL']
+
+
+def row_key(row):
+    """Identity of an input row (the same URL may be listed under several categories)"""
+    payload = json.dumps(row, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def _csv_value(value):
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return ""
+    return value
+
+
+def _writer(path, columns):
+    f = open(path, "w", newline="", encoding="utf-8")
+    writer = csv.DictWriter(f, fieldnames=columns, extrasaction="ignore")
+    writer.writeheader()
+    return f, writer
+
+
+def _clean(result, columns):
+    return {column: _csv_value(result.get(column)) for column in columns}
+
+
+class ValidationResultStore:
+    """
+    URL validation results, written to SQLite as each check completes.
+
+    Every validation run has an id. A resumed run continues the latest one:
+    rows whose result is younger than the TTL are carried into it without a
+    new request, everything else is checked again. Reports are streamed from
+    the database, so memory use does not grow with the size of the input.
+    """
+
+    def __init__(self, path=RESULTS_PATH, ttl=RESULT_TTL, resume=False, commit_every=COMMIT_EVERY):
+        """
+        Args:
+            path: SQLite file holding the results
+            ttl: Seconds a stored result is reused when resuming
+            resume: Continue the latest run instead of starting a new one
+            commit_every: Results written per transaction
+        """
+        self.path = path
+        self.ttl = ttl
+        self.resume = resume
+        self.commit_every = commit_every
+        self.reused = 0
+        self._uncommitted = 0
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            " key TEXT PRIMARY KEY,"
+            " run INTEGER NOT NULL,"
+            " checked_at REAL NOT NULL,"
+            " status TEXT,"
+            " category TEXT,"
+            " response_time REAL,"
+            " data TEXT NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_results_run ON results(run, response_time)")
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_results_category"
+            " ON results(run, category, response_time IS NULL, response_time)"
+        )
+        last_run = self._conn.execute("SELECT MAX(run) FROM results").fetchone()[0] or 0
+        self.run = last_run if resume and last_run else last_run + 1
+
+    def is_fresh(self, row):
+        """
+        True if resuming and the row was validated within the TTL; the stored
+        result is then counted in this run and the row needs no new request.
+        """
+        if not self.resume:
+            return False
+        key = row_key(row)
+        found = self._conn.execute("SELECT checked_at FROM results WHERE key = ?", (key,)).fetchone()
+        if found is None or found[0] < time.time() - self.ttl:
+            return False
+        self._conn.execute("UPDATE results SET run = ? WHERE key = ?", (self.run, key))
+        self.reused += 1
+        self._count_write()
+        return True
+
+    def add(self, row, result):
+        """Store the combined row + result for an input row"""
+        self._conn.execute(
+            "INSERT OR REPLACE INTO results (key, run, checked_at, status, category, response_time, data)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                row_key(row),
+                self.run,
+                time.time(),
+                result.get('status'),
+                _csv_value(result.get('Category')) or None,
+                result.get('response_time'),
+                json.dumps(result, default=str, ensure_ascii=False),
+            ),
+        )
+        self._count_write()
+
+    def _count_write(self):
+        self._uncommitted += 1
+        if self._uncommitted >= self.commit_every:
+            self.commit()
+
+    def commit(self):
+        self._conn.commit()
+        self._uncommitted = 0
+
+    def close(self):
+        self.commit()
+        self._conn.close()
+
+    def status_counts(self):
+        """{status: count} for this run"""
+        query = "SELECT status, COUNT(*) FROM results WHERE run = ? GROUP BY status"
+        return dict(self._conn.execute(query, (self.run,)))
+
+    def working_by_category(self):
+        """{category: working URL count} for this run"""
+        query = (
+            "SELECT COALESCE(category, 'Unknown'), COUNT(*) FROM results"
+            f" WHERE run = ? AND status IN ({', '.join('?' * len(WORKING_STATUSES))})"
+            " GROUP BY category"
+        )
+        return dict(self._conn.execute(query, (self.run, *WORKING_STATUSES)))
+
+    def write_reports(self, results_path, filtered_path, performance_path, top=10):
+        """
+        Write every report of this run, streaming rows from SQLite.
+
+        The full and performance reports come from one pass in
+        response_time order. The filtered reports come from a second query
+        ordered by (category, response_time), which the category index
+        serves without a sort, so no rows are held in memory or spooled
+        to temporary files.
+
+        Returns:
+            dict: rows written per report, and the `top` fastest working rows
+        """
+        cursor = self._conn.execute(
+            "SELECT data FROM results WHERE run = ? ORDER BY response_time IS NULL, response_time",
+            (self.run,),
+        )
+        counts = {"results": 0, "working": 0, "performance": 0}
+        fastest = []
+        results_file = performance_file = None
+        try:
+            for (data,) in cursor:
+                result = json.loads(data)
+                if results_file is None:
+                    # Known columns in report order, then any other input columns
+                    columns = [c for c in RESULT_COLUMNS if c in result]
+                    columns += [c for c in result if c not in RESULT_COLUMNS]
+                    results_file, results_writer = _writer(results_path, columns)
+                    performance_columns = [c for c in PERFORMANCE_COLUMNS if c in result]
+                    filtered_columns = [c for c in FILTERED_COLUMNS if c in result]
+                results_writer.writerow(_clean(result, columns))
+                counts["results"] += 1
+
+                if result.get('status') not in WORKING_STATUSES:
+                    continue
+                counts["working"] += 1
+
+                if result.get('response_time'):
+                    if performance_file is None:
+                        performance_file, performance_writer = _writer(performance_path, performance_columns)
+                    performance_writer.writerow(_clean(result, performance_columns))
+                    counts["performance"] += 1
+                    if len(fastest) < top:
+                        fastest.append(result)
+
+        finally:
+            for f in (results_file, performance_file):
+                if f is not None:
+                    f.close()
+
+        if counts["working"]:
+            cursor = self._conn.execute(
+                "SELECT data FROM results WHERE run = ?"
+                f" AND status IN ({', '.join('?' * len(WORKING_STATUSES))})"
+                " ORDER BY category, response_time IS NULL, response_time",
+                (self.run, *WORKING_STATUSES),
+            )
+            simple_path = filtered_path.replace('.csv', '_simple.csv')
+            filtered_file, filtered_writer = _writer(filtered_path, filtered_columns)
+            simple_file, simple_writer = _writer(simple_path, SIMPLE_COLUMNS)
+            with filtered_file, simple_file:
+                for (data,) in cursor:
+                    row = _clean(json.loads(data), filtered_columns)
+                    filtered_writer.writerow(row)
+                    simple_writer.writerow(row)
+        counts["fastest"] = fastest
+        return counts
@@ -5,20 +5,34 @@ Reads CSV data, checks URL availability, and creates filtered CSV with working s
 Includes retry logic, timeout handling, and comprehensive logging
 """
 
+import argparse
+import asyncio
 import pandas as pd
 import requests
 from urllib.parse import urlparse
 import time
 import csv
-from concurrent.futures import ThreadPoolExecutor, as_completed
-import threading
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from utils.async_validator import (
+    MAX_IN_FLIGHT, PER_HOST_LIMIT, AsyncURLChecker, aiohttp, classify, empty_result, unresolvable_result
+)
+from utils.dns_prefilter import DnsPrefilter, NegativeCache
+from utils.http_cache import default_cache
+from utils.http_client import get_session
+from utils.politeness import HostQueue, HostScheduler
+from utils.soft404 import Soft404Detector
+from utils.source_health import SourceHealth
+from utils.validation_store import RESULT_TTL, RESULTS_PATH, WORKING_STATUSES, ValidationResultStore
 import warnings
 warnings.filterwarnings('ignore', category=requests.packages.urllib3.exceptions.InsecureRequestWarning)
 
+BUFFERED_ROWS = 1000   # input rows read ahead of the worker threads
+PROGRESS_EVERY = 100
+
 class URLValidator:
-    def __init__(self, input_csv_path, max_workers=10, timeout=10, delay=0.5):
+    def __init__(self, input_csv_path, max_workers=10, timeout=10, delay=0.5, cache=default_cache,
+                 results_path=RESULTS_PATH, resume=False, ttl=RESULT_TTL, dns_prefilter=True,
+                 resolver=None, track_health=True):
         """
         Initialize URL validator
         
@@ -26,35 +40,45 @@ class URLValidator:
             input_csv_path: Path to input CSV file
             max_workers: Number of concurrent threads
             timeout: Request timeout in seconds
-            delay: Delay between requests to avoid rate limiting
+            delay: Minimum delay between requests to the same host
+            cache: HttpCache shared with the crawler (None disables caching)
+            results_path: SQLite file results are streamed to
+            resume: Continue the last run, skipping rows validated within ttl
+            ttl: Seconds a stored result is reused when resuming
+            dns_prefilter: Resolve each domain once before any request and
+                report URLs on nonexistent domains without fetching them
+            resolver: DNS resolver for the prefilter (e.g. a
+                utils.dns_prefilter.StaticResolver in tests)
+            track_health: Feed each result into the crawler's source health
+                database (utils.source_health), which orders and budgets crawls
         """
         self.input_csv_path = input_csv_path
         self.max_workers = max_workers
         self.timeout = timeout
         self.delay = delay
+        self.cache = cache
+        self.scheduler = HostScheduler(rate=1 / delay if delay > 0 else 1e9)
+        self.max_rate_limit_retries = 2
+        self.headers = {}
         self.session = self.create_session()
-        self.results = []
-        self.lock = threading.Lock()
+        self.store = ValidationResultStore(results_path, ttl=ttl, resume=resume)
+        self.detector = Soft404Detector()
+        self.dns = DnsPrefilter(resolver, NegativeCache()) if dns_prefilter else None
+        self.health = SourceHealth() if track_health else None
         self.processed_count = 0
         self.total_count = 0
         
     def create_session(self):
-        """Create a requests session with retry strategy"""
-        session = requests.Session()
-        
-        # Retry strategy
-        retry_strategy = Retry(
-            total=3,
-            backoff_factor=1,
-            status_forcelist=[429, 500, 502, 503, 504],
-        )
-        
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        session.mount("http://", adapter)
-        session.mount("https://", adapter)
+        """
+        Return the shared pooled session (keep-alive, per-host connection limits,
+        retry/backoff on 5xx; 429s are handed back to the per-host scheduler
+        instead of sleeping inside a worker thread)
+        """
+        session = get_session()
         
-        # Headers to appear more like a browser
-        session.headers.update({
+        # Headers to appear more like a browser (sent per request, since the
+        # session is shared with the scraper and the Ollama client)
+        self.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
             'Accept-Language': 'en-US,en;q=0.5',
@@ -75,30 +99,27 @@ class URLValidator:
         Returns:
             dict: Result dictionary with URL status information
         """
-        result = {
-            'url': url,
-            'status': 'unknown',
-            'status_code': None,
-            'response_time': None,
-            'error': None,
-            'redirect_url': None,
-            'content_length': None,
-            'content_type': None
-        }
+        result = empty_result(url)
         
         try:
             start_time = time.time()
             
-            # Make request with timeout
-            response = self.session.get(
-                url, 
+            # Make request with timeout (revalidated against the shared
+            # cache, so unchanged pages come back as a cheap 304)
+            request_kwargs = dict(
+                headers=self.headers,
                 timeout=self.timeout, 
                 allow_redirects=True,
                 verify=False  # Skip SSL verification for problematic sites
             )
+            if self.cache is not None:
+                response = self.cache.get(self.session, url, **request_kwargs)
+            else:
+                response = self.session.get(url, **request_kwargs)
             
             end_time = time.time()
             response_time = round(end_time - start_time, 2)
+            self.scheduler.record_response(url, response.status_code, response.headers)
             
             result.update({
                 'status_code': response.status_code,
@@ -111,41 +132,13 @@ class URLValidator:
             if response.url != url:
                 result['redirect_url'] = response.url
             
-            # Determine status based on response
+            # Determine status based on response; 200 pages are also compared
+            # with what the host serves for a path that does not exist
+            soft_404 = None
             if response.status_code == 200:
-                # Additional checks for valid content
-                content = response.text.lower()
-                
-                # Check for common error indicators
-                error_indicators = [
-                    '404 not found', 'page not found', 'file not found',
-                    'under construction', 'coming soon', 'temporarily unavailable',
-                    'site maintenance', 'access denied', 'forbidden'
-                ]
-                
-                if any(indicator in content for indicator in error_indicators):
-                    result['status'] = 'error_page'
-                    result['error'] = 'Page contains error indicators'
-                elif len(content) < 100:  # Very short content might indicate an error
-                    result['status'] = 'minimal_content'
-                    result['error'] = 'Page has minimal content'
-                else:
-                    result['status'] = 'success'
-            
-            elif response.status_code in [301, 302, 303, 307, 308]:
-                result['status'] = 'redirect'
-            elif response.status_code == 404:
-                result['status'] = 'not_found'
-                result['error'] = 'Page not found'
-            elif response.status_code == 403:
-                result['status'] = 'forbidden'
-                result['error'] = 'Access forbidden'
-            elif response.status_code >= 500:
-                result['status'] = 'server_error'
-                result['error'] = f'Server error: {response.status_code}'
-            else:
-                result['status'] = 'other_error'
-                result['error'] = f'HTTP {response.status_code}'
+                probe = self.detector.probe(url, self.fetch_probe)
+                soft_404 = self.detector.reason(response.text, url, response.url, probe)
+            result['status'], result['error'] = classify(response.status_code, response.text, soft_404=soft_404)
                 
         except requests.exceptions.Timeout:
             result['status'] = 'timeout'
@@ -165,6 +158,12 @@ class URLValidator:
         
         return result
     
+    def fetch_probe(self, url):
+        """(status_code, final_url, html) for a soft-404 probe URL"""
+        response = self.session.get(url, headers=self.headers, timeout=self.timeout,
+                                    allow_redirects=True, verify=False)
+        return response.status_code, response.url, response.text
+    
     def process_url(self, row_data):
         """
         Process a single URL and return combined result
@@ -181,89 +180,195 @@ class URLValidator:
         # Combine original row data with URL check result
         combined_result = {**row_data, **url_result}
         
-        # Update progress
-        with self.lock:
-            self.processed_count += 1
-            if self.processed_count % 50 == 0:
-                print(f"Progress: {self.processed_count}/{self.total_count} URLs checked ({self.processed_count/self.total_count*100:.1f}%)")
-        
-        # Add delay to avoid rate limiting
-        time.sleep(self.delay)
-        
         return combined_result
     
-    def validate_urls(self, input_df):
+    def _pending_rows(self, rows):
+        """Input rows that still need a request (resumed runs skip fresh results)"""
+        for row in rows:
+            if self.store.is_fresh(row):
+                self.processed_count += 1
+                continue
+            yield row
+    
+    def _resolved_rows(self, rows):
+        """Rows whose domain exists (or could not be checked); the rest fail without a request"""
+        for row, exists in self.dns.filter_rows(rows):
+            if exists:
+                yield row
+            else:
+                self._record(row, {**row, **unresolvable_result(row['SourceURL'])})
+    
+    def _record(self, row, result):
+        """Stream one finished check to the results store"""
+        self.store.add(row, result)
+        # A 429 says nothing about the source itself, and a URL listed under
+        # several categories is one source
+        if self.health is not None and result['status'] != 'rate_limited':
+            self.health.record_fetch(row['SourceURL'], result['status'] in WORKING_STATUSES,
+                                     result['response_time'], result['status'], origin="validate",
+                                     once_per_run=True)
+        self.processed_count += 1
+        if self.processed_count % PROGRESS_EVERY == 0:
+            if self.total_count:
+                print(f"Progress: {self.processed_count}/{self.total_count} URLs checked ({self.processed_count/self.total_count*100:.1f}%)")
+            else:
+                print(f"Progress: {self.processed_count} URLs checked")
+    
+    def _start(self, rows, total):
+        if total is None and hasattr(rows, '__len__'):
+            total = len(rows)
+        if isinstance(rows, pd.DataFrame):
+            rows = rows.to_dict('records')
+        self.total_count = total or 0
+        self.processed_count = 0
+        if self.health is not None:
+            self.health.start_run()
+        print(f"Starting validation of {self.total_count or 'all'} URLs...")
+        return self._pending_rows(rows)
+    
+    def _finish(self):
+        self.store.commit()
+        if self.health is not None:
+            self.health.commit()
+        if self.dns is not None:
+            self.dns.report()
+        reused = f" ({self.store.reused} reused from the last run)" if self.store.reused else ""
+        print(f"Validation complete! Processed {self.processed_count} URLs{reused}")
+        return self.processed_count
+    
+    def validate_urls(self, rows, total=None):
         """
-        Validate all URLs in the dataframe using multithreading
+        Validate all URLs using multithreading
         
         Args:
-            input_df: Input DataFrame with URLs to validate
+            rows: Input DataFrame, or any iterable of row dicts, with URLs to validate
+            total: Number of rows, for progress output (taken from rows if it has a length)
             
         Returns:
-            list: List of validation results
+            int: Number of rows validated; results are in self.store
         """
-        self.total_count = len(input_df)
-        self.processed_count = 0
+        pending_rows = self._start(rows, total)
+        if self.dns is not None:
+            pending_rows = self._resolved_rows(pending_rows)
+        print(f"Using {self.max_workers} concurrent threads with {self.delay}s delay per host")
         
-        print(f"Starting validation of {self.total_count} URLs...")
-        print(f"Using {self.max_workers} concurrent threads with {self.delay}s delay")
+        # Rows are handed to workers as soon as their host is ready, so
+        # threads never sleep on one throttled domain while others are idle.
+        # Only BUFFERED_ROWS are read ahead of the workers.
+        pending = HostQueue(self.scheduler, key=lambda row: row['SourceURL'])
+        attempts = {}
         
-        # Convert DataFrame rows to dictionaries
-        rows = input_df.to_dict('records')
-        
-        # Process URLs with thread pool
         with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            # Submit all tasks
-            future_to_row = {executor.submit(self.process_url, row): row for row in rows}
+            future_to_row = {}
+            exhausted = False
             
-            # Collect results as they complete
-            for future in as_completed(future_to_row):
-                try:
-                    result = future.result()
-                    self.results.append(result)
-                except Exception as e:
-                    print(f"Error processing URL: {e}")
-        
-        print(f"Validation complete! Processed {len(self.results)} URLs")
-        return self.results
+            while True:
+                while not exhausted and len(pending) < BUFFERED_ROWS:
+                    row = next(pending_rows, None)
+                    if row is None:
+                        exhausted = True
+                    else:
+                        pending.put(row)
+                if not (len(pending) or future_to_row):
+                    break
+                
+                wait_time = None
+                while len(pending) and len(future_to_row) < self.max_workers:
+                    row, wait_time = pending.next_ready()
+                    if row is None:
+                        break
+                    future_to_row[executor.submit(self.process_url, row)] = row
+                
+                if not future_to_row:
+                    time.sleep(wait_time)
+                    continue
+                
+                done, _ = wait(future_to_row, timeout=wait_time, return_when=FIRST_COMPLETED)
+                for future in done:
+                    row = future_to_row.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        print(f"Error processing URL: {e}")
+                        continue
+                    
+                    # Rate-limited URLs go back into the queue; the scheduler
+                    # holds their host until Retry-After has passed
+                    url = row['SourceURL']
+                    if result['status'] == 'rate_limited' and attempts.get(url, 0) < self.max_rate_limit_retries:
+                        attempts[url] = attempts.get(url, 0) + 1
+                        pending.put(row)
+                        continue
+                    attempts.pop(url, None)
+                    
+                    self._record(row, result)
+        
+        self.session.stats.report()
+        return self._finish()
     
-    def analyze_results(self, results):
+    def validate_urls_async(self, rows, total=None, max_in_flight=MAX_IN_FLIGHT, per_host=PER_HOST_LIMIT):
         """
-        Analyze and print validation results statistics
+        Validate all URLs with the asyncio engine (requires aiohttp)
+        
+        Each URL costs one ranged GET that reads only the start of the page,
+        with thousands of requests in flight and at most per_host of them
+        to any one host. With the shared cache, the GET revalidates the
+        stored copy and pages with validators are cached in full for the crawl.
         
         Args:
-            results: List of validation results
+            rows: Input DataFrame, or any iterable of row dicts, with URLs to validate
+            total: Number of rows, for progress output (taken from rows if it has a length)
+            max_in_flight: Requests open at once across all hosts
+            per_host: Requests open at once to a single host
+            
+        Returns:
+            int: Number of rows validated; results are in self.store
+        """
+        pending_rows = self._start(rows, total)
+        print(f"Using asyncio with up to {max_in_flight} requests in flight, {per_host} per host")
+        
+        checker = AsyncURLChecker(
+            scheduler=self.scheduler,
+            timeout=self.timeout,
+            headers=self.headers,
+            max_in_flight=max_in_flight,
+            per_host=per_host,
+            max_rate_limit_retries=self.max_rate_limit_retries,
+            detector=self.detector,
+            dns=self.dns,
+            cache=self.cache,
+        )
+        
+        asyncio.run(checker.run(pending_rows, self._record))
+        return self._finish()
+    
+    def analyze_results(self):
+        """
+        Analyze and print validation results statistics for this run
         """
         print("\n" + "="*60)
         print("VALIDATION RESULTS ANALYSIS")
         print("="*60)
         
         # Count results by status
-        status_counts = {}
-        successful_urls = 0
+        status_counts = self.store.status_counts()
+        total = sum(status_counts.values())
+        successful_urls = sum(count for status, count in status_counts.items() if status in WORKING_STATUSES)
+        if not total:
+            print("No results to analyze!")
+            return status_counts, 0
         
-        for result in results:
-            status = result['status']
-            status_counts[status] = status_counts.get(status, 0) + 1
-            if status in ['success', 'redirect']:
-                successful_urls += 1
-        
-        print(f"Total URLs checked: {len(results)}")
-        print(f"Successful URLs: {successful_urls} ({successful_urls/len(results)*100:.1f}%)")
-        print(f"Failed URLs: {len(results) - successful_urls} ({(len(results) - successful_urls)/len(results)*100:.1f}%)")
+        print(f"Total URLs checked: {total}")
+        print(f"Successful URLs: {successful_urls} ({successful_urls/total*100:.1f}%)")
+        print(f"Failed URLs: {total - successful_urls} ({(total - successful_urls)/total*100:.1f}%)")
         
         print(f"\nStatus Breakdown:")
         for status, count in sorted(status_counts.items()):
-            percentage = count / len(results) * 100
+            percentage = count / total * 100
             print(f"  {status:15}: {count:4} ({percentage:5.1f}%)")
         
         # Category breakdown for successful URLs
-        category_success = {}
-        for result in results:
-            if result['status'] in ['success', 'redirect']:
-                category = result.get('Category', 'Unknown')
-                category_success[category] = category_success.get(category, 0) + 1
-        
+        category_success = self.store.working_by_category()
         if category_success:
             print(f"\nSuccessful URLs by Category:")
             for category, count in sorted(category_success.items()):
@@ -271,144 +376,81 @@ class URLValidator:
         
         return status_counts, successful_urls
     
-    def save_results(self, results, output_path='url_validation_results.csv'):
+    def write_reports(self, results_path='url_validation_results.csv',
+                      filtered_path='working_event_sources.csv',
+                      performance_path='url_performance_report.csv'):
         """
-        Save all validation results to CSV
+        Write all reports for this run in one streaming pass over the results store
         
         Args:
-            results: List of validation results
-            output_path: Output file path
+            results_path: All URLs with validation status
+            filtered_path: Only working URLs, sorted by category and response time
+                (plus a Category/SourceURL-only copy next to it, *_simple.csv)
+            performance_path: Working URLs sorted by speed
         """
-        if not results:
+        counts = self.store.write_reports(results_path, filtered_path, performance_path)
+        if not counts['results']:
             print("No results to save!")
-            return
+            return counts
+        print(f"All validation results saved to: {results_path}")
         
-        df = pd.DataFrame(results)
-        
-        # Reorder columns for better readability
-        column_order = [
-            'Category', 'SourceURL', 'status', 'status_code', 'response_time',
-            'City', 'State', 'Generated', 'redirect_url', 'content_length',
-            'content_type', 'error'
-        ]
-        
-        # Only include columns that exist
-        available_columns = [col for col in column_order if col in df.columns]
-        other_columns = [col for col in df.columns if col not in column_order]
-        final_columns = available_columns + other_columns
-        
-        df = df[final_columns]
-        df.to_csv(output_path, index=False)
-        print(f"All validation results saved to: {output_path}")
-        
-        return df
-    
-    def create_filtered_csv(self, results, output_path='working_event_sources.csv'):
-        """
-        Create filtered CSV with only working URLs
-        
-        Args:
-            results: List of validation results
-            output_path: Output file path for filtered results
-        """
-        # Filter for successful URLs
-        working_results = [
-            result for result in results 
-            if result['status'] in ['success', 'redirect']
-        ]
-        
-        if not working_results:
+        if not counts['working']:
             print("No working URLs found!")
-            return None
-        
-        # Create DataFrame with working URLs
-        df = pd.DataFrame(working_results)
-        
-        # Keep original format columns plus some useful additional info
-        filtered_columns = [
-            'Category', 'SourceURL', 'City', 'State', 'status_code', 
-            'response_time', 'redirect_url'
-        ]
-        
-        # Only include columns that exist
-        available_columns = [col for col in filtered_columns if col in df.columns]
-        df_filtered = df[available_columns]
-        
-        # Sort by category and response time (faster sites first)
-        df_filtered = df_filtered.sort_values(['Category', 'response_time'])
-        
-        # Save filtered results
-        df_filtered.to_csv(output_path, index=False)
-        
-        print(f"\nFiltered results saved to: {output_path}")
-        print(f"Working URLs: {len(working_results)}")
-        
-        # Create simple format (Category, SourceURL only)
-        simple_output = output_path.replace('.csv', '_simple.csv')
-        df_simple = df_filtered[['Category', 'SourceURL']].copy()
-        df_simple.to_csv(simple_output, index=False)
-        print(f"Simple format saved to: {simple_output}")
-        
-        return df_filtered
-    
-    def create_performance_report(self, results, output_path='url_performance_report.csv'):
-        """
-        Create a performance report of working URLs sorted by speed
-        
-        Args:
-            results: List of validation results
-            output_path: Output file path for performance report
-        """
-        working_results = [
-            result for result in results 
-            if result['status'] in ['success', 'redirect'] and result['response_time']
-        ]
-        
-        if not working_results:
-            return None
-        
-        df = pd.DataFrame(working_results)
-        
-        # Performance report columns
-        performance_columns = [
-            'Category', 'SourceURL', 'City', 'State', 'status_code',
-            'response_time', 'content_length', 'content_type'
-        ]
-        
-        available_columns = [col for col in performance_columns if col in df.columns]
-        df_perf = df[available_columns]
-        
-        # Sort by response time (fastest first)
-        df_perf = df_perf.sort_values('response_time')
-        
-        df_perf.to_csv(output_path, index=False)
-        print(f"Performance report saved to: {output_path}")
-        
-        # Show top 10 fastest sites
-        print(f"\nTop 10 Fastest Responding Sites:")
-        print(df_perf.head(10)[['SourceURL', 'response_time', 'Category']].to_string(index=False))
-        
-        return df_perf
+            return counts
+        print(f"\nFiltered results saved to: {filtered_path}")
+        print(f"Working URLs: {counts['working']}")
+        print(f"Simple format saved to: {filtered_path.replace('.csv', '_simple.csv')}")
+        
+        if counts['performance']:
+            print(f"Performance report saved to: {performance_path}")
+            # Show top 10 fastest sites
+            print(f"\nTop 10 Fastest Responding Sites:")
+            top = pd.DataFrame(counts['fastest'])
+            print(top[[col for col in ['SourceURL', 'response_time', 'Category'] if col in top.columns]].to_string(index=False))
+        return counts
+
+def read_rows(path, chunksize=10000):
+    """Input rows as dicts, read a chunk at a time"""
+    for chunk in pd.read_csv(path, chunksize=chunksize):
+        yield from chunk.to_dict('records')
+
+
+def count_rows(path):
+    with open(path, newline='', encoding='utf-8') as f:
+        return max(0, sum(1 for _ in csv.reader(f)) - 1)
+
 
 def main():
     """Main function to run URL validation"""
     
     # Configuration
     INPUT_CSV = 'us_event_sources_complete.csv'  # Change this to your input file
-    MAX_WORKERS = 20  # Number of concurrent threads
+    MAX_WORKERS = 20  # Number of concurrent threads (when aiohttp is not installed)
+    MAX_IN_FLIGHT = 1000  # Concurrent requests for the asyncio engine
+    PER_HOST = 4      # Concurrent requests to a single host for the asyncio engine
     TIMEOUT = 15      # Request timeout in seconds
-    DELAY = 0.3       # Delay between requests (seconds)
+    DELAY = 0.3       # Minimum delay between requests to the same host (seconds)
+    
+    parser = argparse.ArgumentParser(description="URL Validation and Filtering Script")
+    parser.add_argument("--input", default=INPUT_CSV, help="CSV with Category and SourceURL columns")
+    parser.add_argument("--resume", action="store_true",
+                        help="Continue the last run, skipping URLs validated within --ttl-hours")
+    parser.add_argument("--ttl-hours", type=float, default=RESULT_TTL / 3600,
+                        help="Age after which a stored result is checked again when resuming")
+    parser.add_argument("--no-dns-prefilter", action="store_true",
+                        help="Send a request for every URL, even on domains that do not resolve")
+    args = parser.parse_args()
     
     print("URL Validation and Filtering Script")
     print("="*40)
     
     # Check if input file exists
     try:
-        input_df = pd.read_csv(INPUT_CSV)
-        print(f"Loaded {len(input_df)} URLs from {INPUT_CSV}")
+        total = count_rows(args.input)
+        print(f"Found {total} URLs in {args.input}")
     except FileNotFoundError:
-        print(f"Error: Input file '{INPUT_CSV}' not found!")
-        print("Please make sure the CSV file exists and update the INPUT_CSV variable.")
+        print(f"Error: Input file '{args.input}' not found!")
+        print("Please make sure the CSV file exists or pass it with --input.")
         return
     except Exception as e:
         print(f"Error reading CSV file: {e}")
@@ -416,30 +458,34 @@ def main():
     
     # Initialize validator
     validator = URLValidator(
-        input_csv_path=INPUT_CSV,
+        input_csv_path=args.input,
         max_workers=MAX_WORKERS,
         timeout=TIMEOUT,
-        delay=DELAY
+        delay=DELAY,
+        resume=args.resume,
+        ttl=args.ttl_hours * 3600,
+        dns_prefilter=not args.no_dns_prefilter
     )
     
-    # Validate URLs
+    # Validate URLs (results are streamed to the results store as they complete)
     start_time = time.time()
-    results = validator.validate_urls(input_df)
+    rows = read_rows(args.input)
+    if aiohttp is not None:
+        validator.validate_urls_async(rows, total=total, max_in_flight=MAX_IN_FLIGHT, per_host=PER_HOST)
+    else:
+        print("aiohttp not installed; falling back to threaded validation")
+        validator.validate_urls(rows, total=total)
     end_time = time.time()
     
     print(f"\nValidation completed in {end_time - start_time:.1f} seconds")
     
     # Analyze results
-    status_counts, successful_count = validator.analyze_results(results)
-    
-    # Save all results
-    validator.save_results(results, 'url_validation_results.csv')
-    
-    # Create filtered CSV with working URLs only
-    working_df = validator.create_filtered_csv(results, 'working_event_sources.csv')
+    status_counts, successful_count = validator.analyze_results()
     
-    # Create performance report
-    validator.create_performance_report(results, 'url_performance_report.csv')
+    # Save all results, the working URLs only and the performance report in one pass
+    validator.write_reports('url_validation_results.csv', 'working_event_sources.csv',
+                            'url_performance_report.csv')
+    validator.store.close()
     
     print(f"\n" + "="*60)
     print("FILES CREATED:")
@@ -448,6 +494,7 @@ def main():
     print("2. working_event_sources.csv      - Only working URLs (detailed)")
     print("3. working_event_sources_simple.csv - Only working URLs (Category, SourceURL)")
     print("4. url_performance_report.csv     - Working URLs sorted by speed")
+    print(f"   ({RESULTS_PATH} keeps every result; rerun with --resume to continue)")
     
     if successful_count > 0:
         print(f"\nSUCCESS: Found {successful_count} working event sources!")
@@ -459,4 +506,4 @@ def main():
         print("- Check network connectivity")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()